@@ -1,16 +1,39 @@
 # backend-python/analysis/stockfish_analyzer.py
 import chess
 import chess.engine
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import asyncio
+import threading
+from functools import partial
+
+from engine.endgame_bitbase import endgame_bitbase
+from engine.pool import engine_pool
+from engine.supervisor import analysis_deadline, engine_supervisor, wait_analysis
+from engine.transposition_cache import transposition_cache
+
+# Analysis runs at full strength - its cache entries never mix with game skill levels
+ANALYSIS_SKILL_LEVEL = 20
+
+# Reviews queue behind live moves, so they may wait much longer than a game would
+REVIEW_ACQUIRE_TIMEOUT = 300.0
 
 class StockfishAnalyzer:
-    def __init__(self, engine_path: str = None):
-        self.engine_path = engine_path or self._find_stockfish()
+    def __init__(self, engine_path: str = None, tablebase=None, cache=None, pool=None,
+                 priority: str = 'review'):
+        # With a pool, searches borrow shared engines at review priority and yield to live moves
+        self.pool = pool
+        self.priority = priority
+        self.engine_path = engine_path or (None if pool else self._find_stockfish())
         self.engine = None
+        self.tablebase = tablebase
+        self.cache = cache
+        self.preempted_searches = 0
         
     def _find_stockfish(self):
         import os
+        env_path = os.getenv('STOCKFISH_PATH')
+        if env_path and os.path.exists(env_path):
+            return env_path
         paths = ['stockfish', '/usr/local/bin/stockfish', 'C:\\stockfish\\stockfish.exe']
         for path in paths:
             if os.path.exists(path):
@@ -18,8 +41,10 @@ class StockfishAnalyzer:
         return 'stockfish'
     
     async def start_engine(self):
+        if self.pool:
+            return
         if not self.engine:
-            self.engine = await chess.engine.SimpleEngine.apopen_uci(self.engine_path)
+            _, self.engine = await chess.engine.popen_uci(self.engine_path)
     
     async def stop_engine(self):
         if self.engine:
@@ -27,48 +52,61 @@ class StockfishAnalyzer:
             self.engine = None
     
     async def analyze_game(self, moves: List[str], time_per_move: float = 1.0) -> Dict:
-        """Analyze complete game and classify moves"""
+        """Analyze complete game and classify moves - every position is searched once"""
         await self.start_engine()
         
+        # Replay first - unplayable SAN is skipped, like a failed move always was
         board = chess.Board()
-        analysis_results = []
-        evaluations = [0.0]  # Starting evaluation
-        
+        positions = [board.copy()]
+        played = []
         for i, move_san in enumerate(moves):
             try:
                 move = board.parse_san(move_san)
-                
-                # Get evaluation before move
-                info = await self.engine.analyse(board, chess.engine.Limit(time=time_per_move))
-                eval_before = self._extract_evaluation(info, board.turn)
-                
-                # Make the move
-                board.push(move)
-                
-                # Get evaluation after move  
-                info = await self.engine.analyse(board, chess.engine.Limit(time=time_per_move))
-                eval_after = self._extract_evaluation(info, not board.turn)
-                
-                # Calculate move quality
-                move_quality = self._classify_move(eval_before, eval_after, board.turn)
-                
-                analysis_results.append({
-                    "move_number": i + 1,
-                    "move": move_san,
-                    "uci": move.uci(),
-                    "eval_before": eval_before,
-                    "eval_after": eval_after,
-                    "eval_change": eval_after - eval_before,
-                    "classification": move_quality["class"],
-                    "score": move_quality["score"],
-                    "is_critical": abs(eval_after - eval_before) > 0.5
-                })
-                
-                evaluations.append(eval_after)
-                
-            except Exception as e:
+            except ValueError as e:
                 print(f"Error analyzing move {i}: {e}")
                 continue
+            board.push(move)
+            positions.append(board.copy())
+            played.append((i, move_san, move))
+        
+        # The position after ply N is the position before ply N+1 - one search serves both
+        searches = []
+        for position in positions:
+            try:
+                searches.append(await self._search(position, time_per_move))
+            except Exception as e:
+                print(f"Error evaluating position {len(searches)}: {e}")
+                searches.append(None)
+        
+        analysis_results = []
+        evaluations = [0.0]  # Starting evaluation
+        
+        for ply, (i, move_san, move) in enumerate(played):
+            before, after = positions[ply], positions[ply + 1]
+            if searches[ply] is None or searches[ply + 1] is None:
+                print(f"Error analyzing move {i}: position was not evaluated")
+                continue
+            
+            # Both evaluations are from the mover's point of view, as before
+            eval_before = self._perspective(searches[ply], before.turn)
+            eval_after = self._perspective(searches[ply + 1], not after.turn)
+            
+            # Calculate move quality
+            move_quality = self._classify_move(eval_before, eval_after, after.turn)
+            
+            analysis_results.append({
+                "move_number": i + 1,
+                "move": move_san,
+                "uci": move.uci(),
+                "eval_before": eval_before,
+                "eval_after": eval_after,
+                "eval_change": eval_after - eval_before,
+                "classification": move_quality["class"],
+                "score": move_quality["score"],
+                "is_critical": abs(eval_after - eval_before) > 0.5
+            })
+            
+            evaluations.append(eval_after)
         
         return {
             "total_moves": len(moves),
@@ -78,6 +116,68 @@ class StockfishAnalyzer:
             "game_summary": self._generate_summary(analysis_results)
         }
     
+    async def _search(self, board: chess.Board, time_per_move: float) -> Tuple[Optional[float], Optional[chess.engine.InfoDict]]:
+        """Search a position once - (tablebase evaluation, None) or (None, engine info)"""
+        if self.tablebase:
+            tablebase_eval = self.tablebase.evaluate(board)
+            if tablebase_eval is not None:
+                return tablebase_eval, None
+        
+        limit = chess.engine.Limit(time=time_per_move)
+        if self.cache:
+            cached = self.cache.get(board, limit, ANALYSIS_SKILL_LEVEL)
+            if cached and cached.score:
+                return None, {"score": cached.score}
+        
+        if self.pool:
+            info, preempted = await self._pooled_analyse(board, limit)
+        else:
+            info, preempted = await self.engine.analyse(board, limit), False
+        
+        # A preempted search is shallower than the limit promises - don't cache it
+        if self.cache and not preempted:
+            pv = info.get("pv")
+            self.cache.put(board, limit, ANALYSIS_SKILL_LEVEL, pv[0] if pv else None,
+                           info.get("score"), info.get("depth"))
+        return None, info
+    
+    def _perspective(self, search: Tuple[Optional[float], Optional[chess.engine.InfoDict]], turn: bool) -> float:
+        """A search result as the evaluation for one side"""
+        tablebase_eval, info = search
+        if tablebase_eval is not None:
+            # The tablebase scores from White's side, like the engine's cp score
+            return tablebase_eval if turn else -tablebase_eval
+        return self._extract_evaluation(info, turn)
+    
+    async def _pooled_analyse(self, board: chess.Board,
+                              limit: chess.engine.Limit) -> Tuple[chess.engine.InfoDict, bool]:
+        """Search on a pool engine; a live move waiting for an engine cuts the search short"""
+        loop = asyncio.get_running_loop()
+        while True:
+            # A crashed pool engine is replaced on release - the supervisor retries on a fresh one
+            info, preempted = await loop.run_in_executor(
+                self.pool.batch_executor,
+                partial(engine_supervisor.run, partial(self._search_on_pool, board.copy(), limit))
+            )
+            # Preempted before the first score - queue again behind the live work
+            if not preempted or info.get("score") is not None:
+                return info, preempted
+    
+    def _search_on_pool(self, board: chess.Board, limit: chess.engine.Limit) -> Tuple[chess.engine.InfoDict, bool]:
+        stop_event = threading.Event()
+        with self.pool.checkout(timeout=REVIEW_ACQUIRE_TIMEOUT, skill_level=ANALYSIS_SKILL_LEVEL,
+                                priority=self.priority, stop_event=stop_event) as worker:
+            deadline = analysis_deadline(limit)
+            with worker.engine.analysis(board, limit) as analysis:
+                preempted = stop_event.wait(limit.time)
+                analysis.stop()
+                wait_analysis(analysis, deadline)
+                info = analysis.info
+        
+        if preempted:
+            self.preempted_searches += 1
+        return info, preempted
+    
     def _extract_evaluation(self, info: chess.engine.InfoDict, turn: bool) -> float:
         """Extract numerical evaluation from engine"""
         score = info.get("score")
@@ -130,4 +230,4 @@ class StockfishAnalyzer:
         }
 
 # Global analyzer instance
-analyzer = StockfishAnalyzer()
\ No newline at end of file
+analyzer = StockfishAnalyzer(tablebase=endgame_bitbase, cache=transposition_cache, pool=engine_pool)
\ No newline at end of file
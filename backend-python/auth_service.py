@@ -17,12 +17,18 @@ import os
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo.errors import DuplicateKeyError
 from bson import ObjectId
+from utils.fast_json import encode_message
+from utils.tracing import span
+from utils.log import log
 
 # הגדרות JWT
 JWT_SECRET = os.getenv('JWT_SECRET', 'your-secret-key-here')
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 24
 
+# משתמשים עם גישה לנתיבי /admin (רשימה מופרדת בפסיקים)
+ADMIN_USERNAMES = {name.strip() for name in os.getenv('ADMIN_USERNAMES', '').split(',') if name.strip()}
+
 security = HTTPBearer()
 
 # ============= Helper Functions =============
@@ -155,7 +161,8 @@ class MongoDBService:
                     raise HTTPException(status_code=400, detail="Email already exists")
             
             # הצפנת סיסמה
-            password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+            with span('bcrypt_hash'):
+                password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
             
             # יצירת משתמש
             user_id = str(uuid.uuid4())
@@ -178,7 +185,7 @@ class MongoDBService:
             }
             
             result = await self.users_collection.insert_one(user_doc)
-            print(f"✅ User created: {username} ({user_id})")
+            log.info("✅ User created", username=username, user_id=user_id)
             
             # החזרת נתונים נקיים
             return clean_user_data(user_doc)
@@ -186,24 +193,22 @@ class MongoDBService:
         except HTTPException:
             raise
         except Exception as e:
-            print(f"❌ Create user error: {e}")
+            log.error("❌ Create user error", error=str(e))
             raise HTTPException(status_code=500, detail="Failed to create user")
     
     async def get_user_by_username(self, username: str) -> Optional[dict]:
         """חיפוש משתמש לפי שם משתמש עם תיקון JSON serialization"""
         try:
-            print(f"🔍 Searching for user: {username}")
             user_doc = await self.users_collection.find_one({"username": username})
+            log.info("🔍 User lookup", sample=True, username=username, found=user_doc is not None)
             
             if user_doc:
-                print(f"🔍 Found user: True")
                 return serialize_mongo_document(user_doc)
             else:
-                print(f"🔍 Found user: False")
                 return None
                 
         except Exception as e:
-            print(f"❌ Get user error: {e}")
+            log.error("❌ Get user error", error=str(e))
             return None
     
     async def get_user_by_id(self, user_id: str) -> Optional[dict]:
@@ -212,7 +217,7 @@ class MongoDBService:
             user_doc = await self.users_collection.find_one({"user_id": user_id})
             return serialize_mongo_document(user_doc) if user_doc else None
         except Exception as e:
-            print(f"❌ Get user by ID error: {e}")
+            log.error("❌ Get user by ID error", error=str(e))
             return None
     
     async def update_last_active(self, user_id: str):
@@ -223,7 +228,7 @@ class MongoDBService:
                 {"$set": {"last_active": datetime.utcnow()}}
             )
         except Exception as e:
-            print(f"❌ Update last active error: {e}")
+            log.error("❌ Update last active error", error=str(e))
     
     async def create_session(self, user_id: str, device_info: dict = None) -> str:
         """יצירת session חדש"""
@@ -242,7 +247,7 @@ class MongoDBService:
             return session_id
             
         except Exception as e:
-            print(f"❌ Create session error: {e}")
+            log.error("❌ Create session error", error=str(e))
             return ""
     
     async def get_stats(self) -> dict:
@@ -322,10 +327,12 @@ class AuthService:
             raise HTTPException(status_code=400, detail="Password must be at least 6 characters")
         
         # יצירת משתמש (כבר מחזיר נתונים נקיים)
-        user = await db.create_user(username, password, email)
+        with span('create_user'):
+            user = await db.create_user(username, password, email)
         
         # יצירת session
-        session_id = await db.create_session(user['user_id'])
+        with span('create_session'):
+            session_id = await db.create_session(user['user_id'])
         
         # יצירת tokens
         access_token = AuthService.create_jwt_token(user['user_id'], username)
@@ -343,19 +350,24 @@ class AuthService:
         """התחברות משתמש עם תיקון JSON serialization"""
         try:
             # חיפוש משתמש
-            user = await db.get_user_by_username(username)
+            with span('user_lookup'):
+                user = await db.get_user_by_username(username)
             if not user:
                 raise HTTPException(status_code=401, detail="Invalid credentials")
             
             # בדיקת סיסמה
-            if not bcrypt.checkpw(password.encode('utf-8'), user['password_hash'].encode('utf-8')):
+            with span('bcrypt_check'):
+                password_ok = bcrypt.checkpw(password.encode('utf-8'), user['password_hash'].encode('utf-8'))
+            if not password_ok:
                 raise HTTPException(status_code=401, detail="Invalid credentials")
             
             # עדכון last_active
-            await db.update_last_active(user['user_id'])
+            with span('update_last_active'):
+                await db.update_last_active(user['user_id'])
             
             # יצירת session
-            session_id = await db.create_session(user['user_id'], device_info)
+            with span('create_session'):
+                session_id = await db.create_session(user['user_id'], device_info)
             
             # יצירת tokens
             access_token = AuthService.create_jwt_token(user['user_id'], username)
@@ -374,7 +386,7 @@ class AuthService:
         except HTTPException:
             raise
         except Exception as e:
-            print(f"❌ Login error details: {e}")
+            log.error("❌ Login error details", error=str(e))
             raise HTTPException(status_code=500, detail="Login failed")
 
 # Dependency לקבלת משתמש מאומת
@@ -383,8 +395,10 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     token = credentials.credentials
     
     try:
-        payload = AuthService.verify_jwt_token(token)
-        user = await db.get_user_by_id(payload['user_id'])
+        with span('jwt_verify'):
+            payload = AuthService.verify_jwt_token(token)
+        with span('user_lookup'):
+            user = await db.get_user_by_id(payload['user_id'])
         
         if not user:
             raise HTTPException(status_code=401, detail="User not found")
@@ -395,9 +409,15 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Get current user error: {e}")
+        log.error("❌ Get current user error", error=str(e))
         raise HTTPException(status_code=401, detail="Could not validate credentials")
 
+async def get_admin_user(current_user: dict = Depends(get_current_user)) -> dict:
+    """משתמש מאומת שמופיע ב-ADMIN_USERNAMES"""
+    if current_user.get('username') not in ADMIN_USERNAMES:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
+
 # WebSocket Manager
 class WebSocketManager:
     """מנהל חיבורי WebSocket"""
@@ -423,7 +443,7 @@ class WebSocketManager:
                 self.user_connections[user_id] = []
             self.user_connections[user_id].append(connection_id)
         
-        print(f"✅ WebSocket connected: {connection_id} (User: {user_id or 'Anonymous'})")
+        log.info("✅ WebSocket connected", connection_id=connection_id, user_id=user_id or 'Anonymous')
     
     def disconnect(self, connection_id: str):
         """ניתוק WebSocket"""
@@ -444,17 +464,21 @@ class WebSocketManager:
             # הסרת החיבור
             del self.active_connections[connection_id]
             
-            print(f"❌ WebSocket disconnected: {connection_id}")
+            log.info("❌ WebSocket disconnected", connection_id=connection_id)
     
     async def send_to_connection(self, connection_id: str, message: dict) -> bool:
         """שליחת הודעה לחיבור ספציפי"""
+        return await self.send_encoded(connection_id, encode_message(message))
+    
+    async def send_encoded(self, connection_id: str, payload: str) -> bool:
+        """שליחת הודעה שכבר קודדה - שידור מקודד פעם אחת לכל הנמענים"""
         if connection_id in self.active_connections:
             try:
                 websocket = self.active_connections[connection_id]['websocket']
-                await websocket.send_json(message)
+                await websocket.send_text(payload)
                 return True
             except Exception as e:
-                print(f"❌ Failed to send to {connection_id}: {e}")
+                log.warning("❌ Failed to send", connection_id=connection_id, error=str(e))
                 self.disconnect(connection_id)
         return False
     
@@ -463,19 +487,21 @@ class WebSocketManager:
         if user_id not in self.user_connections:
             return 0
         
+        payload = encode_message(message)
         sent_count = 0
         for connection_id in self.user_connections[user_id][:]:
-            if await self.send_to_connection(connection_id, message):
+            if await self.send_encoded(connection_id, payload):
                 sent_count += 1
         
         return sent_count
     
     async def broadcast(self, message: dict, exclude_connection: str = None) -> int:
         """שידור הודעה לכל החיבורים"""
+        payload = encode_message(message)
         sent_count = 0
         for connection_id in list(self.active_connections.keys()):
             if connection_id != exclude_connection:
-                if await self.send_to_connection(connection_id, message):
+                if await self.send_encoded(connection_id, payload):
                     sent_count += 1
         return sent_count
     
@@ -510,10 +536,11 @@ class WebSocketManager:
         if room_id not in self.rooms:
             return 0
         
+        payload = encode_message(message)
         sent_count = 0
         for connection_id in self.rooms[room_id][:]:
             if connection_id != exclude_connection:
-                if await self.send_to_connection(connection_id, message):
+                if await self.send_encoded(connection_id, payload):
                     sent_count += 1
         
         return sent_count
@@ -564,7 +591,7 @@ async def authenticate_websocket(websocket: WebSocket, token: str = None) -> Opt
         return None
         
     except Exception as e:
-        print(f"❌ WebSocket auth failed: {e}")
+        log.warning("❌ WebSocket auth failed", error=str(e))
         return None
 
 # תחבול עבור הודעות WebSocket
@@ -621,10 +648,10 @@ async def handle_websocket_message(connection_id: str, message_data: dict, user_
             websocket_manager.leave_room(connection_id, room_id)
         
         else:
-            print(f"❓ Unknown WebSocket message type: {message_type}")
+            log.warning("❓ Unknown WebSocket message type", type=message_type)
     
     except Exception as e:
-        print(f"❌ Handle WebSocket message error: {e}")
+        log.error("❌ Handle WebSocket message error", error=str(e))
         await websocket_manager.send_to_connection(connection_id, {
             'type': 'error',
             'data': {
@@ -0,0 +1,138 @@
+# backend-python/benchmarks/bench_analysis.py - ניתוח משחק: שני חיפושים לכל מסע מול חיפוש אחד לכל עמדה
+"""
+Game analysis benchmark
+מנתח משחקים אקראיים עם המנוע המדומה (tools/fake_uci_engine.py) פעמיים:
+    two-pass     - הלולאה הקודמת של analyze_game: הערכה לפני ואחרי כל מסע (2N חיפושים)
+    single-pass  - StockfishAnalyzer.analyze_game: חיפוש אחד לכל עמדה (N+1 חיפושים)
+ובודק שהתוצאה זהה. בלי מטמון ובלי מאגר - מנוע ישיר, כמו StockfishAnalyzer(engine_path=...).
+הרצה מתוך backend-python:
+    python benchmarks/bench_analysis.py --games 3 --plies 40 --time-per-move 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chess
+
+FAKE_ENGINE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools', 'fake_uci_engine.py')
+# המנועים הגלובליים (ChessEngine / engine_pool) נוצרים ב-import - גם הם מהמנוע המדומה
+os.environ.setdefault('STOCKFISH_PATH', FAKE_ENGINE)
+
+from analysis.stockfish_analyzer import StockfishAnalyzer
+
+
+def random_game(plies: int, rng: random.Random) -> list:
+    """משחק אקראי חוקי ב-SAN"""
+    board = chess.Board()
+    moves = []
+    while len(moves) < plies and not board.is_game_over():
+        move = rng.choice(list(board.legal_moves))
+        moves.append(board.san(move))
+        board.push(move)
+    return moves
+
+
+async def two_pass_analyze(analyzer: StockfishAnalyzer, moves: list, time_per_move: float) -> dict:
+    """analyze_game כמו שהיה: חיפוש לפני ואחרי כל מסע, דרך _search / _perspective של הקוד הנוכחי"""
+    await analyzer.start_engine()
+    board = chess.Board()
+    analysis_results = []
+    evaluations = [0.0]
+
+    for i, move_san in enumerate(moves):
+        try:
+            move = board.parse_san(move_san)
+            eval_before = analyzer._perspective(await analyzer._search(board, time_per_move), board.turn)
+            board.push(move)
+            eval_after = analyzer._perspective(await analyzer._search(board, time_per_move), not board.turn)
+            move_quality = analyzer._classify_move(eval_before, eval_after, board.turn)
+            analysis_results.append({
+                "move_number": i + 1,
+                "move": move_san,
+                "uci": move.uci(),
+                "eval_before": eval_before,
+                "eval_after": eval_after,
+                "eval_change": eval_after - eval_before,
+                "classification": move_quality["class"],
+                "score": move_quality["score"],
+                "is_critical": abs(eval_after - eval_before) > 0.5
+            })
+            evaluations.append(eval_after)
+        except Exception as e:
+            print(f"Error analyzing move {i}: {e}")
+            continue
+
+    return {
+        "total_moves": len(moves),
+        "move_analysis": analysis_results,
+        "critical_moves": [m for m in analysis_results if m["is_critical"]],
+        "evaluation_graph": evaluations,
+        "game_summary": analyzer._generate_summary(analysis_results)
+    }
+
+
+def count_searches(analyzer: StockfishAnalyzer) -> list:
+    """מונה קריאות ל-engine.analyse"""
+    counter = [0]
+    analyse = analyzer.engine.analyse
+
+    async def counted(*args, **kwargs):
+        counter[0] += 1
+        return await analyse(*args, **kwargs)
+
+    analyzer.engine.analyse = counted
+    return counter
+
+
+async def run(games: list, time_per_move: float):
+    analyzer = StockfishAnalyzer(engine_path=FAKE_ENGINE)
+    await analyzer.start_engine()
+    searches = count_searches(analyzer)
+    try:
+        timings = {'two-pass': 0.0, 'single-pass': 0.0}
+        counts = {'two-pass': 0, 'single-pass': 0}
+        for moves in games:
+            for name, analyze in (('two-pass', lambda: two_pass_analyze(analyzer, moves, time_per_move)),
+                                  ('single-pass', lambda: analyzer.analyze_game(moves, time_per_move))):
+                searches[0] = 0
+                start = time.perf_counter()
+                result = await analyze()
+                timings[name] += time.perf_counter() - start
+                counts[name] += searches[0]
+                if name == 'two-pass':
+                    expected = result
+                elif result != expected:
+                    raise AssertionError(f"single-pass output differs from two-pass for game {moves}")
+    finally:
+        await analyzer.stop_engine()
+
+    plies = sum(len(moves) for moves in games)
+    print(f"{len(games)} games, {plies} plies, {time_per_move * 1000:.0f}ms per search - outputs identical\n")
+    for name in timings:
+        print(f"{name:12} {timings[name]:7.2f}s  {counts[name]:5} engine searches  "
+              f"{timings[name] / plies * 1000:7.1f}ms/ply")
+    print(f"\nsingle-pass: {timings['two-pass'] / timings['single-pass']:.2f}x faster, "
+          f"{counts['single-pass'] / counts['two-pass']:.0%} of the searches")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--games', type=int, default=3)
+    parser.add_argument('--plies', type=int, default=40)
+    parser.add_argument('--time-per-move', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    games = [random_game(args.plies, rng) for _ in range(args.games)]
+    asyncio.run(run(games, args.time_per_move))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# backend-python/benchmarks/bench_game_state.py - זיכרון למשחק: מצב ישן מול GameState
+"""
+Per-game memory benchmark
+משווה את הייצוג הישן (ChessEngine עם chess.Board, game_history ורשימות SAN / FEN ב-game_metadata)
+ל-GameState הקומפקטי. הרצה מתוך backend-python:
+    python benchmarks/bench_game_state.py --games 500 --plies 80
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chess
+
+from engine.game_state import GameState
+
+
+def random_game(plies: int, rng: random.Random) -> list:
+    """משחק אקראי חוקי באורך plies (או עד סוף המשחק)"""
+    board = chess.Board()
+    moves = []
+    while len(moves) < plies and not board.is_game_over():
+        move = rng.choice(list(board.legal_moves))
+        moves.append(move)
+        board.push(move)
+    return moves
+
+
+def legacy_game(game_id: str, moves: list) -> tuple:
+    """מה שהשרת החזיק לכל משחק: לוח עם move stack, game_history ו-metadata עם SAN ו-FEN לכל מסע"""
+    board = chess.Board()
+    game_history = []
+    metadata = {
+        'game_id': game_id,
+        'user_id': None,
+        'ai_level': 3,
+        'player_color': 'white',
+        'created_at': time.time(),
+        'moves': [],
+        'positions': [board.fen()],
+        'game_result': None,
+        'fast_mode': True
+    }
+    for move in moves:
+        san = board.san(move)
+        board.push(move)
+        game_history.append({"move": move.uci(), "san": san, "timestamp": time.time(), "think_time": 0.2})
+        metadata['moves'].append(san)
+        metadata['positions'].append(board.fen())
+    return board, game_history, metadata
+
+
+def compact_game(game_id: str, moves: list) -> GameState:
+    state = GameState(game_id, None, 3, 'white')
+    for move in moves:
+        state.push(move)
+    return state
+
+
+def measure(build, games: list) -> tuple:
+    """זיכרון (בתים) וזמן בנייה עבור כל המשחקים"""
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    held = [build(f"game-{i}", moves) for i, moves in enumerate(games)]
+    elapsed = time.perf_counter() - start_time
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--games', type=int, default=500)
+    parser.add_argument('--plies', type=int, default=80)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    games = [random_game(args.plies, rng) for _ in range(args.games)]
+    avg_plies = sum(len(moves) for moves in games) / len(games)
+
+    legacy_bytes, legacy_time = measure(legacy_game, games)
+    compact_bytes, compact_time = measure(compact_game, games)
+
+    print(f"📊 {args.games} games, {avg_plies:.1f} plies on average")
+    print(f"   legacy  : {legacy_bytes / args.games / 1024:8.1f} KiB/game  (build {legacy_time:.2f}s)")
+    print(f"   compact : {compact_bytes / args.games / 1024:8.1f} KiB/game  (build {compact_time:.2f}s)")
+    print(f"   ratio   : {legacy_bytes / compact_bytes:8.1f}x smaller")
+    print(f"   100k games: legacy ~{legacy_bytes / args.games * 100_000 / 2**30:.2f} GiB, "
+          f"compact ~{compact_bytes / args.games * 100_000 / 2**20:.0f} MiB")
+
+    # עלות הגזירה לפי דרישה - נשלמת רק בבקשה
+    state = compact_game("derive", games[0])
+    start_time = time.perf_counter()
+    for _ in range(100):
+        state.board()
+    print(f"   board() rebuild: {(time.perf_counter() - start_time) * 10:.2f} ms for {state.move_count} plies")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# backend-python/benchmarks/bench_json.py - JSONResponse / send_json מול FastJSONResponse / שידור מקודד פעם אחת
+"""
+JSON serialization benchmark
+1. render של תגובת /chess/move ושל /chess/engine-stats: JSONResponse (json) מול FastJSONResponse
+2. שידור הודעה ל-N חיבורים: send_json לכל נמען (קידוד לכל חיבור) מול encode_message פעם אחת + send_text
+הרצה מתוך backend-python:
+    python benchmarks/bench_json.py --connections 500 --rounds 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+
+from utils.fast_json import ENCODERS, FastJSONResponse, encode_message, get_encoder_name, set_encoder
+
+MOVE_RESPONSE = {
+    'success': True,
+    'game_id': '3f2b8c1e-9a4d-4f6b-8e2a-1c5d7e9f0a3b',
+    'player_move': {'move': 'g1f3', 'san': 'Nf3'},
+    'ai_move': {'move': 'b8c6', 'san': 'Nc6', 'think_time': 0.2031, 'time_budget': 0.2, 'source': 'engine'},
+    'position': {
+        'fen': 'r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3',
+        'turn': 'white',
+        'legal_moves': ['f3g5', 'f3e5', 'f3h4', 'f3d4', 'f3g1', 'h1g1', 'f1a6', 'f1b5', 'f1c4', 'f1d3',
+                        'f1e2', 'e1e2', 'd1e2', 'b1c3', 'b1a3', 'h2h3', 'g2g3', 'd2d3', 'c2c3', 'b2b3',
+                        'a2a3', 'h2h4', 'g2g4', 'd2d4', 'c2c4', 'b2b4', 'a2a4'],
+    },
+    'game_result': None,
+    'game_over': False,
+    'fast_mode': True
+}
+
+STATS_RESPONSE = {
+    'success': True,
+    'pool': {'size': 4, 'idle': 2, 'in_use': 2, 'waiting': 0, 'occupancy': 0.5, 'avg_wait_time': 0.00012,
+             'classes': {name: {'checkouts': 1200, 'avg_wait_time': 0.0004, 'max_wait_time': 0.02, 'preempted': 3}
+                         for name in ('live', 'hint', 'review', 'background')}},
+    'cache': {'entries': 48211, 'max_entries': 79891, 'hits': 120331, 'misses': 48211, 'hit_rate': 0.714},
+    'time': {'moves': 5012, 'avg_budget': 0.21, 'recent_avg_budget': 0.19, 'shrunk': 800, 'grown': 640},
+    'positions': {'entries': 50000, 'hits': 901233, 'misses': 120444, 'hit_rate': 0.882},
+    'active_games': 1320
+}
+
+CHAT_MESSAGE = {
+    'type': 'chat_message',
+    'data': {'id': '8d1e1b52-77f3-4f3c-9a7e-2b0c44b2c0f1', 'content': 'מישהו רוצה לשחק בליץ? ♟️',
+             'userId': 'u-1842', 'username': 'neriya', 'displayName': 'Neriya', 'timestamp': 18422.551,
+             'room': 'general'}
+}
+
+
+class FakeWebSocket:
+    """מה ש-Starlette עושה בפועל: send_json מקודד ושולח text"""
+
+    def __init__(self):
+        self.sent = 0
+
+    async def send_text(self, data: str):
+        self.sent += len(data)
+
+    async def send_json(self, data):
+        await self.send_text(json.dumps(data, separators=(",", ":"), ensure_ascii=False))
+
+
+def bench_render(content, rounds: int) -> tuple:
+    start_time = time.perf_counter()
+    for _ in range(rounds):
+        JSONResponse(content)
+    stdlib_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for _ in range(rounds):
+        FastJSONResponse(content)
+    fast_time = time.perf_counter() - start_time
+    return stdlib_time, fast_time
+
+
+async def bench_broadcast(sockets: list, rounds: int) -> tuple:
+    start_time = time.perf_counter()
+    for _ in range(rounds):
+        for websocket in sockets:
+            await websocket.send_json(CHAT_MESSAGE)
+    per_connection = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for _ in range(rounds):
+        payload = encode_message(CHAT_MESSAGE)
+        for websocket in sockets:
+            await websocket.send_text(payload)
+    encoded_once = time.perf_counter() - start_time
+    return per_connection, encoded_once
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--connections', type=int, default=500)
+    parser.add_argument('--rounds', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"📊 encoder: {get_encoder_name()} (available: {', '.join(ENCODERS)})")
+    for name, content in (('move response', MOVE_RESPONSE), ('engine-stats', STATS_RESPONSE)):
+        stdlib_time, fast_time = bench_render(content, args.rounds * 10)
+        calls = args.rounds * 10
+        print(f"   {name:14}: JSONResponse {stdlib_time / calls * 1e6:6.1f} µs, "
+              f"FastJSONResponse {fast_time / calls * 1e6:6.1f} µs ({stdlib_time / fast_time:.1f}x)")
+
+    sockets = [FakeWebSocket() for _ in range(args.connections)]
+    broadcasts = max(1, args.rounds // 20)
+    per_connection, encoded_once = asyncio.run(bench_broadcast(sockets, broadcasts))
+    print(f"   broadcast to {args.connections}: send_json {per_connection / broadcasts * 1e3:6.2f} ms, "
+          f"encoded once {encoded_once / broadcasts * 1e3:6.2f} ms ({per_connection / encoded_once:.1f}x)")
+
+    if 'orjson' in ENCODERS and get_encoder_name() != 'json':
+        # אותו שידור עם json - כמה מהחיסכון בא מהקידוד היחיד בלי orjson
+        set_encoder('json')
+        _, stdlib_once = asyncio.run(bench_broadcast(sockets, broadcasts))
+        print(f"   broadcast encoded once with json: {stdlib_once / broadcasts * 1e3:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
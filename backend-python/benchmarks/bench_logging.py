@@ -0,0 +1,121 @@
+# backend-python/benchmarks/bench_logging.py - print מול הלוגר האסינכרוני בקצב הודעות גבוה
+"""
+Logging benchmark
+לולאת אירועים שמטפלת ב-N הודעות WebSocket, כשכל הודעה כותבת LINES שורות לוג (כמו Received / User lookup
+/ AI decided). משווה:
+    print       - print ישיר ל-stdout line-buffered (כמו PYTHONUNBUFFERED=1 בקונטיינר)
+    async       - log.info: התור + thread כותב, כל השורות נכתבות
+    async-json  - כמו async בפורמט JSON
+    sampled     - log.info(sample=True) בקצב LOG_SAMPLE_RATE
+יעדים: pipe - תהליך cat (stdout שנאסף ע"י docker), slow-pipe - קורא שמוגבל ל-SLOW_READER_BYTES_PER_SEC
+(collector עמוס / טרמינל איטי - print חוסם את הלולאה עד שהקורא מתפנה), file - קובץ.
+בלולאה שכולה CPU ה-thread הכותב מתחרה על ה-GIL, ולכן בלי sampling הרווח ב-pipe מהיר הוא בעיקר בחיסכון ב-syscalls.
+הרצה מתוך backend-python:
+    python benchmarks/bench_logging.py --messages 50000 --target pipe slow-pipe
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.log import StructuredLogger, INFO
+
+LINES = 3
+SLOW_READER_BYTES_PER_SEC = 2 * 1024 * 1024
+SLOW_READER = (
+    "import sys, time\n"
+    "while sys.stdin.buffer.read1(4096):\n"
+    f"    time.sleep(4096 / {SLOW_READER_BYTES_PER_SEC})\n"
+)
+
+
+def open_target(target: str):
+    if target in ('pipe', 'slow-pipe'):
+        command = ['cat'] if target == 'pipe' else [sys.executable, '-c', SLOW_READER]
+        proc = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL)
+        return io.TextIOWrapper(proc.stdin, encoding='utf-8', line_buffering=True), proc
+    handle = tempfile.NamedTemporaryFile('w', encoding='utf-8', buffering=1, suffix='.log', delete=False)
+    return handle, None
+
+
+async def handle_messages(messages: int, emit):
+    for i in range(messages):
+        connection_id = f'{i:08x}'
+        emit("📨 Received", type='chat_message', connection_id=connection_id)
+        emit("🔍 User lookup", username=f'user{i % 100}', found=True)
+        emit("⚡ AI decided", move='e2e4', seconds=0.203)
+        if i % 64 == 0:
+            await asyncio.sleep(0)
+
+
+def run(name: str, messages: int, target: str, make_emit):
+    stream, proc = open_target(target)
+    emit, logger = make_emit(stream)
+
+    start = time.perf_counter()
+    asyncio.run(handle_messages(messages, emit))
+    loop_time = time.perf_counter() - start
+    if logger is not None:
+        logger.flush()
+    total_time = time.perf_counter() - start
+
+    stream.close()
+    if proc is not None:
+        proc.wait()
+    else:
+        os.unlink(stream.name)
+
+    written = logger.written if logger is not None else messages * LINES
+    print(f"{name:12} loop {loop_time * 1000:8.1f}ms  ({messages / loop_time:9,.0f} msg/s)   "
+          f"incl. drain {total_time * 1000:8.1f}ms   lines written {written:,}")
+    return loop_time
+
+
+def print_emit(stream):
+    def emit(msg, **fields):
+        print(f"{msg}: {' '.join(str(value) for value in fields.values())}", file=stream)
+    return emit, None
+
+
+def logger_emit(fmt: str, sample: bool, sample_rate: float, queue_size: int):
+    def make(stream):
+        logger = StructuredLogger(INFO, fmt, sample_rate, stream, queue_size)
+
+        def emit(msg, **fields):
+            logger.info(msg, sample, **fields)
+        return emit, logger
+    return make
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=50000)
+    parser.add_argument('--target', nargs='+', choices=('pipe', 'slow-pipe', 'file'), default=['pipe', 'slow-pipe'])
+    parser.add_argument('--sample-rate', type=float, default=0.01)
+    args = parser.parse_args()
+    queue_size = args.messages * LINES  # בלי drops - משווים את אותה כמות שורות
+
+    for target in args.target:
+        print(f"{args.messages:,} messages x {LINES} log lines -> {target}\n")
+        baseline = run('print', args.messages, target, print_emit)
+        results = {
+            'async': run('async', args.messages, target, logger_emit('text', False, 1.0, queue_size)),
+            'async-json': run('async-json', args.messages, target, logger_emit('json', False, 1.0, queue_size)),
+            'sampled': run('sampled', args.messages, target,
+                           logger_emit('text', True, args.sample_rate, queue_size)),
+        }
+        print()
+        for name, loop_time in results.items():
+            print(f"{name:12} {baseline / loop_time:5.1f}x less event-loop time than print")
+        print()
+
+
+if __name__ == "__main__":
+    main()
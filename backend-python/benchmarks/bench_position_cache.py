@@ -0,0 +1,118 @@
+# backend-python/benchmarks/bench_position_cache.py - עלות בניית התגובה למסע: חישוב ישיר מול PositionCache
+"""
+Per-move derived state benchmark
+מריץ משחקים אקראיים ומודד את העבודה שהשרת עושה סביב כל מסע (בדיקת חוקיות, SAN, legal_moves,
+is_game_over, ספירת מהלכים לתקציב הזמן) - פעם כמו קודם, ישירות מ-chess.Board, ופעם דרך
+PositionCache עם PositionInfo אחד לכל חצי-מהלך. הרצה מתוך backend-python:
+    python benchmarks/bench_position_cache.py --games 200 --plies 80
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chess
+
+from engine.position_cache import PositionCache
+
+
+def random_game(plies: int, rng: random.Random) -> list:
+    """משחק אקראי חוקי באורך plies (או עד סוף המשחק)"""
+    board = chess.Board()
+    moves = []
+    while len(moves) < plies and not board.is_game_over():
+        move = rng.choice(list(board.legal_moves))
+        moves.append(move)
+        board.push(move)
+    return moves
+
+
+def direct_ply(board: chess.Board, move: chess.Move) -> dict:
+    """מה ש-make_move / _record_ai_move עשו: כל שאלה על העמדה מחושבת מחדש"""
+    if board.is_game_over():
+        return {}
+    board.legal_moves.count()  # תקציב הזמן
+    if move not in board.legal_moves:
+        return {}
+    san = board.san(move)
+    board.push(move)
+    response = {
+        "san": san,
+        "legal_moves": [m.uci() for m in board.legal_moves],
+        "is_game_over": board.is_game_over()
+    }
+    if response["is_game_over"]:
+        response["result"] = board.result()
+    return response
+
+
+def cached_ply(board: chess.Board, move: chess.Move, cache: PositionCache, memo: list) -> dict:
+    """אותה תגובה דרך ChessEngine.position() - חיפוש אחד ב-cache לכל חצי-מהלך"""
+    position = memo[0] or cache.get(board)
+    if position.is_game_over(board):
+        return {}
+    len(position.legal_moves)
+    if move.uci() not in position.legal_moves:
+        return {}
+    san = position.san(board, move)
+    board.push(move)
+    position = memo[0] = cache.get(board)
+    response = {
+        "san": san,
+        "legal_moves": list(position.legal_moves),
+        "is_game_over": position.is_game_over(board)
+    }
+    if response["is_game_over"]:
+        response["result"] = position.result(board)
+    return response
+
+
+def run_direct(games: list) -> float:
+    start_time = time.perf_counter()
+    for moves in games:
+        board = chess.Board()
+        for move in moves:
+            direct_ply(board, move)
+    return time.perf_counter() - start_time
+
+
+def run_cached(games: list, cache: PositionCache) -> float:
+    start_time = time.perf_counter()
+    for moves in games:
+        board = chess.Board()
+        memo = [None]
+        for move in moves:
+            cached_ply(board, move, cache, memo)
+    return time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--games', type=int, default=200)
+    parser.add_argument('--plies', type=int, default=80)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    games = [random_game(args.plies, rng) for _ in range(args.games)]
+    plies = sum(len(moves) for moves in games)
+
+    direct_time = run_direct(games)
+    cache = PositionCache(max_entries=plies * 2)
+    cold_time = run_cached(games, cache)
+    # אותם משחקים שוב - כמו עמדות פתיחה שחוזרות בין משחקים
+    warm_time = run_cached(games, cache)
+
+    print(f"📊 {args.games} games, {plies} plies")
+    print(f"   direct        : {direct_time / plies * 1e6:7.1f} µs/ply")
+    print(f"   cached (cold) : {cold_time / plies * 1e6:7.1f} µs/ply  ({direct_time / cold_time:.2f}x)")
+    print(f"   cached (warm) : {warm_time / plies * 1e6:7.1f} µs/ply  ({direct_time / warm_time:.2f}x)")
+    print(f"   cache: {cache.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,19 +6,66 @@ Stockfish Chess Engine - Fast Response Version
 
 import chess
 import chess.engine
+import asyncio
+import contextvars
 import os
+import threading
 import time
-from typing import Dict, Any
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Any, Optional, Callable, Awaitable
+
+from engine.position_cache import PositionInfo, position_cache as default_position_cache
+from engine.search_stream import SearchInfoStream
+from engine.supervisor import ENGINE_TIMEOUT, analysis_deadline, engine_supervisor, iterate_analysis, wait_analysis
+from utils.metrics import metrics
+from utils.tracing import span
+from utils.log import log
+from engine.time_manager import time_manager as default_time_manager
+
+engine_think_seconds = metrics.histogram(
+    'chess_engine_think_seconds', 'AI move think time by source (engine, book, cache, ponder...)', ('source',)
+)
+
+FAST_SKILL_CAP = 8  # רמת ה-skill המקסימלית ש-start_engine שולח למנוע חדש
 
 class ChessEngine:
     """מנוע שחמט מבוסס Stockfish - גרסה מהירה"""
     
-    def __init__(self, stockfish_path: str = None, skill_level: int = 3):
-        self.stockfish_path = stockfish_path or self._find_stockfish()
+    def __init__(self, stockfish_path: str = None, skill_level: int = 3, pool=None, book=None,
+                 tablebase=None, cache=None, ponder: bool = None, time_manager=None, supervisor=None,
+                 position_cache=None):
+        # ✅ עם pool המשחק שומר רק את מצב הלוח ושואל מנוע לכל חיפוש
+        self.pool = pool
+        self.book = book
+        self.tablebase = tablebase
+        self.cache = cache
+        self.time_manager = time_manager or default_time_manager
+        self.supervisor = supervisor or engine_supervisor
+        self.position_cache = position_cache or default_position_cache
+        self.stockfish_path = stockfish_path or (None if pool else self._find_stockfish())
         self.skill_level = skill_level
         self.engine = None
         self.board = chess.Board()
         self.game_history = []
+        self._executor = None  # thread ייעודי למנוע ללא pool
+        self._scores = deque(maxlen=4)  # הערכות אחרונות (centipawns, מנקודת המבט של לבן)
+        self._position_key = None  # (לוח, מספר חצאי-מהלכים, מהלך אחרון) של ה-PositionInfo האחרון
+        self._position_info = None
+        
+        # ✅ סטטיסטיקת ספר פתיחות למשחק
+        self.ai_moves = 0
+        self.book_hits = 0
+        self.out_of_book = False
+        
+        # ✅ pondering - חיפוש על התגובה הצפויה בזמן שהשחקן חושב (רק עם pool)
+        self.ponder = os.getenv('ENGINE_PONDER', '0') == '1' if ponder is None else ponder
+        self.ponder_max_time = float(os.getenv('ENGINE_PONDER_MAX_TIME', 10.0))
+        self._predicted_reply = None
+        self._ponder = None
+        self.ponder_hits = 0
+        self.ponder_misses = 0
         
         # ✅ הגדרות מהירות
         self.fast_mode = True
@@ -28,10 +75,10 @@ class ChessEngine:
     def _find_stockfish(self) -> str:
         """מציאת נתיב Stockfish"""
         env_path = os.getenv('STOCKFISH_PATH')
-        print(f"🔍 Looking for Stockfish at: {env_path}")
+        log.info("🔍 Looking for Stockfish", path=env_path)
         
         if env_path and os.path.exists(env_path):
-            print(f"✅ Found Stockfish: {env_path}")
+            log.info("✅ Found Stockfish", path=env_path)
             return env_path
         
         common_paths = [
@@ -44,22 +91,28 @@ class ChessEngine:
         
         for path in common_paths:
             if os.path.exists(path):
-                print(f"✅ Found Stockfish: {path}")
+                log.info("✅ Found Stockfish", path=path)
                 return path
                 
         raise FileNotFoundError("Stockfish not found")
     
     def start_engine(self):
         """התחלת מנוע Stockfish מהיר"""
+        if self.pool:
+            return
+
         try:
             if not self.engine:
-                print(f"🚀 Starting FAST Stockfish: {self.stockfish_path}")
-                self.engine = chess.engine.SimpleEngine.popen_uci(self.stockfish_path)
+                log.info("🚀 Starting FAST Stockfish", path=self.stockfish_path)
+                # ✅ timeout לכל פקודה - מנוע תקוע מזוהה ע"י ה-supervisor
+                self.engine = chess.engine.SimpleEngine.popen_uci(
+                    self.stockfish_path, timeout=ENGINE_TIMEOUT
+                )
                 
                 # ✅ הגדרות מהירות למנוע
                 try:
                     # הגדרת רמת skill נמוכה למהירות
-                    fast_skill = min(self.skill_level, 8)  # מקסימום רמה 8
+                    fast_skill = min(self.skill_level, FAST_SKILL_CAP)
                     self.engine.configure({
                         "Skill Level": fast_skill,
                         "Hash": 16,  # מעט זיכרון למהירות
@@ -67,93 +120,206 @@ class ChessEngine:
                         "Move Overhead": 50,  # overhead נמוך
                         "nodestime": 1000  # פחות nodes לחישוב
                     })
-                    print(f"✅ FAST Stockfish ready - Level: {fast_skill}")
+                    log.info("✅ FAST Stockfish ready", level=fast_skill)
                 except Exception as e:
-                    print(f"⚠️ Could not configure fast settings: {e}")
+                    log.warning("⚠️ Could not configure fast settings", error=str(e))
                 
         except Exception as e:
-            print(f"❌ Failed to start Stockfish: {e}")
+            log.error("❌ Failed to start Stockfish", error=str(e))
             raise
     
-    def stop_engine(self):
-        """עצירת המנוע"""
+    def _close_engine(self, force: bool = False):
+        """סגירת תהליך המנוע - force הורג מיד במקום לחכות ל-quit של מנוע תקוע"""
         if self.engine:
             try:
-                self.engine.quit()
+                if force:
+                    self.engine.close()
+                else:
+                    self.engine.quit()
             except:
                 pass
             self.engine = None
-            print("🔴 Stockfish stopped")
+            log.info("🔴 Stockfish stopped")
+    
+    def stop_engine(self, force: bool = False):
+        """עצירת המנוע"""
+        self.cancel_ponder()
+        self._close_engine(force)
+        
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    def position(self) -> PositionInfo:
+        """המידע הנגזר של העמדה הנוכחית - חיפוש אחד ב-cache לכל חצי-מהלך"""
+        stack = self.board.move_stack
+        key = (self.board, len(stack), stack[-1] if stack else None)
+        if self._position_key != key:
+            self._position_info = self.position_cache.get(self.board)
+            self._position_key = key
+        return self._position_info
     
     def _get_fast_time_limit(self, base_time: float = None) -> float:
-        """חישוב זמן חשיבה מהיר"""
-        if not self.fast_mode:
-            return base_time or 1.0
-            
-        # ✅ זמנים מהירים לפי רמת הקושי
-        time_by_level = {
-            1: 0.1,   # מיידי
-            2: 0.15,  # מהיר מאוד
-            3: 0.2,   # מהיר
-            4: 0.3,   # נורמלי
-            5: 0.4,   # קצת איטי
-            6: 0.5,   # בינוני
-            7: 0.6,   # חכם
-            8: 0.8,   # מומחה
+        """תקציב זמן החשיבה - לפי רמה, מורכבות המיקום, תנודתיות ההערכה ועומס ה-pool"""
+        return self.time_manager.budget(
+            self.board, self.skill_level, base_time,
+            scores=self._scores, pool=self.pool, fast_mode=self.fast_mode,
+            legal_count=len(self.position().legal_moves)
+        )
+    
+    def _search(self, limit: chess.engine.Limit) -> chess.engine.PlayResult:
+        """חיפוש יחיד - המיקום נשלח מחדש מרשימת המהלכים של הלוח בכל חיפוש"""
+        # עומק וציון בלבד - בשביל המטמון ותנודתיות ההערכה
+        info = chess.engine.INFO_BASIC | chess.engine.INFO_SCORE
+        
+        if not self.pool:
+            return self.engine.play(self.board, limit, info=info)
+        
+        with self.pool.checkout(skill_level=self.skill_level, priority='live') as worker:
+            return worker.engine.play(self.board, limit, info=info)
+    
+    def _restart_engine(self):
+        """מנוע שקרס - הורגים ומפעילים חדש. עם pool המנוע השבור כבר מוחלף ב-release"""
+        if self.pool:
+            return
+        self._close_engine(force=True)
+        self.start_engine()
+    
+    def _play(self, limit: chess.engine.Limit) -> chess.engine.PlayResult:
+        """חיפוש על המנוע של המשחק או על מנוע מושאל מה-pool - עם התאוששות מקריסות"""
+        result = self.supervisor.run(partial(self._search, limit), restart=self._restart_engine)
+        
+        score = result.info.get("score")
+        if score is not None:
+            self._scores.append(score.white().score(mate_score=10000))
+        
+        if self.cache and result.move:
+            self.cache.put(self.board, limit, self.skill_level, result.move,
+                           result.info.get("score"), result.info.get("depth"))
+        return result
+
+    def _record_ai_move(self, move: chess.Move, think_time: float, source: str = "engine") -> Dict[str, Any]:
+        """ביצוע מהלך ה-AI על הלוח ובניית התגובה"""
+        san_notation = self.position().san(self.board, move)
+        self.board.push(move)
+        self.ai_moves += 1
+        engine_think_seconds.observe(think_time, source)
+        position = self.position()
+        
+        self.game_history.append({
+            "move": move.uci(),
+            "san": san_notation,
+            "timestamp": time.time(),
+            "think_time": think_time
+        })
+        
+        return {
+            "success": True,
+            "move": move.uci(),
+            "san": san_notation,
+            "fen": self.board.fen(),
+            "legal_moves": list(position.legal_moves),
+            "turn": "black" if self.board.turn else "white",
+            "is_game_over": position.is_game_over(self.board),
+            "think_time": think_time,
+            "source": source
         }
+    
+    def _try_book_move(self) -> Optional[Dict[str, Any]]:
+        """מהלך מספר הפתיחות - בלי לגעת ב-Stockfish"""
+        if not self.book or self.out_of_book:
+            return None
+        
+        start_time = time.time()
+        move = self.book.choose_move(self.board, self.skill_level)
+        
+        if not move:
+            # ✅ יצאנו מהספר - לא בודקים שוב במשחק הזה
+            self.out_of_book = True
+            return None
+        
+        self.book_hits += 1
+        log.info("📖 Book move", sample=True, move=move)
+        return self._record_ai_move(move, time.time() - start_time, source="book")
+    
+    def _try_tablebase_move(self) -> Optional[Dict[str, Any]]:
+        """מהלך מטבלאות הסיום - KQK / KRK / KPK נפתרים במיקרו-שניות"""
+        if not self.tablebase:
+            return None
         
-        return time_by_level.get(self.skill_level, 0.3)
+        start_time = time.time()
+        move = self.tablebase.best_move(self.board)
+        if not move:
+            return None
+        
+        log.info("♚ Tablebase move", sample=True, move=move)
+        return self._record_ai_move(move, time.time() - start_time, source="tablebase")
+    
+    def _try_cached_move(self, time_limit: float = None) -> Optional[Dict[str, Any]]:
+        """תוצאת חיפוש קודם של אותו מיקום - גם ממשחק אחר"""
+        if not self.cache:
+            return None
+        
+        start_time = time.time()
+        limit = chess.engine.Limit(time=self._get_fast_time_limit(time_limit))
+        cached = self.cache.get(self.board, limit, self.skill_level)
+        if not cached or cached.move not in self.board.legal_moves:
+            return None
+        
+        log.info("💾 Cached move", sample=True, move=cached.move, depth=cached.depth)
+        return self._record_ai_move(cached.move, time.time() - start_time, source="cache")
+    
+    def _try_instant_move(self, time_limit: float = None) -> Optional[Dict[str, Any]]:
+        """מהלכים שלא צריכים את Stockfish"""
+        return self._try_book_move() or self._try_tablebase_move() or self._try_cached_move(time_limit)
+    
+    def get_book_stats(self) -> Dict[str, Any]:
+        """אחוז מהלכי AI שנענו מהספר במשחק הזה"""
+        return {
+            "book_hits": self.book_hits,
+            "ai_moves": self.ai_moves,
+            "book_hit_rate": self.book_hits / self.ai_moves if self.ai_moves else 0.0
+        }
     
-    def get_ai_move(self, time_limit: float = None) -> Dict[str, Any]:
+    def get_ai_move(self, time_limit: float = None, try_instant: bool = True) -> Dict[str, Any]:
         """קבלת מהלך AI מהיר"""
-        if not self.engine:
-            self.start_engine()
-            
-        if self.board.is_game_over():
+        if self.position().is_game_over(self.board):
             return {
                 "success": False,
                 "error": "Game is over",
                 "is_game_over": True
             }
         
+        if try_instant:
+            instant_result = self._try_instant_move(time_limit)
+            if instant_result:
+                return instant_result
+        
+        if not self.engine and not self.pool:
+            self.start_engine()
+        
         try:
             # ✅ זמן חשיבה מהיר
             think_time = self._get_fast_time_limit(time_limit)
-            print(f"🤖 AI thinking for {think_time}s (Level {self.skill_level})")
+            self.time_manager.record(
+                think_time, self.time_manager.base_time(self.skill_level, self.fast_mode, time_limit)
+            )
+            log.info("🤖 AI thinking", sample=True, budget=think_time, level=self.skill_level)
             
             start_time = time.time()
             
             # ✅ חישוב מהיר עם timeout קצר
-            result = self.engine.play(
-                self.board, 
-                chess.engine.Limit(time=think_time),
-                info=chess.engine.INFO_NONE  # ללא מידע נוסף למהירות
-            )
+            with span('engine_search', skill_level=self.skill_level, budget=think_time):
+                result = self._play(chess.engine.Limit(time=think_time))
             
             actual_time = time.time() - start_time
-            print(f"⚡ AI decided in {actual_time:.2f}s: {result.move}")
+            log.info("⚡ AI decided", sample=True, move=result.move, seconds=round(actual_time, 3))
             
             if result.move:
-                san_notation = self.board.san(result.move)
-                self.board.push(result.move)
-                
-                self.game_history.append({
-                    "move": result.move.uci(),
-                    "san": san_notation,
-                    "timestamp": time.time(),
-                    "think_time": actual_time
-                })
-                
-                return {
-                    "success": True,
-                    "move": result.move.uci(),
-                    "san": san_notation,
-                    "fen": self.board.fen(),
-                    "legal_moves": [m.uci() for m in self.board.legal_moves],
-                    "turn": "black" if self.board.turn else "white",
-                    "is_game_over": self.board.is_game_over(),
-                    "think_time": actual_time
-                }
+                self._predicted_reply = result.ponder
+                move_result = self._record_ai_move(result.move, actual_time)
+                move_result["time_budget"] = think_time
+                return move_result
             else:
                 return {
                     "success": False,
@@ -161,12 +327,205 @@ class ChessEngine:
                 }
                 
         except Exception as e:
-            print(f"❌ AI move failed: {e}")
+            log.error("❌ AI move failed", error=str(e))
             return {
                 "success": False,
                 "error": f"Engine error: {str(e)}"
             }
     
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """ה-executor שבו רץ החיפוש - thread אחד לכל מנוע"""
+        if self.pool:
+            return self.pool.executor
+        
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chess-engine")
+        return self._executor
+    
+    async def aget_ai_move(self, time_limit: float = None) -> Dict[str, Any]:
+        """קבלת מהלך AI בלי לחסום את ה-event loop"""
+        self._predicted_reply = None
+        
+        # ✅ ponderhit / מהלך ספר / טבלת סיום נענים מיד, בלי לחכות בתור של המנועים
+        if self._ponder:
+            with span('ponder_wait'):
+                ponder_result = await self._finish_ponder(time_limit)
+            if ponder_result:
+                return ponder_result
+        
+        if not self.position().is_game_over(self.board):
+            with span('instant_probe'):
+                instant_result = self._try_instant_move(time_limit)
+            if instant_result:
+                return instant_result
+        
+        loop = asyncio.get_running_loop()
+        # ה-context עובר ל-thread כדי שה-spans של החיפוש והתור יהיו ילדים של הבקשה
+        result = await loop.run_in_executor(
+            self._get_executor(),
+            contextvars.copy_context().run,
+            partial(self.get_ai_move, time_limit, try_instant=False)
+        )
+        self._start_ponder()
+        return result
+    
+    # ============= Streaming analysis =============
+    
+    async def astream_analysis(self, send: Callable[[Dict[str, Any]], Awaitable[Any]],
+                               time_limit: float = 5.0, rate: float = None,
+                               stop_event: threading.Event = None) -> Dict[str, Any]:
+        """
+        ניתוח המיקום הנוכחי עם עדכוני info מוזרמים (עומק, ציון, nodes, PV) דרך send
+        העדכונים מאוחדים לכל היותר rate בשנייה. stop_event עוצר את הניתוח מבחוץ
+        """
+        stop_event = stop_event or threading.Event()
+        stream = SearchInfoStream(send, rate)
+        sender = asyncio.create_task(stream.run())
+        
+        limit = chess.engine.Limit(time=time_limit)
+        executor = self.pool.batch_executor if self.pool else self._get_executor()
+        search = partial(self._stream_search, self.board.copy(), limit, stop_event, stream.push)
+        
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(executor, partial(self.supervisor.run, search, restart=self._restart_engine))
+            stream.close(stopped=stop_event.is_set())
+        except Exception as e:
+            stream.close(stopped=True, error=str(e))
+        await sender
+        
+        return {"success": True, "updates_received": stream.received, "updates_sent": stream.sent}
+    
+    def _stream_search(self, board: chess.Board, limit: chess.engine.Limit,
+                       stop_event: threading.Event, push: Callable):
+        """רץ ב-thread - ניתוח ב-pool בעדיפות hint, נעצר כשמהלך חי ממתין"""
+        if not self.pool:
+            if not self.engine:
+                self.start_engine()
+            self._iterate_analysis(self.engine, board, limit, stop_event, push)
+            return
+        
+        with self.pool.checkout(skill_level=self.skill_level, priority='hint', stop_event=stop_event) as worker:
+            self._iterate_analysis(worker.engine, board, limit, stop_event, push)
+    
+    @staticmethod
+    def _iterate_analysis(engine, board: chess.Board, limit: chess.engine.Limit,
+                          stop_event: threading.Event, push: Callable):
+        done = threading.Event()
+        
+        def stop_when_requested():
+            # עומקים גבוהים יכולים לקחת שניות בין info ל-info - לא מחכים לעדכון הבא כדי לעצור
+            while not done.wait(0.05):
+                if stop_event.is_set():
+                    analysis.stop()
+                    return
+        
+        deadline = analysis_deadline(limit)
+        with engine.analysis(board, limit) as analysis:
+            watcher = threading.Thread(target=stop_when_requested, name="analysis-stop", daemon=True)
+            watcher.start()
+            try:
+                for info in iterate_analysis(analysis, deadline):
+                    push(info)
+            finally:
+                done.set()
+    
+    # ============= Pondering =============
+    
+    def _start_ponder(self):
+        """חיפוש ברקע על המיקום אחרי התגובה הצפויה של השחקן"""
+        predicted, self._predicted_reply = self._predicted_reply, None
+        if not (self.ponder and self.pool and predicted) or predicted not in self.board.legal_moves:
+            return
+        
+        board = self.board.copy()
+        board.push(predicted)
+        if board.is_game_over():
+            return
+        
+        stop_event = threading.Event()
+        self._ponder = {
+            "move": predicted,
+            "stop": stop_event,
+            "hit": False,
+            "started": time.time(),
+            "future": self.pool.ponder_executor.submit(self._ponder_search, board, stop_event)
+        }
+    
+    def _ponder_search(self, board: chess.Board, stop_event: threading.Event) -> Optional[chess.engine.BestMove]:
+        """רץ ב-thread של ה-pool - מחזיר None אם המאגר עמוס או שה-ponder בוטל"""
+        with self.pool.ponder_checkout(stop_event, skill_level=self.skill_level) as worker:
+            if worker is None or stop_event.is_set():
+                return None
+            
+            limit = chess.engine.Limit(time=self.ponder_max_time)
+            deadline = analysis_deadline(limit)
+            with worker.engine.analysis(board, limit, info=chess.engine.INFO_NONE) as analysis:
+                stop_event.wait(self.ponder_max_time)
+                analysis.stop()
+                return wait_analysis(analysis, deadline)
+    
+    def _resolve_ponder(self, move: chess.Move):
+        """מהלך השחקן הגיע - ponderhit ממשיך לחפש, החטאה מבטלת"""
+        if not self._ponder:
+            return
+        
+        if move == self._ponder["move"]:
+            self._ponder["hit"] = True
+            self.ponder_hits += 1
+        else:
+            self.ponder_misses += 1
+            self.cancel_ponder()
+    
+    def cancel_ponder(self):
+        """עצירת ponder פעיל ושחרור המנוע המושאל - כשהשחקן עוזב, נכנע או מתחיל משחק חדש"""
+        if self._ponder:
+            self._ponder["stop"].set()
+            self._ponder = None
+    
+    async def _finish_ponder(self, time_limit: float = None) -> Optional[Dict[str, Any]]:
+        """ponderhit - משלימים את זמן החשיבה (אם נשאר) ולוקחים את תוצאת ה-ponder"""
+        ponder, self._ponder = self._ponder, None
+        if not ponder:
+            return None
+        if not ponder["hit"]:
+            ponder["stop"].set()
+            return None
+        
+        start_time = time.time()
+        search = asyncio.wrap_future(ponder["future"])
+        # ה-ponder כבר חיפש לפחות את זמן החשיבה של השחקן - מחכים רק את ההפרש
+        remaining = self._get_fast_time_limit(time_limit) - (start_time - ponder["started"])
+        if remaining > 0:
+            await asyncio.wait({search}, timeout=remaining)
+        ponder["stop"].set()
+        
+        try:
+            best = await search
+        except Exception as e:
+            log.warning("⚠️ Ponder search failed", error=str(e))
+            return None
+        
+        if not best or not best.move or best.move not in self.board.legal_moves:
+            return None
+        
+        log.info("🧠 Ponderhit", sample=True, move=best.move)
+        result = self._record_ai_move(best.move, time.time() - start_time, source="ponder")
+        # ✅ ממשיכים לחשוב על התגובה הבאה
+        self._predicted_reply = best.ponder
+        self._start_ponder()
+        return result
+    
+    def get_ponder_stats(self) -> Dict[str, Any]:
+        """אחוז הפגיעה של התחזיות במשחק הזה"""
+        predictions = self.ponder_hits + self.ponder_misses
+        return {
+            "enabled": bool(self.ponder and self.pool),
+            "ponder_hits": self.ponder_hits,
+            "ponder_misses": self.ponder_misses,
+            "ponder_hit_rate": self.ponder_hits / predictions if predictions else 0.0
+        }
+    
     def _skill_to_elo(self, skill_level: int) -> int:
         """המרת רמת skill ל-ELO משוער - מהירות"""
         # ✅ רמות נמוכות יותר למהירות
@@ -174,12 +533,17 @@ class ChessEngine:
     
     def new_game(self) -> Dict[str, Any]:
         """התחלת משחק חדש מהיר"""
+        self.cancel_ponder()
         self.board = chess.Board()
+        self._scores.clear()
         self.game_history = []
+        self.ai_moves = 0
+        self.book_hits = 0
+        self.out_of_book = False
         
         return {
             "fen": self.board.fen(),
-            "legal_moves": [move.uci() for move in self.board.legal_moves],
+            "legal_moves": list(self.position().legal_moves),
             "turn": "white",
             "status": "active",
             "move_count": 0,
@@ -190,16 +554,19 @@ class ChessEngine:
         """ביצוע מהלך מהיר"""
         try:
             move = chess.Move.from_uci(move_uci)
+            position = self.position()
             
-            if move not in self.board.legal_moves:
+            if move.uci() not in position.legal_moves:
                 return {
                     "success": False,
                     "error": f"Illegal move: {move_uci}",
-                    "legal_moves": [m.uci() for m in self.board.legal_moves]
+                    "legal_moves": list(position.legal_moves)
                 }
             
-            san_notation = self.board.san(move)
+            self._resolve_ponder(move)
+            san_notation = position.san(self.board, move)
             self.board.push(move)
+            position = self.position()
             
             self.game_history.append({
                 "move": move_uci,
@@ -212,9 +579,9 @@ class ChessEngine:
                 "move": move_uci,
                 "san": san_notation,
                 "fen": self.board.fen(),
-                "legal_moves": [m.uci() for m in self.board.legal_moves],
+                "legal_moves": list(position.legal_moves),
                 "turn": "black" if self.board.turn else "white",
-                "is_game_over": self.board.is_game_over()
+                "is_game_over": position.is_game_over(self.board)
             }
             
         except Exception as e:
@@ -223,59 +590,65 @@ class ChessEngine:
                 "error": f"Invalid move: {str(e)}"
             }
     
+    def get_position_info(self) -> Dict[str, Any]:
+        """מצב הלוח הנוכחי"""
+        position = self.position()
+        return {
+            "fen": self.board.fen(),
+            "legal_moves": list(position.legal_moves),
+            "turn": "white" if self.board.turn else "black",
+            "move_count": len(self.board.move_stack),
+            "is_check": position.is_check,
+            "is_checkmate": position.is_checkmate,
+            "is_game_over": position.is_game_over(self.board)
+        }
+    
     def get_game_result(self) -> str:
         """תוצאת המשחק"""
-        if not self.board.is_game_over():
-            return "game in progress"
-        elif self.board.is_checkmate():
-            winner = "black" if self.board.turn == chess.WHITE else "white"
-            return f"{winner} wins by checkmate"
-        elif self.board.is_stalemate():
-            return "draw by stalemate"
-        elif self.board.is_insufficient_material():
-            return "draw by insufficient material"
-        elif self.board.is_fivefold_repetition():
-            return "draw by repetition"
-        elif self.board.is_seventyfive_moves():
-            return "draw by 75-move rule"
-        else:
-            return "game in progress"
+        return self.position().result(self.board)
     
     def set_skill_level(self, level: int):
         """עדכון רמת הקושי - מהיר"""
         # ✅ הגבל לרמות נמוכות למהירות
         self.skill_level = max(1, min(8, level))
-        print(f"🎯 FAST skill level: {self.skill_level} (ELO: ~{self._skill_to_elo(self.skill_level)})")
+        log.info("🎯 FAST skill level", level=self.skill_level, elo=self._skill_to_elo(self.skill_level))
         
         # ✅ עדכן הגדרות מהירות אם המנוע פועל
         if self.engine:
-            try:
-                self.engine.configure({
-                    "Skill Level": self.skill_level,
-                    "Hash": 16,  # קטן למהירות
-                    "Threads": 1
-                })
-            except:
-                pass
+            self._configure_skill()
+    
+    def _configure_skill(self):
+        """שליחת רמת הקושי למנוע"""
+        try:
+            self.engine.configure({
+                "Skill Level": self.skill_level,
+                "Hash": 16,  # קטן למהירות
+                "Threads": 1
+            })
+        except:
+            pass
     
     def set_fast_mode(self, enabled: bool):
         """הפעל/כבה מצב מהיר"""
         self.fast_mode = enabled
         if enabled:
             self.max_think_time = 0.5
-            print("⚡ Fast mode enabled - quick responses")
+            log.debug("⚡ Fast mode enabled - quick responses")
         else:
             self.max_think_time = 2.0
-            print("🐌 Normal mode enabled - thoughtful moves")
+            log.debug("🐌 Normal mode enabled - thoughtful moves")
     
     def load_fen(self, fen: str) -> bool:
         """טעינת מיקום מ-FEN"""
         try:
             self.board = chess.Board(fen)
+            self.cancel_ponder()
+            self._scores.clear()
             self.game_history = []
+            self.out_of_book = False
             return True
         except Exception as e:
-            print(f"❌ Invalid FEN: {e}")
+            log.warning("❌ Invalid FEN", error=str(e))
             return False
 
 # ✅ Instance גלובלי מהיר
@@ -4,21 +4,35 @@ from datetime import datetime
 import os
 from typing import Optional, List, Dict
 
+import database.mongo_metrics  # noqa: F401 - זמני פקודות ל-/metrics
+
 class MongoDB:
     def __init__(self):
         self.client: Optional[AsyncIOMotorClient] = None
         self.db = None
         
-    async def connect(self):
-        mongo_url = os.getenv('MONGODB_URL', 'mongodb://localhost:27017')
-        self.client = AsyncIOMotorClient(mongo_url)
+    async def connect(self) -> bool:
+        mongo_url = os.getenv('MONGODB_URL') or os.getenv('MONGO_URI', 'mongodb://localhost:27017')
+        self.client = AsyncIOMotorClient(mongo_url, serverSelectionTimeoutMS=5000)
+        try:
+            # Fail fast - callers fall back to memory-only when the server is unreachable
+            await self.client.admin.command('ping')
+        except Exception as e:
+            print(f"❌ MongoDB connection failed: {e}")
+            self.client.close()
+            self.client = None
+            return False
         self.db = self.client.chessmentor
         print("📁 Connected to MongoDB")
+        return True
         
     async def close(self):
         if self.client:
             self.client.close()
 
+    def is_connected(self) -> bool:
+        return self.db is not None
+
     # Games Collection
     async def save_game(self, user_id: str, game_data: dict) -> str:
         """Save completed game to database"""
@@ -65,5 +79,21 @@ class MongoDB:
             {"$set": {"analysis": analysis, "analyzed_at": datetime.utcnow()}}
         )
 
+    # Active games spilled to the database while idle
+    async def save_active_game(self, game_id: str, game_doc: dict):
+        """Persist an idle in-progress game so its memory can be released"""
+        await self.db.active_games.replace_one(
+            {"game_id": game_id},
+            {**game_doc, "game_id": game_id, "spilled_at": datetime.utcnow()},
+            upsert=True
+        )
+    
+    async def load_active_game(self, game_id: str) -> Optional[Dict]:
+        """Get a spilled in-progress game"""
+        return await self.db.active_games.find_one({"game_id": game_id}, {"_id": 0})
+    
+    async def delete_active_game(self, game_id: str):
+        await self.db.active_games.delete_one({"game_id": game_id})
+
 # Global instance
 mongodb = MongoDB()
\ No newline at end of file
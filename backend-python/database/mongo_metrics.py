@@ -0,0 +1,32 @@
+# backend-python/database/mongo_metrics.py - זמני פקודות MongoDB
+"""
+MongoDB command metrics
+listener של pymongo.monitoring - כל פקודה (find / insert / update ...) של כל client נמדדת
+בלי לעטוף את הקריאות עצמן. נרשם ב-import, לפני שה-clients נוצרים ב-startup
+"""
+
+from pymongo import monitoring
+
+from utils.metrics import metrics
+
+mongo_command_seconds = metrics.histogram(
+    'mongo_command_duration_seconds', 'MongoDB command latency', ('command',)
+)
+mongo_command_failures = metrics.counter(
+    'mongo_command_failures_total', 'MongoDB commands that failed', ('command',)
+)
+
+
+class CommandTimer(monitoring.CommandListener):
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        mongo_command_seconds.observe(event.duration_micros / 1e6, event.command_name)
+
+    def failed(self, event):
+        mongo_command_seconds.observe(event.duration_micros / 1e6, event.command_name)
+        mongo_command_failures.inc(1, event.command_name)
+
+
+monitoring.register(CommandTimer())
@@ -0,0 +1,302 @@
+# backend-python/engine/endgame_bitbase.py - טבלאות סיומים מובנות
+"""
+Endgame Tablebases for trivial endings (KQK, KRK, KPK)
+טבלאות סיום מחושבות מראש בניתוח רטרוגרדי, שמורות כמערכים דחוסים וממופות לזיכרון
+
+כל טבלה היא בית אחד לכל מיקום: 0 = תיקו, אחרת מספר חצאי-מהלכים עד מט + 1.
+הצד החזק תמיד לבן - מיקומים שבהם לשחור יש את הכלי משתקפים לפני החיפוש.
+
+יצירת הטבלאות (פעם אחת, offline):
+    python -m engine.endgame_bitbase
+"""
+
+import mmap
+import os
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+import chess
+
+TABLES = ('KQK', 'KRK', 'KPK')
+TABLE_SIZE = 2 * 64 * 64 * 64
+WHITE_TO_MOVE, BLACK_TO_MOVE = 0, 1
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'endgames')
+
+_PIECE_TABLE = {chess.QUEEN: 'KQK', chess.ROOK: 'KRK', chess.PAWN: 'KPK'}
+
+
+def _index(stm: int, wk: int, bk: int, ps: int) -> int:
+    return (stm << 18) | (wk << 12) | (bk << 6) | ps
+
+
+class EndgameBitbase:
+    """גישה לטבלאות הסיום הממופות לזיכרון"""
+
+    def __init__(self, directory: str = None):
+        self.directory = directory or os.getenv('ENDGAME_BITBASE_DIR', DEFAULT_DIR)
+        self._tables: Dict[str, mmap.mmap] = {}
+        self._loaded = False
+        self.hits = 0
+
+    def _load(self):
+        """מיפוי כל הטבלאות הקיימות - פעם אחת"""
+        if self._loaded:
+            return
+        self._loaded = True
+
+        for name in TABLES:
+            path = os.path.join(self.directory, f"{name}.bin")
+            if not os.path.exists(path):
+                continue
+            with open(path, 'rb') as table_file:
+                self._tables[name] = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._tables:
+            print(f"♚ Endgame bitbases loaded: {', '.join(self._tables)}")
+        else:
+            print(f"⚠️ No endgame bitbases in {self.directory} - run: python -m engine.endgame_bitbase")
+
+    def probe(self, board: chess.Board) -> Optional[Tuple[int, int]]:
+        """
+        (wdl, dtm) מנקודת המבט של הצד שתורו: 1 ניצחון, 0 תיקו, -1 הפסד
+        dtm בחצאי-מהלכים עד מט. None אם המיקום לא בטבלאות
+        """
+        occupied = board.occupied
+        if chess.popcount(occupied) != 3:
+            return None
+
+        kings = board.kings
+        piece_square = chess.lsb(occupied & ~kings)
+        piece_type = board.piece_type_at(piece_square)
+        name = _PIECE_TABLE.get(piece_type)
+        if not name:
+            return None
+
+        self._load()
+        table = self._tables.get(name)
+        if table is None:
+            return None
+
+        strong = board.color_at(piece_square)
+        if strong == chess.WHITE:
+            wk, bk, ps = board.king(chess.WHITE), board.king(chess.BLACK), piece_square
+            stm = WHITE_TO_MOVE if board.turn == chess.WHITE else BLACK_TO_MOVE
+        else:
+            # ✅ שיקוף - הצד החזק הופך ללבן
+            wk = chess.square_mirror(board.king(chess.BLACK))
+            bk = chess.square_mirror(board.king(chess.WHITE))
+            ps = chess.square_mirror(piece_square)
+            stm = WHITE_TO_MOVE if board.turn == chess.BLACK else BLACK_TO_MOVE
+
+        value = table[_index(stm, wk, bk, ps)]
+        self.hits += 1
+        if value == 0:
+            return 0, 0
+        # רק הצד החזק יכול לנצח
+        return (1 if stm == WHITE_TO_MOVE else -1), value - 1
+
+    def best_move(self, board: chess.Board) -> Optional[chess.Move]:
+        """המהלך הטוב ביותר לפי הטבלאות - מנצח מהר, מפסיד לאט, שומר על תיקו"""
+        if self.probe(board) is None:
+            return None
+
+        best_move, best_key = None, None
+        for move in board.legal_moves:
+            board.push(move)
+            if chess.popcount(board.occupied) == 2 or board.is_insufficient_material():
+                outcome = (0, 0)
+            elif board.is_checkmate():
+                outcome = (-1, 0)
+            else:
+                outcome = self.probe(board) or (0, 0)
+            board.pop()
+
+            # התוצאה של היריב - הופכים לנקודת המבט שלנו
+            wdl, dtm = -outcome[0], outcome[1]
+            key = (wdl, -dtm if wdl > 0 else dtm)
+            if best_key is None or key > best_key:
+                best_move, best_key = move, key
+
+        return best_move
+
+    def evaluate(self, board: chess.Board) -> Optional[float]:
+        """הערכה מנקודת המבט של לבן בסולם של StockfishAnalyzer (±10 = מט)"""
+        result = self.probe(board)
+        if result is None:
+            return None
+
+        wdl = result[0] if board.turn == chess.WHITE else -result[0]
+        return 10.0 * wdl
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'tables': list(self._tables), 'hits': self.hits}
+
+
+# ============= Offline generation (retrograde analysis) =============
+
+def _ray_tables() -> Tuple[List[List[int]], List[List[List[int]]], List[List[List[int]]]]:
+    king_moves, rook_rays, queen_rays = [], [], []
+    orthogonal = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+    diagonal = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+    for sq in range(64):
+        f, r = sq & 7, sq >> 3
+        king_moves.append([
+            (r + dr) * 8 + f + df
+            for df in (-1, 0, 1) for dr in (-1, 0, 1)
+            if (df or dr) and 0 <= f + df < 8 and 0 <= r + dr < 8
+        ])
+
+        rays = []
+        for df, dr in orthogonal + diagonal:
+            ray, nf, nr = [], f + df, r + dr
+            while 0 <= nf < 8 and 0 <= nr < 8:
+                ray.append(nr * 8 + nf)
+                nf, nr = nf + df, nr + dr
+            rays.append(ray)
+        rook_rays.append(rays[:4])
+        queen_rays.append(rays)
+
+    return king_moves, rook_rays, queen_rays
+
+
+def generate_table(name: str, directory: str = DEFAULT_DIR) -> bytearray:
+    """ניתוח רטרוגרדי של טבלה אחת - KPK דורש ש-KQK ו-KRK כבר קיימים"""
+    king_moves, rook_rays, queen_rays = _ray_tables()
+    adjacent = [set(moves) for moves in king_moves]
+    is_pawn = name == 'KPK'
+    rays = rook_rays if name == 'KRK' else queen_rays
+
+    def attacks(ps: int, target: int, blocker: int) -> bool:
+        """האם הכלי הלבן ב-ps תוקף את target (המלך הלבן חוסם)"""
+        if is_pawn:
+            f = ps & 7
+            return (f > 0 and target == ps + 7) or (f < 7 and target == ps + 9)
+        for ray in rays[ps]:
+            for sq in ray:
+                if sq == target:
+                    return True
+                if sq == blocker:
+                    break
+        return False
+
+    def legal(wk: int, bk: int, ps: int, stm: int) -> bool:
+        if wk == bk or wk == ps or bk == ps or bk in adjacent[wk]:
+            return False
+        if is_pawn and not 8 <= ps < 56:
+            return False
+        # לבן בתור - השחור לא יכול להיות בשח
+        return not (stm == WHITE_TO_MOVE and attacks(ps, bk, wk))
+
+    values = bytearray(TABLE_SIZE)
+    resolved = bytearray(TABLE_SIZE)
+    counts = bytearray(TABLE_SIZE)
+    buckets: List[List[int]] = [[] for _ in range(256)]
+    ESCAPE = 255
+
+    # שלב 1: ספירת מהלכי השחור, מטים ופטים
+    for wk in range(64):
+        for bk in range(64):
+            for ps in range(64):
+                if not legal(wk, bk, ps, BLACK_TO_MOVE):
+                    continue
+                count = 0
+                for t in king_moves[bk]:
+                    if t == wk or t in adjacent[wk]:
+                        continue
+                    if t == ps:
+                        count = ESCAPE  # לכידת הכלי - תיקו
+                        break
+                    if not attacks(ps, t, wk):
+                        count += 1
+                idx = _index(BLACK_TO_MOVE, wk, bk, ps)
+                counts[idx] = count
+                if count == 0 and attacks(ps, bk, wk):
+                    buckets[0].append(idx)
+
+    # שלב 2: הכתרות מ-KPK נכנסות עם הערך מטבלאות KQK / KRK
+    if is_pawn:
+        promoted = {}
+        for target in ('KQK', 'KRK'):
+            with open(os.path.join(directory, f"{target}.bin"), 'rb') as table_file:
+                promoted[target] = table_file.read()
+        for wk in range(64):
+            for bk in range(64):
+                for ps in range(48, 56):
+                    to_sq = ps + 8
+                    if to_sq in (wk, bk) or not legal(wk, bk, ps, WHITE_TO_MOVE):
+                        continue
+                    depths = [
+                        table[_index(BLACK_TO_MOVE, wk, bk, to_sq)]
+                        for table in promoted.values()
+                        if table[_index(BLACK_TO_MOVE, wk, bk, to_sq)]
+                    ]
+                    if depths:
+                        buckets[min(depths)].append(_index(WHITE_TO_MOVE, wk, bk, ps))
+
+    # שלב 3: BFS אחורה לפי עומק
+    for depth in range(256):
+        for idx in buckets[depth]:
+            if resolved[idx]:
+                continue
+            resolved[idx] = 1
+            values[idx] = depth + 1
+
+            stm, wk, bk, ps = idx >> 18, (idx >> 12) & 63, (idx >> 6) & 63, idx & 63
+            if stm == BLACK_TO_MOVE:
+                # שחור מפסיד - כל מהלך לבן שמוביל לכאן מנצח
+                predecessors = []
+                for s in king_moves[wk]:
+                    if s != bk and s != ps and s not in adjacent[bk]:
+                        predecessors.append((s, bk, ps))
+                if is_pawn:
+                    if ps >= 16 and ps - 8 not in (wk, bk):
+                        predecessors.append((wk, bk, ps - 8))
+                        if 24 <= ps < 32 and ps - 16 not in (wk, bk):
+                            predecessors.append((wk, bk, ps - 16))
+                else:
+                    for ray in rays[ps]:
+                        for s in ray:
+                            if s == wk or s == bk:
+                                break
+                            predecessors.append((wk, bk, s))
+
+                for pwk, pbk, pps in predecessors:
+                    if legal(pwk, pbk, pps, WHITE_TO_MOVE):
+                        pidx = _index(WHITE_TO_MOVE, pwk, pbk, pps)
+                        if not resolved[pidx]:
+                            buckets[depth + 1].append(pidx)
+            else:
+                # לבן מנצח - מורידים את מונה המהלכים של כל מיקום שחור קודם
+                for s in king_moves[bk]:
+                    if s == wk or s == ps or s in adjacent[wk]:
+                        continue
+                    pidx = _index(BLACK_TO_MOVE, wk, s, ps)
+                    if counts[pidx] == ESCAPE or resolved[pidx]:
+                        continue
+                    counts[pidx] -= 1
+                    if counts[pidx] == 0:
+                        buckets[depth + 1].append(pidx)
+
+    return values
+
+
+def generate_all(directory: str = DEFAULT_DIR):
+    """יצירת כל הטבלאות לתיקייה"""
+    os.makedirs(directory, exist_ok=True)
+    for name in TABLES:
+        start_time = time.time()
+        values = generate_table(name, directory)
+        with open(os.path.join(directory, f"{name}.bin"), 'wb') as table_file:
+            table_file.write(values)
+        wins = sum(1 for v in values if v)
+        print(f"✅ {name}: {wins} decided positions, max DTM {max(values) - 1} plies "
+              f"({time.time() - start_time:.1f}s)")
+
+
+# Instance גלובלי - הטבלאות ממופות בחיפוש הראשון
+endgame_bitbase = EndgameBitbase()
+
+if __name__ == "__main__":
+    generate_all()
@@ -0,0 +1,156 @@
+# backend-python/engine/game_state.py - מצב משחק קומפקטי
+"""
+Compact Game State
+מצב משחק ב-__slots__ עם היסטוריית מהלכים כמערך array('H') של מהלכים מקודדים ב-16 ביט.
+הלוח, ה-FEN וה-SAN של כל מסע נגזרים מהמהלכים רק כשצריך - בזיכרון נשארים ~2 בתים למסע
+"""
+
+import time
+from array import array
+from typing import Any, Dict, List, Optional
+
+import chess
+
+# קידוד מהלך: from (6 ביט) | to (6 ביט) | סוג הכתרה (3 ביט)
+_TO_SHIFT = 6
+_PROMOTION_SHIFT = 12
+
+
+def encode_move(move: chess.Move) -> int:
+    return move.from_square | (move.to_square << _TO_SHIFT) | ((move.promotion or 0) << _PROMOTION_SHIFT)
+
+
+def decode_move(code: int) -> chess.Move:
+    promotion = code >> _PROMOTION_SHIFT
+    return chess.Move(code & 63, (code >> _TO_SHIFT) & 63, promotion or None)
+
+
+class GameState:
+    """מצב משחק פעיל - רק הנתונים שאי אפשר לגזור"""
+
+    __slots__ = (
+        'game_id', 'user_id', 'ai_level', 'player_color', 'created_at', 'game_result',
+        'fast_mode', 'starting_fen', 'moves', 'ai_moves', 'book_hits', 'out_of_book', 'scores',
+        'ponder_hits', 'ponder_misses', 'engine', 'delta'
+    )
+
+    def __init__(self, game_id: str, user_id: Optional[str] = None, ai_level: int = 3,
+                 player_color: str = 'white', starting_fen: Optional[str] = None,
+                 created_at: Optional[float] = None):
+        self.game_id = game_id
+        self.user_id = user_id
+        self.ai_level = ai_level
+        self.player_color = player_color
+        self.created_at = created_at or time.time()
+        self.game_result = None
+        self.fast_mode = True
+        self.starting_fen = starting_fen  # None = עמדת הפתיחה הרגילה
+        self.moves = array('H')
+
+        # סטטיסטיקת ספר הפתיחות של ChessEngine בין בקשות
+        self.ai_moves = 0
+        self.book_hits = 0
+        self.out_of_book = False
+        # הערכות אחרונות (centipawns) ל-time manager וסטטיסטיקת ponder - ChessEngine נבנה מחדש בכל בקשה
+        self.scores = array('h')
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+
+        # ChessEngine מחובר רק בזמן בקשה (או ponder) - ראו chess_api
+        self.engine = None
+        # MoveDeltaEncoder ללקוח שביקש protocol='delta' - לא נשמר ב-MongoDB (אחרי שחזור נשלח מצב מלא)
+        self.delta = None
+
+    def push(self, move: chess.Move):
+        self.moves.append(encode_move(move))
+
+    def push_uci(self, uci: str):
+        self.push(chess.Move.from_uci(uci))
+
+    @property
+    def move_count(self) -> int:
+        return len(self.moves)
+
+    def move_list(self) -> List[chess.Move]:
+        return [decode_move(code) for code in self.moves]
+
+    def board(self) -> chess.Board:
+        """הלוח הנוכחי - משוחזר מהמהלכים (כולל move stack לזיהוי חזרות)"""
+        board = chess.Board(self.starting_fen) if self.starting_fen else chess.Board()
+        for code in self.moves:
+            board.push(decode_move(code))
+        return board
+
+    def fens(self) -> List[str]:
+        """FEN של כל עמדה מההתחלה ועד עכשיו"""
+        board = chess.Board(self.starting_fen) if self.starting_fen else chess.Board()
+        fens = [board.fen()]
+        for code in self.moves:
+            board.push(decode_move(code))
+            fens.append(board.fen())
+        return fens
+
+    def san_moves(self) -> List[str]:
+        board = chess.Board(self.starting_fen) if self.starting_fen else chess.Board()
+        sans = []
+        for code in self.moves:
+            move = decode_move(code)
+            sans.append(board.san(move))
+            board.push(move)
+        return sans
+
+    def get_book_stats(self) -> Dict[str, Any]:
+        """כמו ChessEngine.get_book_stats - כשאין מנוע מחובר"""
+        return {
+            "book_hits": self.book_hits,
+            "ai_moves": self.ai_moves,
+            "book_hit_rate": self.book_hits / self.ai_moves if self.ai_moves else 0.0
+        }
+
+    def get_ponder_stats(self) -> Dict[str, Any]:
+        """כמו ChessEngine.get_ponder_stats - בלי מנוע מחובר אין ponder פעיל"""
+        predictions = self.ponder_hits + self.ponder_misses
+        return {
+            "enabled": False,
+            "ponder_hits": self.ponder_hits,
+            "ponder_misses": self.ponder_misses,
+            "ponder_hit_rate": self.ponder_hits / predictions if predictions else 0.0
+        }
+
+    def to_document(self) -> Dict[str, Any]:
+        """מסמך לשמירה ב-MongoDB"""
+        return {
+            'game_id': self.game_id,
+            'user_id': self.user_id,
+            'ai_level': self.ai_level,
+            'player_color': self.player_color,
+            'created_at': self.created_at,
+            'game_result': self.game_result,
+            'fast_mode': self.fast_mode,
+            'starting_fen': self.starting_fen,
+            'uci_moves': [move.uci() for move in self.move_list()],
+            'ai_moves': self.ai_moves,
+            'book_hits': self.book_hits,
+            'out_of_book': self.out_of_book,
+            'scores': list(self.scores),
+            'ponder_hits': self.ponder_hits,
+            'ponder_misses': self.ponder_misses
+        }
+
+    @classmethod
+    def from_document(cls, document: Dict[str, Any]) -> 'GameState':
+        state = cls(
+            document['game_id'], document.get('user_id'), document.get('ai_level', 3),
+            document.get('player_color', 'white'), document.get('starting_fen'), document.get('created_at')
+        )
+        state.game_result = document.get('game_result')
+        state.fast_mode = document.get('fast_mode', True)
+        for uci in document.get('uci_moves', []):
+            state.push_uci(uci)
+        state.ai_moves = document.get('ai_moves', 0)
+        state.book_hits = document.get('book_hits', 0)
+        state.out_of_book = document.get('out_of_book', False)
+        state.scores = array('h', document.get('scores', []))
+        state.ponder_hits = document.get('ponder_hits', 0)
+        state.ponder_misses = document.get('ponder_misses', 0)
+        return state
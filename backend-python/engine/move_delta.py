@@ -0,0 +1,106 @@
+# backend-python/engine/move_delta.py - פרוטוקול תגובות מהלך דחוס (delta)
+"""
+Delta-encoded Move Responses
+לקוח שבוחר protocol='delta' ומדווח את ה-ply האחרון שקיבל מקבל רק ply, תור ושינוי ב-legal_moves
+מול העמדה האחרונה שנשלחה לו עם אותו צד לשחק (השינוי בין מסעים של אותו צד קטן בהרבה מהרשימה).
+ply שלא תואם את מה שנשלח (פער ברצף / לקוח חדש / משחק שחזר מ-MongoDB) מקבל את המצב המלא
+"""
+
+import threading
+from collections import deque
+from typing import Any, Dict, Optional, Sequence
+
+PROTOCOL_FULL = 'full'
+PROTOCOL_DELTA = 'delta'
+
+
+def legal_delta(previous: Sequence[str], current: Sequence[str]) -> Dict[str, list]:
+    """מהלכים שנוספו / ירדו - הלקוח מחיל על הרשימה של base_ply"""
+    previous_set = set(previous)
+    current_set = set(current)
+    return {
+        'add': [move for move in current if move not in previous_set],
+        'remove': [move for move in previous if move not in current_set]
+    }
+
+
+class DeltaStats:
+    """מונים משותפים לכל המשחקים - כמה תגובות נשלחו דחוסות וכמה מהלכים נחסכו"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.full = 0
+        self.deltas = 0
+        self.resyncs = 0  # פער ברצף - נשלח מצב מלא
+        self.moves_sent = 0
+        self.moves_saved = 0
+
+    def record(self, full: bool, sent: int, total: int, resync: bool = False):
+        with self._lock:
+            if full:
+                self.full += 1
+            else:
+                self.deltas += 1
+            if resync:
+                self.resyncs += 1
+            self.moves_sent += sent
+            self.moves_saved += total - sent
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            responses = self.full + self.deltas
+            return {
+                'full': self.full,
+                'deltas': self.deltas,
+                'resyncs': self.resyncs,
+                'delta_rate': self.deltas / responses if responses else 0.0,
+                'moves_sent': self.moves_sent,
+                'moves_saved': self.moves_saved
+            }
+
+
+class MoveDeltaEncoder:
+    """מה שנשלח ללקוח אחד - שתי העמדות האחרונות (אחת לכל צד)"""
+
+    __slots__ = ('_sent', 'stats')
+
+    def __init__(self, stats: DeltaStats = None):
+        self._sent = deque(maxlen=2)  # (ply, legal_moves)
+        self.stats = stats or delta_stats
+
+    @property
+    def ply(self) -> Optional[int]:
+        return self._sent[-1][0] if self._sent else None
+
+    def in_sync(self, client_ply) -> bool:
+        """הלקוח מחזיק בדיוק את מה ששלחנו אחרון"""
+        return client_ply is not None and client_ply == self.ply
+
+    def encode(self, ply: int, legal_moves: Sequence[str], synced: bool, **full_fields) -> Dict[str, Any]:
+        """
+        העמדה ב-ply כתגובה דחוסה, או המצב המלא (full_fields + legal_moves) כשאין בסיס משותף.
+        synced נבדק פעם אחת בתחילת הבקשה - ההודעות הבאות באותה בקשה נבנות על מה שנשלח בה
+        """
+        resync = not synced and bool(self._sent)
+        if not synced:
+            self._sent.clear()
+
+        base = None
+        for base_ply, base_moves in self._sent:
+            if (ply - base_ply) % 2 == 0:
+                base = (base_ply, base_moves)
+        self._sent.append((ply, tuple(legal_moves)))
+
+        if base:
+            delta = legal_delta(base[1], legal_moves)
+            sent = len(delta['add']) + len(delta['remove'])
+            if sent < len(legal_moves):
+                self.stats.record(False, sent, len(legal_moves))
+                return {'ply': ply, 'base_ply': base[0], 'legal_delta': delta}
+
+        self.stats.record(True, len(legal_moves), len(legal_moves), resync=resync)
+        return {'ply': ply, 'full': True, **full_fields, 'legal_moves': list(legal_moves)}
+
+
+# Instance גלובלי - מדדים משותפים לכל המשחקים
+delta_stats = DeltaStats()
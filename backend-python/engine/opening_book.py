@@ -0,0 +1,77 @@
+# backend-python/engine/opening_book.py - ספר פתיחות בתוך התהליך
+"""
+Polyglot Opening Book
+ספר פתיחות בפורמט Polyglot - נטען פעם אחת, ממופה לזיכרון וחיפוש בינארי לפי Zobrist
+"""
+
+import os
+import random
+import threading
+from typing import Optional
+
+import chess
+import chess.polyglot
+
+
+class OpeningBook:
+    """ספר פתיחות Polyglot משותף לכל המשחקים"""
+
+    def __init__(self, path: str = None, max_ply: int = None):
+        self.path = path or os.getenv('OPENING_BOOK_PATH')
+        self.max_ply = max_ply or int(os.getenv('OPENING_BOOK_MAX_PLY', 20))
+        self._reader = None
+        self._load_failed = False
+        self._lock = threading.Lock()
+
+    def _get_reader(self) -> Optional[chess.polyglot.MemoryMappedReader]:
+        """פתיחת הקובץ פעם אחת (mmap) - בפעם הראשונה שצריך"""
+        if self._reader or self._load_failed:
+            return self._reader
+
+        with self._lock:
+            if self._reader or self._load_failed:
+                return self._reader
+
+            if not self.path or not os.path.exists(self.path):
+                print(f"⚠️ Opening book not found: {self.path} - book disabled")
+                self._load_failed = True
+                return None
+
+            try:
+                self._reader = chess.polyglot.open_reader(self.path)
+                print(f"📖 Opening book loaded: {self.path}")
+            except Exception as e:
+                print(f"❌ Failed to load opening book: {e}")
+                self._load_failed = True
+
+        return self._reader
+
+    def choose_move(self, board: chess.Board, skill_level: int = 3) -> Optional[chess.Move]:
+        """
+        בחירת מהלך מהספר לפי המשקלים
+        רמה נמוכה משטחת את המשקלים (מגוון, קווים חלשים), רמה גבוהה מחדדת לקווים הראשיים
+        """
+        if len(board.move_stack) >= self.max_ply:
+            return None
+
+        reader = self._get_reader()
+        if not reader:
+            return None
+
+        entries = [entry for entry in reader.find_all(board) if entry.weight > 0]
+        if not entries:
+            return None
+
+        exponent = max(1, skill_level) / 4.0
+        weights = [entry.weight ** exponent for entry in entries]
+        return random.choices(entries, weights=weights)[0].move
+
+    def close(self):
+        with self._lock:
+            if self._reader:
+                self._reader.close()
+                self._reader = None
+
+
+# Instance גלובלי - הקובץ נפתח רק בחיפוש הראשון
+opening_book = OpeningBook()
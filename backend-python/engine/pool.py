@@ -0,0 +1,488 @@
+# backend-python/engine/pool.py - מאגר תהליכי Stockfish משותף
+"""
+Shared Stockfish Engine Pool
+מאגר מנועים חסום בגודל מספר הליבות - משחקים שואלים מנוע לכל חיפוש בלבד
+warmer ברקע מחזיק K מנועים מוכנים וממחזר מנועים אחרי N חיפושים או גידול RSS
+בקשות מנותבות למנוע שכבר מוגדר לרמת הקושי של המשחק - configure רק כשאין התאמה
+pondering משתמש רק במנועים פנויים, עד תקציב קבוע, ומפנה אותם כשחיפוש חי ממתין
+בקשות ממתינות נענות לפי מחלקת עדיפות (live > hint > review > background) וחיפושי ניתוח
+ארוכים נעצרים כשבקשה בעדיפות גבוהה יותר ממתינה
+"""
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Any
+
+from chess_engine import ChessEngine, FAST_SKILL_CAP
+from engine.supervisor import ENGINE_TIMEOUTS
+from utils.metrics import metrics
+from utils.tracing import record
+
+
+# ✅ מחלקות עדיפות - מהגבוהה לנמוכה
+PRIORITIES = ('live', 'hint', 'review', 'background')
+_PRIORITY_RANK = {name: rank for rank, name in enumerate(PRIORITIES)}
+
+engine_queue_wait_seconds = metrics.histogram(
+    'chess_engine_queue_wait_seconds', 'Time waiting for a pooled engine', ('priority',)
+)
+
+
+class EnginePoolTimeout(Exception):
+    """אין מנוע פנוי בזמן שהוקצב"""
+
+
+class EnginePool:
+    """מאגר מנועי Stockfish משותף לכל המשחקים"""
+
+    def __init__(self, size: int = None, stockfish_path: str = None, acquire_timeout: float = 5.0,
+                 spares: int = None, max_searches: int = None, max_rss_growth_mb: float = None,
+                 ponder_share: float = None):
+        self.size = size or int(os.getenv('ENGINE_POOL_SIZE', 0)) or (os.cpu_count() or 1)
+        self.stockfish_path = stockfish_path
+        self.acquire_timeout = acquire_timeout
+
+        # ✅ הגדרות warmer ומחזור
+        spares = int(os.getenv('ENGINE_POOL_SPARES', 2)) if spares is None else spares
+        self.spares = max(0, min(spares, self.size))
+        self.max_searches = max_searches or int(os.getenv('ENGINE_MAX_SEARCHES', 500))
+        self.max_rss_growth_mb = max_rss_growth_mb or float(os.getenv('ENGINE_MAX_RSS_GROWTH_MB', 64))
+
+        self._idle = deque()
+        self._in_use = set()
+        self._spawned = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._searches: Dict[ChessEngine, int] = {}
+        self._base_rss: Dict[ChessEngine, int] = {}
+        self._warmer = None
+        self._waiters = []  # heap של (עדיפות, מספר סידורי)
+        self._tickets = itertools.count()
+        self._preemptible: Dict[ChessEngine, tuple] = {}  # worker -> (עדיפות, stop_event)
+
+        # ✅ thread אחד לכל מנוע - חיפושים רצים מחוץ ל-event loop
+        self.executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="engine-pool")
+        # ניתוחים ועבודות רקע ב-executor נפרד - לא תופסים threads של מהלכים חיים
+        self.batch_executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="engine-batch")
+
+        # ✅ תקציב CPU ל-pondering - חלק מהמאגר, ב-executor נפרד כדי לא לתפוס threads של חיפושים חיים
+        ponder_share = float(os.getenv('ENGINE_PONDER_SHARE', 0.5)) if ponder_share is None else ponder_share
+        self.ponder_budget = int(self.size * ponder_share)
+        self._ponderers: Dict[ChessEngine, threading.Event] = {}
+        self.ponder_executor = ThreadPoolExecutor(max_workers=max(1, self.ponder_budget),
+                                                  thread_name_prefix="engine-ponder")
+
+        # מדדים
+        self.checkouts = 0
+        self.respawns = 0
+        self.recycles = 0
+        self.warmed = 0
+        self.reconfigures = 0
+        self.reconfigures_avoided = 0
+        self.timeouts = 0
+        self.ponders_started = 0
+        self.ponders_skipped = 0
+        self.ponder_preemptions = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.class_stats = {
+            name: {'checkouts': 0, 'total_wait_time': 0.0, 'max_wait_time': 0.0, 'preempted': 0}
+            for name in PRIORITIES
+        }
+
+    def _spawn(self, skill_level: int = 3) -> ChessEngine:
+        """יצירת תהליך Stockfish חדש למאגר - מוגדר ואחרי isready"""
+        worker = ChessEngine(stockfish_path=self.stockfish_path, skill_level=skill_level)
+        worker.start_engine()
+        if skill_level > FAST_SKILL_CAP:
+            # start_engine מגביל את הרמה - התג חייב להתאים לרמה שנשלחה בפועל
+            worker._configure_skill()
+        worker.engine.ping()
+
+        with self._cond:
+            self._searches[worker] = 0
+            self._base_rss[worker] = _engine_rss(worker)
+        return worker
+
+    def _needs_recycle(self, worker: ChessEngine) -> bool:
+        """האם המנוע עבר את מכסת החיפושים או גדל מדי בזיכרון"""
+        if self._searches.get(worker, 0) >= self.max_searches:
+            return True
+
+        base_rss = self._base_rss.get(worker)
+        current_rss = _engine_rss(worker)
+        if base_rss and current_rss:
+            return (current_rss - base_rss) / (1024 * 1024) >= self.max_rss_growth_mb
+        return False
+
+    def _forget(self, worker: ChessEngine):
+        self._searches.pop(worker, None)
+        self._base_rss.pop(worker, None)
+
+    def start_warmer(self):
+        """הפעלת thread ברקע שמחזיק מנועים מוכנים"""
+        if self._warmer or self.spares == 0:
+            return
+
+        self._warmer = threading.Thread(target=self._warm_loop, name="engine-warmer", daemon=True)
+        self._warmer.start()
+        print(f"🔥 Engine warmer started - keeping {self.spares} spare engines")
+
+    def _warm_loop(self):
+        while True:
+            with self._cond:
+                while not self._closed and (len(self._idle) >= self.spares or self._spawned >= self.size):
+                    self._cond.wait()
+                if self._closed:
+                    return
+                self._spawned += 1
+
+            try:
+                worker = self._spawn()
+            except Exception as e:
+                print(f"❌ Engine warmer failed to spawn: {e}")
+                with self._cond:
+                    self._spawned -= 1
+                    # לא להיכנס ללולאה חמה כש-Stockfish לא עולה
+                    self._cond.wait(5.0)
+                continue
+
+            with self._cond:
+                if self._closed:
+                    self._spawned -= 1
+                    self._forget(worker)
+                else:
+                    self._idle.append(worker)
+                    self.warmed += 1
+                    self._cond.notify_all()
+                    worker = None
+
+            if worker:
+                worker.stop_engine()
+
+    def _take_idle(self, skill_level: int = None) -> ChessEngine:
+        """בחירת מנוע פנוי - עדיפות למנוע שכבר מוגדר לרמה המבוקשת"""
+        if skill_level is None:
+            return self._idle.popleft()
+
+        for worker in self._idle:
+            if worker.skill_level == skill_level:
+                # FIFO היה לוקח את הראשון ומגדיר אותו מחדש
+                if self._idle[0] is not worker:
+                    self.reconfigures_avoided += 1
+                self._idle.remove(worker)
+                return worker
+
+        # ✅ אין התאמה - לוקחים מהרמה שיש לה הכי הרבה מנועים פנויים
+        counts = {}
+        for worker in self._idle:
+            counts[worker.skill_level] = counts.get(worker.skill_level, 0) + 1
+        surplus_level = max(counts, key=counts.get)
+        for worker in self._idle:
+            if worker.skill_level == surplus_level:
+                self._idle.remove(worker)
+                return worker
+
+    def _available(self) -> bool:
+        return bool(self._idle) or self._spawned < self.size
+
+    def acquire(self, timeout: float = None, skill_level: int = None, priority: str = 'live') -> ChessEngine:
+        """השאלת מנוע מהמאגר - ממתינים בתור לפי עדיפות אם כולם תפוסים"""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        rank = _PRIORITY_RANK[priority]
+        start_time = time.monotonic()
+        spawn_needed = False
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Engine pool is closed")
+
+            ticket = (rank, next(self._tickets))
+            heapq.heappush(self._waiters, ticket)
+            try:
+                # ✅ רק ראש התור (העדיפות הגבוהה, ואז FIFO) לוקח מנוע שהתפנה
+                while self._waiters[0] != ticket or not self._available():
+                    remaining = timeout - (time.monotonic() - start_time)
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise EnginePoolTimeout(f"No engine available within {timeout}s")
+                    if not self._available():
+                        self._preempt(rank)
+                    self._cond.wait(remaining)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+            if self._idle:
+                worker = self._take_idle(skill_level)
+                self._cond.notify_all()  # ה-warmer ימלא את החסר
+            else:
+                # שומרים מקום לפני ה-popen כדי לא לחרוג מהגודל
+                self._spawned += 1
+                spawn_needed = True
+                worker = None
+
+        if spawn_needed:
+            try:
+                worker = self._spawn(skill_level or 3)
+            except Exception:
+                with self._cond:
+                    self._spawned -= 1
+                    self._cond.notify_all()
+                raise
+
+        wait_time = time.monotonic() - start_time
+        with self._cond:
+            self._in_use.add(worker)
+            self.checkouts += 1
+            self.total_wait_time += wait_time
+            self.max_wait_time = max(self.max_wait_time, wait_time)
+            stats = self.class_stats[priority]
+            stats['checkouts'] += 1
+            stats['total_wait_time'] += wait_time
+            stats['max_wait_time'] = max(stats['max_wait_time'], wait_time)
+        engine_queue_wait_seconds.observe(wait_time, priority)
+        record('engine_queue', wait_time, priority=priority, spawned=spawn_needed)
+
+        return worker
+
+    def release(self, worker: ChessEngine, healthy: bool = True):
+        """החזרת מנוע למאגר - מנוע פגום או שחוק נעצר ומוחלף"""
+        recycle = healthy and self._needs_recycle(worker)
+
+        with self._cond:
+            self._in_use.discard(worker)
+
+            if healthy and not recycle and not self._closed:
+                self._idle.append(worker)
+                self._cond.notify_all()
+                return
+
+            self._spawned -= 1
+            self._forget(worker)
+            if not self._closed:
+                if recycle:
+                    self.recycles += 1
+                else:
+                    self.respawns += 1
+            self._cond.notify_all()
+
+        # מנוע פגום לא עונה ל-quit - הורגים את התהליך
+        worker.stop_engine(force=not healthy)
+
+    def _prepare(self, worker: ChessEngine, skill_level: int = None):
+        """ספירת החיפוש והגדרת רמת הקושי רק אם צריך"""
+        with self._cond:
+            self._searches[worker] = self._searches.get(worker, 0) + 1
+
+        if skill_level is not None and worker.skill_level != skill_level:
+            worker.skill_level = skill_level
+            worker._configure_skill()
+            with self._cond:
+                self.reconfigures += 1
+
+    @contextmanager
+    def checkout(self, timeout: float = None, skill_level: int = None, priority: str = 'live',
+                 stop_event: threading.Event = None):
+        """
+        השאלת מנוע לחיפוש יחיד, מוגדר לרמת הקושי המבוקשת
+        עם stop_event החיפוש ניתן לעצירה - ה-event נקבע כשבקשה בעדיפות גבוהה יותר ממתינה
+        """
+        worker = self.acquire(timeout, skill_level, priority)
+        if stop_event is not None:
+            with self._cond:
+                self._preemptible[worker] = (_PRIORITY_RANK[priority], priority, stop_event)
+
+        healthy = True
+        try:
+            self._prepare(worker, skill_level)
+            yield worker
+        except Exception as e:
+            # מנוע שלא סיים בזמן לא חוזר למאגר - גם אם הוא עדיין עונה ל-ping
+            healthy = not isinstance(e, ENGINE_TIMEOUTS) and worker.engine is not None and _engine_alive(worker)
+            raise
+        finally:
+            if stop_event is not None:
+                with self._cond:
+                    self._preemptible.pop(worker, None)
+            self.release(worker, healthy=healthy)
+
+    def _preempt(self, rank: int):
+        """
+        בקשה ממתינה - עוצרים חיפוש אחד בעדיפות נמוכה יותר כדי לפנות מנוע
+        קודם ponder, אחר כך החיפוש בעדיפות הנמוכה ביותר
+        """
+        for stop_event in self._ponderers.values():
+            if stop_event.is_set():
+                return  # כבר מתפנה מנוע
+        for stop_event in self._ponderers.values():
+            stop_event.set()
+            self.ponder_preemptions += 1
+            return
+
+        candidates = [entry for entry in self._preemptible.values() if entry[0] > rank]
+        if any(stop_event.is_set() for _, _, stop_event in candidates):
+            return
+        if candidates:
+            _, priority, stop_event = max(candidates, key=lambda entry: entry[0])
+            stop_event.set()
+            self.class_stats[priority]['preempted'] += 1
+
+    @contextmanager
+    def ponder_checkout(self, stop_event: threading.Event, skill_level: int = None):
+        """
+        מנוע ל-pondering - רק אם יש מנוע פנוי עכשיו, אף אחד לא ממתין והתקציב לא מוצה
+        מחזיר None כשהמאגר עמוס
+        """
+        with self._cond:
+            saturated = (
+                self._closed or not self._idle or self._waiters
+                or len(self._ponderers) >= self.ponder_budget
+            )
+            if saturated:
+                self.ponders_skipped += 1
+                worker = None
+            else:
+                worker = self._take_idle(skill_level)
+                self._in_use.add(worker)
+                self._ponderers[worker] = stop_event
+                self.ponders_started += 1
+                self._cond.notify_all()
+
+        if worker is None:
+            yield None
+            return
+
+        healthy = True
+        try:
+            self._prepare(worker, skill_level)
+            yield worker
+        except Exception as e:
+            # מנוע שלא סיים בזמן לא חוזר למאגר - גם אם הוא עדיין עונה ל-ping
+            healthy = not isinstance(e, ENGINE_TIMEOUTS) and worker.engine is not None and _engine_alive(worker)
+            raise
+        finally:
+            with self._cond:
+                self._ponderers.pop(worker, None)
+            self.release(worker, healthy=healthy)
+
+    def shutdown(self):
+        """עצירת כל המנועים במאגר"""
+        with self._cond:
+            self._closed = True
+            for stop_event in self._ponderers.values():
+                stop_event.set()
+            for _, _, stop_event in self._preemptible.values():
+                stop_event.set()
+            workers = list(self._idle)
+            self._idle.clear()
+            self._spawned -= len(workers)
+            for worker in workers:
+                self._forget(worker)
+            self._cond.notify_all()
+
+        for worker in workers:
+            worker.stop_engine()
+
+        self.executor.shutdown(wait=False)
+        self.ponder_executor.shutdown(wait=False)
+        self.batch_executor.shutdown(wait=False)
+        print(f"🔴 Engine pool stopped ({len(workers)} engines)")
+
+    def load(self) -> float:
+        """עומס חי: מנועים תפוסים (בלי ponder וחיפושים שניתן לעצור) ובקשות ממתינות ביחס לגודל המאגר"""
+        with self._cond:
+            busy = len(self._in_use) - len(self._ponderers) - len(self._preemptible)
+            return (busy + len(self._waiters)) / self.size
+
+    def process_counts(self) -> Dict[tuple, int]:
+        """תהליכי המנוע לפי מצב - ל-gauge של /metrics"""
+        with self._cond:
+            pondering = len(self._ponderers)
+            return {
+                ('idle',): len(self._idle),
+                ('in_use',): len(self._in_use) - pondering,
+                ('pondering',): pondering,
+                ('spawned',): self._spawned
+            }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """מדדי המאגר"""
+        with self._cond:
+            in_use = len(self._in_use)
+            idle_by_level = {}
+            for worker in self._idle:
+                idle_by_level[worker.skill_level] = idle_by_level.get(worker.skill_level, 0) + 1
+
+            return {
+                'size': self.size,
+                'spawned': self._spawned,
+                'idle': len(self._idle),
+                'in_use': in_use,
+                'waiting': len(self._waiters),
+                'occupancy': in_use / self.size if self.size else 0.0,
+                'checkouts': self.checkouts,
+                'avg_wait_time': self.total_wait_time / self.checkouts if self.checkouts else 0.0,
+                'max_wait_time': self.max_wait_time,
+                'timeouts': self.timeouts,
+                'respawns': self.respawns,
+                'spares': len(self._idle),
+                'target_spares': self.spares,
+                'warmed': self.warmed,
+                'recycles': self.recycles,
+                'idle_by_level': idle_by_level,
+                'reconfigures': self.reconfigures,
+                'reconfigures_avoided': self.reconfigures_avoided,
+                'pondering': len(self._ponderers),
+                'ponder_budget': self.ponder_budget,
+                'ponders_started': self.ponders_started,
+                'ponders_skipped': self.ponders_skipped,
+                'ponder_preemptions': self.ponder_preemptions,
+                'classes': {
+                    name: {
+                        'checkouts': stats['checkouts'],
+                        'avg_wait_time': stats['total_wait_time'] / stats['checkouts'] if stats['checkouts'] else 0.0,
+                        'max_wait_time': stats['max_wait_time'],
+                        'preempted': stats['preempted']
+                    }
+                    for name, stats in self.class_stats.items()
+                }
+            }
+
+
+def _engine_alive(worker: ChessEngine) -> bool:
+    """בדיקה שתהליך המנוע עדיין מגיב"""
+    try:
+        worker.engine.ping()
+        return True
+    except Exception:
+        return False
+
+
+def _engine_rss(worker: ChessEngine) -> int:
+    """זיכרון RSS של תהליך המנוע בבתים (Linux בלבד, אחרת 0)"""
+    try:
+        pid = worker.engine.protocol.transport.get_pid()
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except Exception:
+        pass
+    return 0
+
+
+# Instance גלובלי - התהליכים נוצרים רק בהשאלה הראשונה
+engine_pool = EnginePool()
+
+metrics.gauge('chess_engine_processes', 'Pooled engine processes by state',
+              engine_pool.process_counts, ('state',))
+metrics.gauge('chess_engine_queue_waiting', 'Requests waiting for a pooled engine',
+              lambda: len(engine_pool._waiters))
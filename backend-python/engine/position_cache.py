@@ -0,0 +1,106 @@
+# backend-python/engine/position_cache.py - מידע נגזר לכל עמדה
+"""
+Per-position Derived State Cache
+רשימת המהלכים החוקיים, מפת SAN, שח / מט / פט ומחרוזת התוצאה - מחושבים פעם אחת לכל עמדה
+(מפתח Zobrist) ומשותפים לכל בוני התגובות ולכל המשחקים שמגיעים לאותה עמדה
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import chess
+import chess.polyglot
+
+
+class PositionInfo:
+    """מידע שתלוי רק בעמדה עצמה - חוקי תיקו שתלויים בהיסטוריה נבדקים מול הלוח"""
+
+    __slots__ = ('legal_moves', 'is_check', 'is_checkmate', 'is_stalemate',
+                 'is_insufficient_material', 'terminal_result', '_san')
+
+    def __init__(self, board: chess.Board):
+        self.legal_moves: Tuple[str, ...] = tuple(move.uci() for move in board.legal_moves)
+        self.is_check = board.is_check()
+        self.is_checkmate = self.is_check and not self.legal_moves
+        self.is_stalemate = not self.is_check and not self.legal_moves
+        self.is_insufficient_material = board.is_insufficient_material()
+        self._san: Dict[str, str] = {}
+
+        if self.is_checkmate:
+            winner = "black" if board.turn == chess.WHITE else "white"
+            self.terminal_result = f"{winner} wins by checkmate"
+        elif self.is_stalemate:
+            self.terminal_result = "draw by stalemate"
+        elif self.is_insufficient_material:
+            self.terminal_result = "draw by insufficient material"
+        else:
+            self.terminal_result = None
+
+    def san(self, board: chess.Board, move: chess.Move) -> str:
+        """SAN של מהלך מהעמדה הזו - מחושב פעם אחת לכל מהלך"""
+        uci = move.uci()
+        san = self._san.get(uci)
+        if san is None:
+            san = board.san(move)
+            self._san[uci] = san
+        return san
+
+    @staticmethod
+    def _history_result(board: chess.Board) -> Optional[str]:
+        # חמש חזרות דורשות לפחות 16 חצאי-מהלכים הפיכים - אחרת אין צורך לסרוק את ההיסטוריה
+        if board.halfmove_clock >= 16 and board.is_fivefold_repetition():
+            return "draw by repetition"
+        if board.halfmove_clock >= 150:
+            return "draw by 75-move rule"
+        return None
+
+    def result(self, board: chess.Board) -> str:
+        """כמו ChessEngine.get_game_result"""
+        return self.terminal_result or self._history_result(board) or "game in progress"
+
+    def is_game_over(self, board: chess.Board) -> bool:
+        return self.terminal_result is not None or self._history_result(board) is not None
+
+
+class PositionCache:
+    """LRU של PositionInfo לפי Zobrist hash"""
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or int(os.getenv('POSITION_CACHE_SIZE', 50000))
+        self._entries: "OrderedDict[int, PositionInfo]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, board: chess.Board) -> PositionInfo:
+        key = chess.polyglot.zobrist_hash(board)
+        with self._lock:
+            info = self._entries.get(key)
+            if info is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return info
+            self.misses += 1
+
+        info = PositionInfo(board)
+        with self._lock:
+            self._entries[key] = info
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return info
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+# Instance גלובלי - עמדות משותפות לכל המשחקים
+position_cache = PositionCache()
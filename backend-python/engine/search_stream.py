@@ -0,0 +1,95 @@
+# backend-python/engine/search_stream.py - הזרמת info של חיפוש ללקוח
+"""
+Throttled Search Info Stream
+עדכוני info מהמנוע (עומק, ציון, nodes, PV) מגיעים מה-thread של החיפוש בקצב של המנוע.
+הזרם שומר רק את העדכון האחרון ושולח לכל היותר rate הודעות בשנייה - בלי להציף את ה-socket
+"""
+
+import asyncio
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import chess
+import chess.engine
+
+DEFAULT_RATE = float(os.getenv('SEARCH_INFO_RATE', 4.0))  # הודעות בשנייה
+MAX_RATE = 20.0
+MAX_PV_MOVES = 8
+
+
+def format_info(info: chess.engine.InfoDict) -> Dict[str, Any]:
+    """info של python-chess ל-JSON - הציון תמיד מנקודת המבט של לבן"""
+    data: Dict[str, Any] = {}
+    for key in ('depth', 'seldepth', 'nodes', 'nps', 'time'):
+        if key in info:
+            data[key] = info[key]
+
+    score = info.get('score')
+    if score is not None:
+        white = score.white()
+        if white.is_mate():
+            data['mate'] = white.mate()
+        else:
+            data['cp'] = white.score()
+
+    pv = info.get('pv')
+    if pv:
+        data['pv'] = [move.uci() for move in pv[:MAX_PV_MOVES]]
+    return data
+
+
+class SearchInfoStream:
+    """מאחד עדכוני info מה-thread של החיפוש ושולח אותם ב-event loop בקצב מוגבל"""
+
+    def __init__(self, send: Callable[[Dict[str, Any]], Awaitable[Any]], rate: float = None):
+        self.send = send
+        rate = rate or DEFAULT_RATE
+        self.interval = 1.0 / max(0.1, min(MAX_RATE, rate))
+        self._loop = asyncio.get_running_loop()
+        self._pending = asyncio.Event()
+        self._lock = threading.Lock()
+        self._latest: Dict[str, Any] = {}
+        self._final: Optional[Dict[str, Any]] = None
+
+        self.received = 0
+        self.sent = 0
+
+    def push(self, info: chess.engine.InfoDict):
+        """נקרא מה-thread של החיפוש - מחליף את העדכון הממתין במקום לצבור תור"""
+        data = format_info(info)
+        if not data:
+            return
+        with self._lock:
+            # cp ו-mate לא מופיעים יחד - ציון חדש מחליף את הסוג הקודם
+            if 'mate' in data:
+                self._latest.pop('cp', None)
+            elif 'cp' in data:
+                self._latest.pop('mate', None)
+            self._latest.update(data)
+            self.received += 1
+        self._loop.call_soon_threadsafe(self._pending.set)
+
+    def close(self, **final):
+        """סוף החיפוש (נקרא מה-event loop) - המצב האחרון נשלח עם final ואז ה-sender מסתיים"""
+        self._final = final
+        self._pending.set()
+
+    async def run(self):
+        """לולאת השליחה - רצה כ-task עד close()"""
+        while True:
+            await self._pending.wait()
+            self._pending.clear()
+
+            with self._lock:
+                data = dict(self._latest)
+
+            if self._final is not None:
+                await self.send({**data, **self._final, 'final': True})
+                self.sent += 1
+                return
+
+            await self.send({**data, 'final': False})
+            self.sent += 1
+            # ✅ מאחדים כל מה שמגיע בזמן ההמתנה להודעה אחת
+            await asyncio.sleep(self.interval)
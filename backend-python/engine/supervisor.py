@@ -0,0 +1,118 @@
+# backend-python/engine/supervisor.py - זיהוי קריסות מנוע והפעלה מחדש
+"""
+Engine Supervisor
+עוטף כל חיפוש: תהליך Stockfish שמת (EOF) או נתקע (timeout) מופעל מחדש,
+המיקום נשלח שוב מרשימת המהלכים של המשחק והחיפוש מנוסה שוב - באותה בקשה
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
+from typing import Callable, Dict, Any, Iterator, Optional, TypeVar
+
+import chess.engine
+
+from utils.log import log
+
+T = TypeVar('T')
+
+# EOF / תהליך שמת / פקודה שלא נענתה בזמן
+ENGINE_FAILURES = (chess.engine.EngineError, TimeoutError, concurrent.futures.TimeoutError, BrokenPipeError)
+ENGINE_TIMEOUTS = (TimeoutError, concurrent.futures.TimeoutError)
+
+ENGINE_TIMEOUT = float(os.getenv('ENGINE_TIMEOUT', 10.0))  # שניות לפקודה שלא נענתה
+
+
+def analysis_deadline(limit: chess.engine.Limit) -> float:
+    """מועד אחרון (monotonic) לניתוח - זמן החיפוש ועוד ENGINE_TIMEOUT"""
+    return time.monotonic() + ENGINE_TIMEOUT + (limit.time or 0.0)
+
+
+def _until(analysis: chess.engine.SimpleAnalysisResult, coro, deadline: float):
+    future = asyncio.run_coroutine_threadsafe(coro, analysis.simple_engine.protocol.loop)
+    try:
+        return future.result(max(0.0, deadline - time.monotonic()))
+    except concurrent.futures.TimeoutError:
+        # לא מבטלים - המנוע התקוע נסגר (restart / שחרור כלא תקין) וזה מסיים את ההמתנה
+        raise TimeoutError("engine did not finish the analysis in time") from None
+
+
+def wait_analysis(analysis: chess.engine.SimpleAnalysisResult, deadline: float) -> chess.engine.BestMove:
+    """analysis.wait() עם מועד אחרון - מנוע תקוע זורק TimeoutError ל-supervisor"""
+    return _until(analysis, analysis.inner.wait(), deadline)
+
+
+def iterate_analysis(analysis: chess.engine.SimpleAnalysisResult, deadline: float) -> Iterator[chess.engine.InfoDict]:
+    """for info in analysis עם מועד אחרון"""
+    while True:
+        try:
+            yield _until(analysis, analysis.inner.__anext__(), deadline)
+        except StopAsyncIteration:
+            return
+
+
+class EngineSupervisor:
+    """ניסיונות חוזרים על חיפושים שנכשלו בגלל המנוע, עם מדדי התאוששות"""
+
+    def __init__(self, max_retries: int = None):
+        self.max_retries = int(os.getenv('ENGINE_MAX_RETRIES', 2)) if max_retries is None else max_retries
+        self._lock = threading.Lock()
+
+        self.crashes = 0
+        self.restarts = 0
+        self.recoveries = 0
+        self.failures = 0  # בקשות שנכשלו גם אחרי כל הניסיונות
+        self.total_recovery_time = 0.0
+        self.max_recovery_time = 0.0
+
+    def run(self, search: Callable[[], T], restart: Optional[Callable[[], None]] = None) -> T:
+        """הרצת החיפוש - קריסה מפעילה restart ואז ניסיון נוסף"""
+        crash_time = None
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = search()
+            except ENGINE_FAILURES as e:
+                with self._lock:
+                    self.crashes += 1
+                if crash_time is None:
+                    crash_time = time.monotonic()
+
+                if attempt == self.max_retries:
+                    with self._lock:
+                        self.failures += 1
+                    log.error("❌ Engine failed, giving up", attempts=attempt + 1, error=repr(e))
+                    raise
+
+                log.warning("💥 Engine crashed - restarting", attempt=attempt + 2, error=repr(e))
+                if restart:
+                    restart()
+                with self._lock:
+                    self.restarts += 1
+                continue
+
+            if crash_time is not None:
+                recovery_time = time.monotonic() - crash_time
+                with self._lock:
+                    self.recoveries += 1
+                    self.total_recovery_time += recovery_time
+                    self.max_recovery_time = max(self.max_recovery_time, recovery_time)
+                log.info("✅ Engine recovered", recovery_time=round(recovery_time, 3))
+            return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'crashes': self.crashes,
+                'restarts': self.restarts,
+                'recoveries': self.recoveries,
+                'failures': self.failures,
+                'avg_recovery_time': self.total_recovery_time / self.recoveries if self.recoveries else 0.0,
+                'max_recovery_time': self.max_recovery_time
+            }
+
+
+# Instance גלובלי - מדדים משותפים לכל המשחקים
+engine_supervisor = EngineSupervisor()
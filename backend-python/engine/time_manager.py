@@ -0,0 +1,121 @@
+# backend-python/engine/time_manager.py - ניהול זמן חשיבה לפי מיקום ועומס
+"""
+Adaptive Time Manager
+זמן החשיבה לכל מהלך נקבע מרמת הקושי, מורכבות המיקום, תנודתיות ההערכה ועומס מאגר המנועים
+תחת עומס הזמנים מתכווצים כדי לשמור על זמני התגובה, כשהשרת פנוי הם גדלים
+"""
+
+import os
+import threading
+from collections import deque
+from typing import Dict, Any, Iterable
+
+import chess
+
+# ✅ זמן בסיס לפי רמת הקושי (שניות)
+BASE_TIME_BY_LEVEL = {
+    1: 0.1,   # מיידי
+    2: 0.15,  # מהיר מאוד
+    3: 0.2,   # מהיר
+    4: 0.3,   # נורמלי
+    5: 0.4,   # קצת איטי
+    6: 0.5,   # בינוני
+    7: 0.6,   # חכם
+    8: 0.8,   # מומחה
+}
+
+TYPICAL_LEGAL_MOVES = 30  # מספר מהלכים חוקיים ממוצע באמצע משחק
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    return max(low, min(high, value))
+
+
+class TimeManager:
+    """חישוב תקציב זמן לכל מהלך AI ופרסום התקציבים שנבחרו"""
+
+    def __init__(self, min_time: float = None, max_scale: float = None,
+                 idle_boost: float = None, min_load_factor: float = None):
+        self.min_time = min_time or float(os.getenv('TIME_MIN_THINK', 0.05))
+        self.max_scale = max_scale or float(os.getenv('TIME_MAX_SCALE', 2.0))  # עד פי כמה מזמן הבסיס
+        self.idle_boost = idle_boost or float(os.getenv('TIME_IDLE_BOOST', 1.25))
+        self.min_load_factor = min_load_factor or float(os.getenv('TIME_MIN_LOAD_FACTOR', 0.4))
+
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=100)
+        self.moves = 0
+        self.total_budget = 0.0
+        self.shrunk = 0
+        self.grown = 0
+
+    @staticmethod
+    def base_time(skill_level: int, fast_mode: bool = True, base_time: float = None) -> float:
+        """זמן הבסיס - זמן מפורש מהקורא או לפי הרמה"""
+        if base_time:
+            return base_time
+        if not fast_mode:
+            return 1.0
+        return BASE_TIME_BY_LEVEL.get(skill_level, 0.3)
+
+    @staticmethod
+    def complexity_factor(board: chess.Board, legal_count: int = None) -> float:
+        """מיקום עם הרבה אפשרויות מקבל יותר זמן, מהלך כמעט כפוי - פחות"""
+        legal_moves = board.legal_moves.count() if legal_count is None else legal_count
+        if legal_moves <= 1:
+            return 0.0
+        return _clamp((legal_moves / TYPICAL_LEGAL_MOVES) ** 0.5, 0.6, 1.4)
+
+    @staticmethod
+    def volatility_factor(scores: Iterable[int]) -> float:
+        """הערכה שקופצת בין מהלכים = מיקום חד, שווה עוד זמן"""
+        scores = list(scores)
+        if len(scores) < 2:
+            return 1.0
+        swings = [abs(b - a) for a, b in zip(scores, scores[1:])]
+        return 1.0 + _clamp(sum(swings) / len(swings) / 200.0, 0.0, 0.5)
+
+    def load_factor(self, pool=None) -> float:
+        """מאגר פנוי מגדיל את התקציב, מאגר עמוס / תור ממתין מקטין אותו"""
+        if pool is None:
+            return 1.0
+        return _clamp(1.5 - pool.load(), self.min_load_factor, self.idle_boost)
+
+    def budget(self, board: chess.Board, skill_level: int, base_time: float = None,
+               scores: Iterable[int] = (), pool=None, fast_mode: bool = True,
+               legal_count: int = None) -> float:
+        """תקציב הזמן למהלך הבא בשניות"""
+        base = self.base_time(skill_level, fast_mode, base_time)
+        budget = (
+            base
+            * self.complexity_factor(board, legal_count)
+            * self.volatility_factor(scores)
+            * self.load_factor(pool)
+        )
+        return round(_clamp(budget, self.min_time, base * self.max_scale), 3)
+
+    def record(self, budget: float, base: float):
+        """פרסום התקציב שנבחר בפועל למהלך"""
+        with self._lock:
+            self._recent.append(budget)
+            self.moves += 1
+            self.total_budget += budget
+            if budget < base * 0.95:
+                self.shrunk += 1
+            elif budget > base * 1.05:
+                self.grown += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            recent = list(self._recent)
+            return {
+                'moves': self.moves,
+                'avg_budget': self.total_budget / self.moves if self.moves else 0.0,
+                'recent_avg_budget': sum(recent) / len(recent) if recent else 0.0,
+                'last_budget': recent[-1] if recent else None,
+                'shrunk': self.shrunk,
+                'grown': self.grown
+            }
+
+
+# Instance גלובלי משותף לכל המשחקים
+time_manager = TimeManager()
@@ -0,0 +1,120 @@
+# backend-python/engine/transposition_cache.py - מטמון תוצאות מנוע בין משחקים
+"""
+Cross-game Transposition Cache
+מטמון LRU משותף לתוצאות חיפוש - מפתח: Zobrist hash, סוג ה-limit ורמת הקושי
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+import chess
+import chess.engine
+import chess.polyglot
+
+
+class CachedSearch:
+    """תוצאת חיפוש שמורה"""
+    __slots__ = ('move', 'score', 'depth', 'effort')
+
+    def __init__(self, move: Optional[chess.Move], score: Optional[chess.engine.PovScore],
+                 depth: int, effort: float):
+        self.move = move
+        self.score = score
+        self.depth = depth
+        self.effort = effort  # שניות / nodes / עומק - לפי סוג ה-limit
+
+
+# הערכת זיכרון לרשומה: מפתח, רשומה, מהלך, ציון וה-node של ה-OrderedDict
+_ENTRY_SIZE = (
+    sys.getsizeof((0, 'time', 0)) + sys.getsizeof(2 ** 63) +
+    sys.getsizeof(CachedSearch(None, None, 0, 0.0)) +
+    sys.getsizeof(chess.Move.from_uci('e2e4')) + 200
+)
+
+
+def _limit_key(limit: chess.engine.Limit):
+    """סוג ה-limit וכמות העבודה שהוא מבקש"""
+    if limit.depth is not None:
+        return 'depth', limit.depth
+    if limit.nodes is not None:
+        return 'nodes', limit.nodes
+    return 'time', limit.time or 0.0
+
+
+class TranspositionCache:
+    """מטמון LRU עם תקציב זיכרון ומוני hit/miss"""
+
+    def __init__(self, max_memory_mb: float = None):
+        max_memory_mb = max_memory_mb or float(os.getenv('TT_CACHE_MB', 32))
+        self.max_entries = max(1, int(max_memory_mb * 1024 * 1024 // _ENTRY_SIZE))
+        self._entries: "OrderedDict[tuple, CachedSearch]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, board: chess.Board, limit: chess.engine.Limit, skill_level: int) -> Optional[CachedSearch]:
+        """תוצאה שמורה לעומק / זמן שווה או גדול יותר מהמבוקש"""
+        kind, amount = _limit_key(limit)
+        key = (chess.polyglot.zobrist_hash(board), kind, skill_level)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._covers(entry, kind, amount):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+
+    @staticmethod
+    def _covers(entry: CachedSearch, kind: str, amount) -> bool:
+        if kind == 'depth':
+            return entry.depth >= amount
+        return entry.effort >= amount
+
+    def put(self, board: chess.Board, limit: chess.engine.Limit, skill_level: int,
+            move: Optional[chess.Move], score: Optional[chess.engine.PovScore], depth: Optional[int]):
+        """שמירת תוצאה - רשומה עמוקה יותר לא נדרסת ע"י רדודה"""
+        kind, amount = _limit_key(limit)
+        key = (chess.polyglot.zobrist_hash(board), kind, skill_level)
+        entry = CachedSearch(move, score, depth or 0, amount)
+        if kind == 'depth':
+            entry.depth = max(entry.depth, amount)
+
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None and existing.depth > entry.depth:
+                self._entries.move_to_end(key)
+                return
+
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'memory_bytes': len(self._entries) * _ENTRY_SIZE,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions
+            }
+
+
+# Instance גלובלי משותף ל-ChessEngine ול-StockfishAnalyzer
+transposition_cache = TranspositionCache()
@@ -11,7 +11,14 @@ load_dotenv()
 
 from fastapi import FastAPI, HTTPException, Depends, WebSocket, WebSocketDisconnect, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import PlainTextResponse
+from utils.fast_json import FastJSONResponse
+from utils.metrics import metrics, MetricsMiddleware, websocket_message_seconds, CONTENT_TYPE
+from utils.tracing import TracingMiddleware, span, KIND_SERVER
+from utils.profiler import profiler, ProfilerBusyError, PROFILER_INTERVAL
+from utils.loop_monitor import loop_monitor
+from utils.log import log
+import database.mongo_metrics  # noqa: F401 - זמני פקודות MongoDB, נרשם לפני ה-connect
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
 import uuid
@@ -21,6 +28,7 @@ import asyncio
 from auth_service import (
     AuthService, 
     get_current_user, 
+    get_admin_user,
     websocket_manager, 
     authenticate_websocket,
     db
@@ -36,10 +44,18 @@ except ImportError as e:
     game_router = APIRouter()
     websocket_router = APIRouter()
 
+# ✅ מאגר המנועים המשותף לכל ה-routers - None כש-Stockfish לא זמין (ה-routers עוברים ל-stub)
+try:
+    from engine.pool import engine_pool
+except (ImportError, FileNotFoundError) as e:
+    print(f"⚠️ Engine pool unavailable: {e}")
+    engine_pool = None
+
 app = FastAPI(
     title="ChessMentor API",
     description="מערכת התחברות מקיפה עם תמיכה ב-WebSocket, MongoDB ומשחקי שח",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=FastJSONResponse  # ✅ orjson גם לתשובות שמוחזרות כ-dict
 )
 
 # הגדרות CORS
@@ -51,6 +67,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ✅ זמן כל בקשת HTTP לפי route - ל-/metrics
+app.add_middleware(MetricsMiddleware)
+# ✅ span שורש לכל בקשה + כותרת Server-Timing (ייצוא לפי TRACE_EXPORT)
+app.add_middleware(TracingMiddleware)
+
+# ✅ gauges של WebSocketManager - נקראים רק בזמן scrape
+metrics.gauge('ws_connections', 'Open /ws connections', lambda: websocket_manager.get_stats()['total_connections'])
+metrics.gauge('ws_authenticated_connections', 'Authenticated /ws connections',
+              lambda: websocket_manager.get_stats()['authenticated_connections'])
+metrics.gauge('ws_rooms', 'Chat rooms with members', lambda: websocket_manager.get_stats()['rooms'])
+metrics.gauge('ws_users_online', 'Users with at least one /ws connection',
+              lambda: websocket_manager.get_stats()['users_online'])
+metrics.gauge('log_records_dropped', 'Log records dropped because the log queue was full',
+              lambda: log.dropped)
+metrics.gauge('log_records_queued', 'Log records waiting for the writer thread', lambda: log.get_stats()['queued'])
+
+WS_MESSAGE_TYPES = {'chat_message', 'join_room', 'leave_room', 'get_status'}
+
 # Models עבור Pydantic
 class RegisterRequest(BaseModel):
     username: str
@@ -83,6 +117,9 @@ app.include_router(websocket_router, tags=["websocket"])
 async def startup_event():
     """התחברות ל-MongoDB בעת הפעלת השרת"""
     print("🚀 Starting ChessMentor server...")
+    loop_monitor.start()
+    if engine_pool is not None:
+        engine_pool.start_warmer()  # מנועים מוכנים מראש - משחק חדש לא משלם על האתחול
     
     # Debug: הצגת משתני סביבה
     mongo_uri = os.getenv('MONGO_URI')
@@ -111,6 +148,10 @@ async def startup_event():
 async def shutdown_event():
     """סגירת חיבורים בעת כיבוי השרת"""
     print("🛑 Shutting down server...")
+    loop_monitor.stop()
+    if engine_pool is not None:
+        engine_pool.shutdown()
+    log.flush()
     if db.client:
         db.client.close()
         print("📁 MongoDB connection closed")
@@ -126,7 +167,7 @@ async def register(request: RegisterRequest):
             password=request.password,
             email=request.email
         )
-        return JSONResponse({
+        return FastJSONResponse({
             "success": True,
             "message": "User registered successfully",
             **result
@@ -134,7 +175,7 @@ async def register(request: RegisterRequest):
     except HTTPException as e:
         raise e
     except Exception as e:
-        print(f"Registration error: {e}")
+        log.error("Registration error", error=str(e))
         raise HTTPException(status_code=500, detail="Registration failed")
 
 @app.post("/auth/login")
@@ -146,7 +187,7 @@ async def login(request: LoginRequest):
             password=request.password,
             device_info=request.device_info
         )
-        return JSONResponse({
+        return FastJSONResponse({
             "success": True,
             "message": "Login successful",
             **result
@@ -154,7 +195,7 @@ async def login(request: LoginRequest):
     except HTTPException as e:
         raise e
     except Exception as e:
-        print(f"Login error: {e}")
+        log.error("Login error", error=str(e))
         raise HTTPException(status_code=500, detail="Login failed")
 
 @app.post("/auth/openai")
@@ -171,7 +212,7 @@ async def authenticate_openai(request: OpenAIAuthRequest):
         # TODO: בדיקה מול OpenAI API אמיתית
         # כרגע נניח שהמפתח תקין
         
-        return JSONResponse({
+        return FastJSONResponse({
             "success": True,
             "sessionId": session_id,
             "message": "OpenAI API key validated successfully"
@@ -179,7 +220,7 @@ async def authenticate_openai(request: OpenAIAuthRequest):
     except HTTPException as e:
         raise e
     except Exception as e:
-        print(f"OpenAI auth error: {e}")
+        log.error("OpenAI auth error", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to validate OpenAI key")
 
 @app.post("/auth/refresh")
@@ -196,18 +237,18 @@ async def logout(current_user: dict = Depends(get_current_user)):
     """התנתקות משתמש"""
     try:
         # TODO: ביטול session
-        return JSONResponse({
+        return FastJSONResponse({
             "success": True,
             "message": "Logged out successfully"
         })
     except Exception as e:
-        print(f"Logout error: {e}")
+        log.error("Logout error", error=str(e))
         raise HTTPException(status_code=500, detail="Logout failed")
 
 @app.get("/auth/me")
 async def get_me(current_user: dict = Depends(get_current_user)):
     """קבלת פרטי המשתמש הנוכחי"""
-    return JSONResponse({
+    return FastJSONResponse({
         "success": True,
         "user": current_user
     })
@@ -239,13 +280,13 @@ async def update_profile(
         # קבלת המשתמש המעודכן
         updated_user = await db.get_user_by_id(user_id)
         
-        return JSONResponse({
+        return FastJSONResponse({
             "success": True,
             "message": "Profile updated successfully",
             "user": {k: v for k, v in updated_user.items() if k != 'password_hash'}
         })
     except Exception as e:
-        print(f"Profile update error: {e}")
+        log.error("Profile update error", error=str(e))
         raise HTTPException(status_code=500, detail="Profile update failed")
 
 # ============= WebSocket Routes =============
@@ -290,7 +331,11 @@ async def websocket_endpoint(
                 message_data = json.loads(data)
                 
                 # טיפול בהודעה
-                await handle_websocket_message(connection_id, message_data, user_id)
+                msg_type = message_data.get('type')
+                action = msg_type if msg_type in WS_MESSAGE_TYPES else 'unknown'
+                with websocket_message_seconds.time('main', action), \
+                        span(f'ws {action}', KIND_SERVER, connection_id=connection_id):
+                    await handle_websocket_message(connection_id, message_data, user_id)
                 
             except WebSocketDisconnect:
                 break
@@ -300,7 +345,7 @@ async def websocket_endpoint(
                     "data": {"message": "Invalid JSON format"}
                 })
             except Exception as e:
-                print(f"WebSocket error: {e}")
+                log.error("WebSocket error", error=str(e))
                 await websocket_manager.send_to_connection(connection_id, {
                     "type": "error",
                     "data": {"message": str(e)}
@@ -316,7 +361,7 @@ async def handle_websocket_message(connection_id: str, message: dict, user_id: s
     msg_type = message.get('type')
     data = message.get('data', {})
     
-    print(f"📨 Received {msg_type} from {connection_id[:8]}...")
+    log.info("📨 Received", sample=True, type=msg_type, connection_id=connection_id[:8])
     
     # הודעות צ'אט
     if msg_type == 'chat_message':
@@ -398,14 +443,14 @@ async def get_stats(current_user: dict = Depends(get_current_user)):
         db_stats = await db.get_stats()
         ws_stats = websocket_manager.get_stats()
         
-        return JSONResponse({
+        return FastJSONResponse({
             "success": True,
             "database": db_stats,
             "websocket": ws_stats,
             "timestamp": asyncio.get_event_loop().time()
         })
     except Exception as e:
-        print(f"Stats error: {e}")
+        log.error("Stats error", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to get stats")
 
 @app.get("/api/online-users")
@@ -424,9 +469,9 @@ async def get_online_users(current_user: dict = Depends(get_current_user)):
                         'active_connections': len(connection_ids)
                     })
             except Exception as e:
-                print(f"Error getting user {user_id}: {e}")
+                log.error("Error getting user", user_id=user_id, error=str(e))
     
-    return JSONResponse({
+    return FastJSONResponse({
         "success": True,
         "online_users": online_users,
         "total_count": len(online_users)
@@ -440,15 +485,54 @@ async def get_my_games(
     """משחקי המשתמש"""
     try:
         games = await db.get_user_games(current_user['user_id'], limit)
-        return JSONResponse({
+        return FastJSONResponse({
             "success": True,
             "games": games,
             "total_count": len(games)
         })
     except Exception as e:
-        print(f"Error getting user games: {e}")
+        log.error("Error getting user games", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to get games")
 
+@app.get("/metrics")
+async def prometheus_metrics():
+    """מדדים בפורמט Prometheus"""
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
+
+@app.get("/admin/profile")
+async def profile_process(
+    seconds: float = Query(10, gt=0),
+    interval_ms: float = Query(PROFILER_INTERVAL * 1000, gt=0),
+    loop_only: bool = False,
+    format: str = Query('collapsed', pattern='^(collapsed|json)$'),
+    current_user: dict = Depends(get_admin_user)
+):
+    """דגימת stacks של התהליך ל-seconds שניות - collapsed stacks ל-flamegraph.pl / speedscope"""
+    try:
+        sampler = await profiler.profile(seconds, interval_ms / 1000, loop_only)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if format == 'json':
+        return FastJSONResponse({
+            "success": True,
+            "stats": sampler.get_stats(),
+            "stacks": dict(sampler.stacks.most_common())
+        })
+    return PlainTextResponse(sampler.collapsed())
+
+@app.get("/admin/loop-stalls")
+async def get_loop_stalls(
+    limit: int = Query(20, gt=0),
+    current_user: dict = Depends(get_admin_user)
+):
+    """התקיעות האחרונות של לולאת האירועים עם ה-stack שחסם אותה"""
+    return FastJSONResponse({
+        "success": True,
+        "monitor": loop_monitor.get_stats(),
+        "stalls": loop_monitor.recent_stalls(limit)
+    })
+
 @app.get("/health")
 async def health_check():
     """בדיקת בריאות המערכת"""
@@ -456,7 +540,7 @@ async def health_check():
         db_stats = await db.get_stats()
         ws_stats = websocket_manager.get_stats()
         
-        return JSONResponse({
+        return FastJSONResponse({
             "status": "healthy",
             "mongodb_connected": db.client is not None,
             "database": db_stats,
@@ -464,7 +548,7 @@ async def health_check():
         })
     except Exception as e:
         print(f"Health check error: {e}")
-        return JSONResponse({
+        return FastJSONResponse({
             "status": "partial",
             "error": str(e),
             "mongodb_connected": False,
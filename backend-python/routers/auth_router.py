@@ -6,7 +6,7 @@ Authentication Routes - כל הנתיבים של אימות
 import time
 import uuid
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from utils.fast_json import FastJSONResponse
 from utils.mock_data import mock_db
 
 router = APIRouter()
@@ -45,7 +45,7 @@ async def register_user(request_data: dict):
         # הסרת סיסמה מהתגובה
         safe_user_data = {k: v for k, v in user_data.items() if k != 'password_hash'}
         
-        return JSONResponse({
+        return FastJSONResponse({
             "success": True,
             "session_id": session_id,
             "user": safe_user_data,
@@ -96,7 +96,7 @@ async def login_user(request_data: dict):
         # הסרת סיסמה מהתגובה
         safe_user_data = {k: v for k, v in user.items() if k != 'password_hash'}
         
-        return JSONResponse({
+        return FastJSONResponse({
             "success": True,
             "session_id": session_id,
             "user": safe_user_data
@@ -146,7 +146,7 @@ async def guest_login(request_data: dict):
             }
         }
         
-        return JSONResponse({
+        return FastJSONResponse({
             "success": True,
             "session_id": session_id,
             "user": guest_user
@@ -189,7 +189,7 @@ async def authenticate_openai(request_data: dict):
         
         print(f"✅ OpenAI API key authenticated: {api_key[:10]}...")
         
-        return JSONResponse({
+        return FastJSONResponse({
             'success': True,
             'sessionId': session_id,
             'message': 'API key validated successfully',
@@ -210,7 +210,7 @@ async def logout(request_data: dict):
         session_id = request_data.get('sessionId', '').strip()
         
         if not session_id:
-            return JSONResponse({
+            return FastJSONResponse({
                 'success': True,
                 'message': 'No session to logout'
             })
@@ -218,14 +218,14 @@ async def logout(request_data: dict):
         # מחיקת ה-session
         deleted = mock_db.delete_session(session_id)
         
-        return JSONResponse({
+        return FastJSONResponse({
             'success': True,
             'message': 'Logged out successfully' if deleted else 'Session not found'
         })
         
     except Exception as e:
         print(f"Error during logout: {e}")
-        return JSONResponse({
+        return FastJSONResponse({
             'success': False, 
             'error': 'Logout failed'
         }, status_code=400)
@@ -244,7 +244,7 @@ async def validate_session(session_id: str):
         
         session = mock_db.get_session(session_id)
         
-        return JSONResponse({
+        return FastJSONResponse({
             'success': True,
             'valid': True,
             'session': {
@@ -278,7 +278,7 @@ async def refresh_session(request_data: dict):
         session['timestamp'] = time.time()
         session['last_refresh'] = time.time()
         
-        return JSONResponse({
+        return FastJSONResponse({
             'success': True,
             'message': 'Session refreshed successfully',
             'expires_in': 86400  # 24 שעות
@@ -296,7 +296,7 @@ async def cleanup_sessions():
     try:
         cleaned = mock_db.cleanup_old_sessions()
         
-        return JSONResponse({
+        return FastJSONResponse({
             'success': True,
             'message': f'Cleaned {cleaned} expired sessions',
             'remaining_sessions': len(mock_db.sessions)
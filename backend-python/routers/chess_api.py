@@ -1,23 +1,240 @@
 # backend-python/routers/chess_api.py - Fast Response Version
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from utils.fast_json import FastJSONResponse
 from chess_engine import ChessEngine
+from engine.pool import engine_pool
+from engine.opening_book import opening_book
+from engine.endgame_bitbase import endgame_bitbase
+from engine.transposition_cache import transposition_cache
+from engine.time_manager import time_manager
+from engine.supervisor import engine_supervisor
+from engine.game_state import GameState
+from engine.position_cache import position_cache
+from engine.move_delta import MoveDeltaEncoder, PROTOCOL_DELTA, PROTOCOL_FULL, delta_stats
 from database.mongo_client import mongodb
+from utils.metrics import metrics
+from utils.tracing import span
+from utils.log import log
+from collections import deque
+import os
 import uuid
 import time
 import asyncio
+from array import array
+from contextlib import asynccontextmanager
+from typing import Optional
 
 router = APIRouter()
 
-# In-memory storage for active games
+# In-memory storage for active games - GameState קומפקטי, ChessEngine מחובר רק בזמן בקשה
 active_games = {}
-game_metadata = {}
+game_locks = {}  # מונע שני מהלכים במקביל על אותו לוח
+last_activity = {}  # game_id -> זמן הבקשה האחרונה
+
+# ✅ פינוי משחקים לא פעילים ל-MongoDB
+GAME_IDLE_TIMEOUT = float(os.getenv('GAME_IDLE_TIMEOUT', 600))  # שניות בלי בקשה עד פינוי
+GAME_EVICT_INTERVAL = float(os.getenv('GAME_EVICT_INTERVAL', 30))
+RATE_WINDOW = 60.0  # חלון לחישוב קצב פינוי / טעינה
+
+_rehydrate_lock = asyncio.Lock()
+_evictor_task = None
+eviction_stats = {
+    'spilled': 0,
+    'rehydrated': 0,
+    'spill_failures': 0,
+    'spill_times': deque(maxlen=10000),
+    'rehydrate_times': deque(maxlen=10000)
+}
+
+metrics.gauge('chess_resident_games', 'REST games held in memory', lambda: len(active_games))
+metrics.gauge('chess_pondering_games', 'REST games keeping an engine between requests',
+              lambda: sum(1 for state in list(active_games.values()) if state.engine is not None))
+
+def _attach_engine(state: GameState) -> ChessEngine:
+    """ChessEngine לבקשה - הלוח משוחזר מהמהלכים של המצב הקומפקטי"""
+    if state.engine is None:
+        engine = ChessEngine(
+            skill_level=max(1, min(8, state.ai_level)),  # ✅ ישיר ללא הכפלה, מוגבל למהירות
+            pool=engine_pool,  # ✅ מנוע מושאל מה-pool לכל חיפוש
+            book=opening_book,
+            tablebase=endgame_bitbase,
+            cache=transposition_cache
+        )
+        engine.board = state.board()
+        engine.ai_moves = state.ai_moves
+        engine.book_hits = state.book_hits
+        engine.out_of_book = state.out_of_book
+        engine._scores.extend(state.scores)
+        engine.ponder_hits = state.ponder_hits
+        engine.ponder_misses = state.ponder_misses
+        state.engine = engine
+    return state.engine
+
+def _park_engine(state: GameState, force: bool = False):
+    """בין בקשות נשאר רק המצב הקומפקטי - משחק עם ponder פעיל שומר את המנוע"""
+    engine = state.engine
+    if engine is None or (engine.ponder and not force):
+        return
+    state.ai_moves = engine.ai_moves
+    state.book_hits = engine.book_hits
+    state.out_of_book = engine.out_of_book
+    state.scores = array('h', engine._scores)
+    state.ponder_hits = engine.ponder_hits
+    state.ponder_misses = engine.ponder_misses
+    engine.stop_engine()
+    state.engine = None
+
+def _delta_encoder(state: GameState, protocol: str) -> Optional[MoveDeltaEncoder]:
+    """ה-encoder של המשחק אם הלקוח ביקש protocol='delta'"""
+    if protocol != PROTOCOL_DELTA:
+        state.delta = None
+    elif state.delta is None:
+        state.delta = MoveDeltaEncoder()
+    return state.delta
+
+def _position_payload(state: GameState, result: dict, encoder: Optional[MoveDeltaEncoder],
+                      synced: bool = False) -> dict:
+    """ה-position של התגובה - מלא, או ply + שינוי ב-legal_moves ללקוח delta שלא איבד הודעה"""
+    if encoder is None:
+        return {'fen': result['fen'], 'turn': result['turn'], 'legal_moves': result['legal_moves']}
+    return {
+        'turn': result['turn'],
+        **encoder.encode(state.move_count, result['legal_moves'], synced, fen=result['fen'])
+    }
+
+def _touch(game_id: str):
+    last_activity[game_id] = time.time()
+
+def _forget_game(game_id: str):
+    """הסרת משחק מהזיכרון ושחרור המנוע שלו"""
+    state = active_games.pop(game_id, None)
+    if state:
+        _park_engine(state, force=True)
+    game_locks.pop(game_id, None)
+    last_activity.pop(game_id, None)
+
+async def _spill_game(game_id: str, idle_since: float) -> bool:
+    """שמירת משחק לא פעיל ב-MongoDB ושחרור הזיכרון - רק אם אף בקשה לא רצה עליו"""
+    lock = game_locks.get(game_id)
+    if lock is None or lock.locked():
+        return False
+    
+    async with lock:
+        state = active_games.get(game_id)
+        if state is None or last_activity.get(game_id) != idle_since:
+            return False  # בקשה הגיעה אחרי בדיקת ה-idle
+        _park_engine(state, force=True)
+        try:
+            await mongodb.save_active_game(game_id, state.to_document())
+        except Exception as e:
+            eviction_stats['spill_failures'] += 1
+            log.error("❌ Failed to spill game", game_id=game_id[:8], error=str(e))
+            return False
+        
+        # ✅ עדיין תחת הנעילה - בקשה שממתינה לה תמצא שהמשחק פונה ותטען אותו מחדש
+        active_games.pop(game_id, None)
+        game_locks.pop(game_id, None)
+        last_activity.pop(game_id, None)
+    
+    eviction_stats['spilled'] += 1
+    eviction_stats['spill_times'].append(time.time())
+    return True
+
+async def _ensure_resident(game_id: str) -> bool:
+    """המשחק בזיכרון - טעינה מחדש מ-MongoDB אם פונה. False אם המשחק לא קיים"""
+    if game_id in active_games:
+        _touch(game_id)
+        return True
+    if not game_id or not mongodb.is_connected():
+        return False
+    
+    async with _rehydrate_lock:
+        if game_id in active_games:  # נטען ע"י בקשה מקבילה
+            _touch(game_id)
+            return True
+        
+        with span('mongo_rehydrate', game_id=game_id):
+            document = await mongodb.load_active_game(game_id)
+            if not document:
+                return False
+            
+            active_games[game_id] = GameState.from_document(document)
+            game_locks[game_id] = asyncio.Lock()
+            _touch(game_id)
+            await mongodb.delete_active_game(game_id)
+    
+    eviction_stats['rehydrated'] += 1
+    eviction_stats['rehydrate_times'].append(time.time())
+    log.info("♻️ Game rehydrated", game_id=game_id[:8], moves=len(document['uci_moves']))
+    return True
+
+@asynccontextmanager
+async def _locked_game(game_id: str):
+    """המצב של המשחק תחת הנעילה שלו - משחק שפונה בזמן ההמתנה לנעילה נטען מחדש"""
+    while True:
+        if not await _ensure_resident(game_id):
+            raise HTTPException(status_code=404, detail="Game not found")
+        lock = game_locks.get(game_id)
+        if lock is None:
+            continue
+        async with lock:
+            state = active_games.get(game_id)
+            if state is not None and game_locks.get(game_id) is lock:
+                yield state
+                return
+
+async def _evict_idle_games():
+    """לולאת רקע - משחקים בלי בקשה במשך GAME_IDLE_TIMEOUT עוברים ל-MongoDB"""
+    while True:
+        await asyncio.sleep(GAME_EVICT_INTERVAL)
+        if not mongodb.is_connected():
+            continue  # בלי מקום לשמור - לא מוחקים משחקים
+        
+        cutoff = time.time() - GAME_IDLE_TIMEOUT
+        idle_games = [(game_id, last) for game_id, last in list(last_activity.items()) if last < cutoff]
+        spilled = 0
+        for game_id, idle_since in idle_games:
+            if await _spill_game(game_id, idle_since):
+                spilled += 1
+        if spilled:
+            log.info("💤 Spilled idle games to MongoDB", spilled=spilled, resident=len(active_games))
+
+def _recent_rate(times: deque) -> float:
+    """אירועים לדקה בחלון האחרון"""
+    cutoff = time.time() - RATE_WINDOW
+    return sum(1 for t in times if t >= cutoff) * 60.0 / RATE_WINDOW
+
+def get_eviction_stats() -> dict:
+    return {
+        'resident_games': len(active_games),
+        'spilled': eviction_stats['spilled'],
+        'rehydrated': eviction_stats['rehydrated'],
+        'spill_failures': eviction_stats['spill_failures'],
+        'spills_per_min': _recent_rate(eviction_stats['spill_times']),
+        'rehydrates_per_min': _recent_rate(eviction_stats['rehydrate_times']),
+        'idle_timeout': GAME_IDLE_TIMEOUT
+    }
+
+@router.on_event("startup")
+async def start_game_evictor():
+    """לולאת הפינוי של משחקים לא פעילים - מאגר המנועים מופעל ב-main"""
+    global _evictor_task
+    if not mongodb.is_connected():
+        await mongodb.connect()
+    _evictor_task = asyncio.create_task(_evict_idle_games())
+
+@router.on_event("shutdown")
+async def stop_game_evictor():
+    """עצירת לולאת הפינוי בכיבוי השרת"""
+    if _evictor_task:
+        _evictor_task.cancel()
 
 @router.post("/chess/new-game")
 async def new_chess_game(request_data: dict):
     """יצירת משחק חדש מהיר נגד AI"""
     try:
         user_id = request_data.get('user_id')
+        protocol = request_data.get('protocol', PROTOCOL_FULL)
         ai_level = request_data.get('ai_level', 3)  # ✅ רמה נמוכה יותר כברירת מחדל
         player_color = request_data.get('player_color', 'white')
         
@@ -25,67 +242,53 @@ async def new_chess_game(request_data: dict):
         ai_level = max(1, min(8, ai_level))
         
         game_id = str(uuid.uuid4())
-        engine = ChessEngine()
-        
-        # ✅ הגדרות מהירות
-        stockfish_skill = ai_level  # ישיר ללא הכפלה
-        engine.set_skill_level(stockfish_skill)
-        engine.set_fast_mode(True)  # מצב מהיר
+        state = GameState(game_id, user_id, ai_level, player_color)
+        engine = _attach_engine(state)
         
-        print(f"🎮 Starting FAST game {game_id[:8]} - Level {ai_level}")
+        log.info("🎮 Starting FAST game", game_id=game_id[:8], level=ai_level)
         
         # ✅ אתחול מהיר עם timeout
         start_time = time.time()
         engine.start_engine()
         init_time = time.time() - start_time
-        print(f"⚡ Engine started in {init_time:.2f}s")
-        
-        game_state = engine.new_game()
+        log.info("⚡ Engine started", sample=True, seconds=round(init_time, 3))
         
-        # Store game with metadata
-        active_games[game_id] = engine
-        game_metadata[game_id] = {
-            'game_id': game_id,
-            'user_id': user_id,
-            'ai_level': ai_level,
-            'player_color': player_color,
-            'created_at': time.time(),
-            'moves': [],
-            'positions': [engine.board.fen()],
-            'game_result': None,
-            'fast_mode': True
-        }
+        # Store game
+        active_games[game_id] = state
+        game_locks[game_id] = asyncio.Lock()
+        _touch(game_id)
         
         # ✅ אם השחקן שחור, AI מהיר ראשון
         ai_move_result = None
         if player_color == 'black':
-            print(f"🤖 AI making opening move...")
+            log.info("🤖 AI making opening move", sample=True)
             start_time = time.time()
-            ai_move_result = engine.get_ai_move(time_limit=0.3)  # מהלך פתיחה מהיר
+            ai_move_result = await engine.aget_ai_move()  # מהלך פתיחה - בדרך כלל מהספר
             move_time = time.time() - start_time
             
             if ai_move_result['success']:
-                game_metadata[game_id]['moves'].append(ai_move_result['san'])
-                game_metadata[game_id]['positions'].append(engine.board.fen())
-                print(f"⚡ AI opened with {ai_move_result['san']} in {move_time:.2f}s")
+                state.push_uci(ai_move_result['move'])
+                log.info("⚡ AI opened", sample=True, san=ai_move_result['san'], seconds=round(move_time, 3))
         
-        return JSONResponse({
+        response = FastJSONResponse({
             'success': True,
             'game_id': game_id,
             'ai_level': ai_level,
             'player_color': player_color,
-            'position': {
+            'position': _position_payload(state, {
                 'fen': engine.board.fen(),
                 'turn': 'black' if engine.board.turn else 'white',
-                'legal_moves': [move.uci() for move in engine.board.legal_moves],
-            },
+                'legal_moves': list(engine.position().legal_moves),
+            }, _delta_encoder(state, protocol)),
             'ai_move': ai_move_result,
             'fast_mode': True,
             'init_time': init_time
         })
+        _park_engine(state)
+        return response
         
     except Exception as e:
-        print(f"❌ Failed to create fast game: {e}")
+        log.error("❌ Failed to create fast game", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/chess/move")
@@ -94,178 +297,171 @@ async def make_chess_move(request_data: dict):
     try:
         game_id = request_data.get('game_id')
         move = request_data.get('move')
+        protocol = request_data.get('protocol', PROTOCOL_FULL)
+        client_ply = request_data.get('ply')  # ה-ply האחרון שהלקוח קיבל (protocol='delta')
         
-        if game_id not in active_games:
-            raise HTTPException(status_code=404, detail="Game not found")
+        async with _locked_game(game_id) as state:
+            try:
+                return await _process_move(state, move, protocol, client_ply)
+            finally:
+                _park_engine(state)
         
-        engine = active_games[game_id]
-        metadata = game_metadata[game_id]
-        
-        print(f"🎯 Processing move {move} in game {game_id[:8]}")
-        
-        # ✅ מהלך השחקן מהיר
-        start_time = time.time()
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.error("❌ Move processing failed", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def _process_move(state: GameState, move: str, protocol: str = PROTOCOL_FULL, client_ply: int = None):
+    """מהלך השחקן ותגובת ה-AI - רץ תחת הנעילה של המשחק"""
+    game_id = state.game_id
+    engine = _attach_engine(state)
+    encoder = _delta_encoder(state, protocol)
+    # ✅ פער ברצף (או לקוח שלא מכיר את העמדה) מקבל את המצב המלא
+    synced = encoder is not None and encoder.in_sync(client_ply) and client_ply == state.move_count
+    
+    log.info("🎯 Processing move", sample=True, move=move, game_id=game_id[:8])
+    
+    # ✅ מהלך השחקן מהיר
+    start_time = time.time()
+    with span('make_move', move=str(move)):
         player_result = engine.make_move(move)
-        player_time = time.time() - start_time
-        
-        if not player_result['success']:
-            raise HTTPException(status_code=400, detail=player_result['error'])
-        
-        # Store player move
-        metadata['moves'].append(player_result['san'])
-        metadata['positions'].append(engine.board.fen())
-        
-        print(f"✅ Player move {player_result['san']} processed in {player_time:.3f}s")
-        
-        # Check if game over after player move
-        if player_result['is_game_over']:
-            result = engine.get_game_result()
-            metadata['game_result'] = result
-            
-            # Save to MongoDB if user_id exists
-            if metadata.get('user_id'):
-                await save_game_to_db(game_id)
-            
-            return JSONResponse({
-                'success': True,
-                'game_id': game_id,
-                'player_move': {'move': move, 'san': player_result['san']},
-                'position': {
-                    'fen': player_result['fen'],
-                    'turn': player_result['turn'],
-                    'legal_moves': player_result['legal_moves'],
-                },
-                'ai_move': None,
-                'game_result': result,
-                'game_over': True
-            })
-        
-        # ✅ תגובת AI מהירה
-        print(f"🤖 AI thinking (Level {metadata['ai_level']})...")
-        ai_start_time = time.time()
-        
-        # חישוב זמן חשיבה לפי רמה
-        think_times = {
-            1: 0.1,  # מיידי
-            2: 0.15, # מהיר מאוד  
-            3: 0.2,  # מהיר
-            4: 0.3,  # נורמלי
-            5: 0.4,  # בינוני
-            6: 0.5,  # חכם
-            7: 0.6,  # מומחה
-            8: 0.8   # רמה גבוהה
-        }
-        
-        think_time = think_times.get(metadata['ai_level'], 0.3)
-        ai_result = engine.get_ai_move(time_limit=think_time)
-        ai_total_time = time.time() - ai_start_time
-        
-        if not ai_result['success']:
-            raise HTTPException(status_code=500, detail=f"AI error: {ai_result['error']}")
-        
-        # Store AI move
-        metadata['moves'].append(ai_result['san'])
-        metadata['positions'].append(engine.board.fen())
-        
-        print(f"⚡ AI responded with {ai_result['san']} in {ai_total_time:.2f}s")
-        
-        # Check if game over after AI move
-        game_over = ai_result['is_game_over']
-        game_result = None
-        
-        if game_over:
-            game_result = engine.get_game_result()
-            metadata['game_result'] = game_result
-            
-            # Save to MongoDB if user_id exists
-            if metadata.get('user_id'):
-                await save_game_to_db(game_id)
+    player_time = time.time() - start_time
+    
+    if not player_result['success']:
+        raise HTTPException(status_code=400, detail=player_result['error'])
+    
+    # Store player move
+    state.push_uci(player_result['move'])
+    
+    log.info("✅ Player move processed", sample=True, san=player_result['san'], seconds=round(player_time, 4))
+    
+    # Check if game over after player move
+    if player_result['is_game_over']:
+        result = engine.get_game_result()
+        state.game_result = result
+        
+        # Save to MongoDB if user_id exists
+        if state.user_id:
+            await save_game_to_db(game_id)
         
-        return JSONResponse({
+        return FastJSONResponse({
             'success': True,
             'game_id': game_id,
             'player_move': {'move': move, 'san': player_result['san']},
-            'ai_move': {
-                'move': ai_result['move'], 
-                'san': ai_result['san'],
-                'think_time': ai_total_time
-            },
-            'position': {
-                'fen': ai_result['fen'],
-                'turn': ai_result['turn'],
-                'legal_moves': ai_result['legal_moves'],
-            },
-            'game_result': game_result,
-            'game_over': game_over,
-            'fast_mode': True
+            'position': _position_payload(state, player_result, encoder, synced),
+            'ai_move': None,
+            'game_result': result,
+            'game_over': True
         })
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"❌ Move processing failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    
+    # ✅ תגובת AI מהירה
+    log.info("🤖 AI thinking", sample=True, level=state.ai_level)
+    ai_start_time = time.time()
+    
+    # ✅ זמן החשיבה נקבע ע"י ה-time manager - רמה, מיקום ועומס
+    with span('get_ai_move', ai_level=state.ai_level):
+        ai_result = await engine.aget_ai_move()  # ponderhit נענה מיד
+    ai_total_time = time.time() - ai_start_time
+    
+    if not ai_result['success']:
+        raise HTTPException(status_code=500, detail=f"AI error: {ai_result['error']}")
+    
+    # Store AI move
+    state.push_uci(ai_result['move'])
+    
+    log.info("⚡ AI responded", sample=True, san=ai_result['san'], seconds=round(ai_total_time, 3))
+    
+    # Check if game over after AI move
+    game_over = ai_result['is_game_over']
+    game_result = None
+    
+    if game_over:
+        game_result = engine.get_game_result()
+        state.game_result = game_result
+        
+        # Save to MongoDB if user_id exists
+        if state.user_id:
+            await save_game_to_db(game_id)
+    
+    return FastJSONResponse({
+        'success': True,
+        'game_id': game_id,
+        'player_move': {'move': move, 'san': player_result['san']},
+        'ai_move': {
+            'move': ai_result['move'], 
+            'san': ai_result['san'],
+            'think_time': ai_total_time,
+            'time_budget': ai_result.get('time_budget'),
+            'source': ai_result['source']
+        },
+        'position': _position_payload(state, ai_result, encoder, synced),
+        'game_result': game_result,
+        'game_over': game_over,
+        'fast_mode': True
+    })
 
 async def save_game_to_db(game_id: str):
     """Save completed game to MongoDB - async version"""
     try:
         if not mongodb.is_connected():
-            print("⚠️ MongoDB not connected, skipping game save")
+            log.warning("⚠️ MongoDB not connected, skipping game save")
             return
             
-        metadata = game_metadata[game_id]
-        engine = active_games[game_id]
+        state = active_games[game_id]
         
         game_document = {
             'game_id': game_id,
-            'user_id': metadata['user_id'],
-            'ai_level': metadata['ai_level'],
-            'player_color': metadata['player_color'],
-            'moves': metadata['moves'],
-            'positions': metadata['positions'],
-            'game_result': metadata['game_result'],
-            'created_at': metadata['created_at'],
+            'user_id': state.user_id,
+            'ai_level': state.ai_level,
+            'player_color': state.player_color,
+            'moves': state.san_moves(),
+            'positions': state.fens(),
+            'game_result': state.game_result,
+            'created_at': state.created_at,
             'completed_at': time.time(),
-            'fast_mode': metadata.get('fast_mode', True)
+            'fast_mode': state.fast_mode
         }
         
-        # Use asyncio to run the sync operation
-        await asyncio.get_event_loop().run_in_executor(
-            None, 
-            lambda: mongodb.db.games.insert_one(game_document)
-        )
+        with span('mongo_save_game', game_id=game_id):
+            await mongodb.db.games.insert_one(game_document)  # motor - async
         
-        print(f"💾 Fast game {game_id[:8]} saved to database")
+        log.info("💾 Fast game saved to database", game_id=game_id[:8])
         
     except Exception as e:
-        print(f"❌ Failed to save game to database: {e}")
+        log.error("❌ Failed to save game to database", error=str(e))
 
 @router.get("/chess/game/{game_id}")
 async def get_game_state(game_id: str):
     """קבלת מצב משחק נוכחי"""
     try:
-        if game_id not in active_games:
+        if not await _ensure_resident(game_id):
             raise HTTPException(status_code=404, detail="Game not found")
         
-        engine = active_games[game_id]
-        metadata = game_metadata[game_id]
+        state = active_games.get(game_id)
+        if state is None:
+            raise HTTPException(status_code=404, detail="Game not found")
+        board = state.engine.board if state.engine else state.board()
+        position = state.engine.position() if state.engine else position_cache.get(board)
         
-        return JSONResponse({
+        return FastJSONResponse({
             'success': True,
             'game_id': game_id,
             'position': {
-                'fen': engine.board.fen(),
-                'turn': 'black' if engine.board.turn else 'white',
-                'legal_moves': [move.uci() for move in engine.board.legal_moves],
+                'fen': board.fen(),
+                'turn': 'black' if board.turn else 'white',
+                'legal_moves': list(position.legal_moves),
             },
             'metadata': {
-                'ai_level': metadata['ai_level'],
-                'player_color': metadata['player_color'],
-                'move_count': len(metadata['moves']),
-                'game_result': metadata['game_result'],
-                'fast_mode': metadata.get('fast_mode', True)
+                'ai_level': state.ai_level,
+                'player_color': state.player_color,
+                'move_count': state.move_count,
+                'game_result': state.game_result,
+                'fast_mode': state.fast_mode,
+                'book': state.engine.get_book_stats() if state.engine else state.get_book_stats(),
+                'ponder': state.engine.get_ponder_stats() if state.engine else state.get_ponder_stats()
             },
-            'history': metadata['moves']
+            'history': state.san_moves()
         })
         
     except HTTPException:
@@ -279,28 +475,22 @@ async def resign_game(request_data: dict):
     try:
         game_id = request_data.get('game_id')
         
-        if game_id not in active_games:
-            raise HTTPException(status_code=404, detail="Game not found")
-        
-        # Update game result
-        metadata = game_metadata[game_id]
-        metadata['game_result'] = f"{metadata['player_color']} resigned"
-        
-        # Save to database if needed
-        if metadata.get('user_id'):
-            await save_game_to_db(game_id)
-        
-        # Cleanup
-        engine = active_games[game_id]
-        engine.stop_engine()
-        del active_games[game_id]
-        del game_metadata[game_id]
+        async with _locked_game(game_id) as state:
+            # Update game result
+            state.game_result = f"{state.player_color} resigned"
+            
+            # Save to database if needed
+            if state.user_id:
+                await save_game_to_db(game_id)
+            
+            # Cleanup
+            _forget_game(game_id)
         
-        print(f"🏳️ Game {game_id[:8]} resigned and cleaned up")
+        log.info("🏳️ Game resigned and cleaned up", game_id=game_id[:8])
         
-        return JSONResponse({
+        return FastJSONResponse({
             'success': True,
-            'result': metadata['game_result'],
+            'result': state.game_result,
             'message': 'Game resigned successfully'
         })
         
@@ -317,26 +507,39 @@ async def cleanup_old_games():
         current_time = time.time()
         old_games = []
         
-        for game_id, metadata in game_metadata.items():
+        for game_id, state in active_games.items():
             # משחקים ישנים מ-1 שעה
-            if current_time - metadata['created_at'] > 3600:
+            if current_time - state.created_at > 3600:
                 old_games.append(game_id)
         
         cleaned_count = 0
         for game_id in old_games:
             if game_id in active_games:
-                active_games[game_id].stop_engine()
-                del active_games[game_id]
-                del game_metadata[game_id]
+                _forget_game(game_id)
                 cleaned_count += 1
         
-        print(f"🧹 Cleaned up {cleaned_count} old games")
+        log.info("🧹 Cleaned up old games", count=cleaned_count)
         
-        return JSONResponse({
+        return FastJSONResponse({
             'success': True,
             'cleaned_games': cleaned_count,
             'active_games': len(active_games)
         })
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/chess/engine-stats")
+async def get_engine_stats():
+    """מדדי מאגר המנועים"""
+    return FastJSONResponse({
+        'success': True,
+        'pool': engine_pool.get_stats(),
+        'cache': transposition_cache.get_stats(),
+        'time': time_manager.get_stats(),
+        'positions': position_cache.get_stats(),
+        'protocol': delta_stats.get_stats(),
+        'supervisor': engine_supervisor.get_stats(),
+        'games': get_eviction_stats(),
+        'active_games': len(active_games)
+    })
@@ -4,7 +4,7 @@ Game Routes - נתיבים של משחקים ומאמן
 """
 
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from utils.fast_json import FastJSONResponse
 from datetime import datetime
 import uuid
 from typing import Optional, Dict, Any
@@ -107,7 +107,7 @@ async def chess_coach_chat(
         # הוספת מידע על המשתמש
         response_text += f"\n\n💡 {current_user['username']}, המשך לשאול שאלות!"
         
-        return JSONResponse({
+        return FastJSONResponse({
             'success': True,
             'response': response_text,
             'analysis_type': request.analysisType,
@@ -134,7 +134,7 @@ async def get_active_games(current_user: dict = Depends(get_current_user)):
                 'created_at': game['created_at']
             })
     
-    return JSONResponse({
+    return FastJSONResponse({
         'success': True,
         'games': user_games,
         'total': len(user_games)
@@ -158,7 +158,7 @@ async def create_new_game(current_user: dict = Depends(get_current_user)):
     
     active_games[game_id] = game
     
-    return JSONResponse({
+    return FastJSONResponse({
         'success': True,
         'game_id': game_id,
         'message': 'Game created successfully'
@@ -200,7 +200,7 @@ async def game_action(
     else:
         raise HTTPException(status_code=400, detail="Unknown action")
     
-    return JSONResponse({
+    return FastJSONResponse({
         'success': True,
         'message': f'Action {request.action} completed',
         'game_status': game['status']
@@ -222,7 +222,7 @@ async def get_game_details(
         # במשחק אמיתי, בדוק אם המשחק ציבורי
         raise HTTPException(status_code=403, detail="Not authorized to view this game")
     
-    return JSONResponse({
+    return FastJSONResponse({
         'success': True,
         'game': game
     })
@@ -240,7 +240,7 @@ async def get_daily_puzzle():
         'description': 'White to move and win material'
     }
     
-    return JSONResponse({
+    return FastJSONResponse({
         'success': True,
         'puzzle': puzzle
     })
@@ -261,7 +261,7 @@ async def get_user_stats(current_user: dict = Depends(get_current_user)):
         'improvement_rate': '+12.3%'
     }
     
-    return JSONResponse({
+    return FastJSONResponse({
         'success': True,
         'stats': stats,
         'user': current_user['username']
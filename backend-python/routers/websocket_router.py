@@ -9,33 +9,59 @@ import uuid
 from datetime import datetime
 from typing import Dict, Optional
 import asyncio
+import os
 import random
+import threading
+
+from engine.move_delta import MoveDeltaEncoder, PROTOCOL_DELTA, PROTOCOL_FULL
+from utils.fast_json import encode_message
+from utils.metrics import metrics, websocket_message_seconds
+from utils.tracing import span, KIND_SERVER
+from utils.log import log
+
+# ✅ מנוע אמיתי מה-pool כש-Stockfish זמין, אחרת ה-stub
+try:
+    from chess_engine import ChessEngine
+    from engine.pool import engine_pool
+    from engine.opening_book import opening_book
+    from engine.endgame_bitbase import endgame_bitbase
+    from engine.transposition_cache import transposition_cache
+except (ImportError, FileNotFoundError) as e:
+    print(f"⚠️ Stockfish engine unavailable, using stub: {e}")
+    ChessEngine = None
 
 router = APIRouter()
 
+# ✅ ניתוח מוזרם - משך מקסימלי וקצב עדכונים (ניתן לשנות לכל בקשה)
+ANALYSIS_DEFAULT_TIME = float(os.getenv('ANALYSIS_STREAM_TIME', 5.0))
+ANALYSIS_MAX_TIME = float(os.getenv('ANALYSIS_STREAM_MAX_TIME', 30.0))
+
 # מנהל חיבורי WebSocket למשחקים
 class GameWebSocketManager:
     def __init__(self):
         self.active_connections: Dict[str, dict] = {}
-        self.engine_initialized = True  # Stockfish stub
+        self.engine_initialized = ChessEngine is not None
         
     async def connect(self, websocket: WebSocket, player_id: str):
         await websocket.accept()
         self.active_connections[player_id] = {
             'websocket': websocket,
             'player_data': {},
-            'game_data': None
+            'game_data': None,
+            'analysis': None  # (task, stop_event) של ניתוח מוזרם פעיל
         }
         
     def disconnect(self, player_id: str):
         if player_id in self.active_connections:
+            stop_analysis(self.active_connections[player_id])
+            stop_pondering(self.active_connections[player_id])
             del self.active_connections[player_id]
             
     async def send_message(self, player_id: str, message: dict):
         if player_id in self.active_connections:
             try:
                 websocket = self.active_connections[player_id]['websocket']
-                await websocket.send_json(message)
+                await websocket.send_text(encode_message(message))
                 return True
             except:
                 self.disconnect(player_id)
@@ -80,6 +106,14 @@ class ChessEngineStub:
         moves = ['e2e4', 'd2d4', 'g1f3', 'b1c3', 'e2e3', 'd2d3']
         return random.choice(moves)
     
+    async def aget_ai_move(self, time_limit: float = None):
+        # אותו ממשק כמו ChessEngine.aget_ai_move
+        return self.make_move(self.get_best_move())
+    
+    def cancel_ponder(self):
+        # אין ponder במנוע המדומה
+        pass
+    
     def set_skill_level(self, level: int):
         self.skill_level = max(0, min(20, level))
     
@@ -105,7 +139,58 @@ class ChessEngineStub:
 
 # יצירת instances
 manager = GameWebSocketManager()
-chess_engine = ChessEngineStub()
+
+metrics.gauge('chess_ws_game_connections', 'Open /ws/game connections', lambda: len(manager.active_connections))
+metrics.gauge('chess_ws_active_games', 'AI games played over /ws/game',
+              lambda: sum(1 for c in list(manager.active_connections.values()) if c.get('game_data')))
+
+def stop_analysis(connection: dict):
+    """עצירת ניתוח מוזרם פעיל של החיבור"""
+    analysis = connection.get('analysis')
+    if analysis:
+        _, stop_event = analysis
+        stop_event.set()
+        connection['analysis'] = None
+
+def stop_pondering(connection: dict):
+    """ביטול ponder של המשחק הנוכחי - שלא יחזיק מנוע מה-pool עד ponder_max_time"""
+    game_data = connection.get('game_data')
+    engine = game_data.get('engine') if game_data else None
+    if engine is not None:
+        engine.cancel_ponder()
+
+def position_message(game_data: dict, synced: bool = False) -> dict:
+    """ה-position של ההודעה - מלא, או ply + שינוי ב-legal_moves למשחק עם protocol='delta'"""
+    position = game_data['engine'].get_position_info()
+    encoder = game_data.get('delta')
+    if encoder is None:
+        return position
+    
+    legal_moves = position.pop('legal_moves')
+    fen = position.pop('fen')
+    return {**position, **encoder.encode(position['move_count'], legal_moves, synced, fen=fen)}
+
+def create_game_engine(ai_level: int):
+    """מנוע למשחק חדש - לוח משלו, מנוע מושאל מה-pool לכל חיפוש"""
+    if ChessEngine is None:
+        engine = ChessEngineStub()
+    else:
+        engine = ChessEngine(
+            pool=engine_pool,
+            book=opening_book,
+            tablebase=endgame_bitbase,
+            cache=transposition_cache
+        )
+        engine.set_fast_mode(True)
+    engine.set_skill_level(ai_level)
+    return engine
+
+def get_game_engine(player_id: str):
+    """המנוע של המשחק הפעיל של השחקן"""
+    connection = manager.active_connections.get(player_id)
+    if connection and connection.get('game_data'):
+        return connection['game_data']['engine']
+    return None
 
 @router.websocket("/ws/game/{player_id}")
 async def game_websocket(websocket: WebSocket, player_id: str):
@@ -127,7 +212,7 @@ async def game_websocket(websocket: WebSocket, player_id: str):
             except json.JSONDecodeError:
                 await send_error(player_id, "Invalid JSON format")
             except Exception as e:
-                print(f"WebSocket error: {e}")
+                log.error("WebSocket error", error=str(e))
                 await send_error(player_id, str(e))
                 
     except WebSocketDisconnect:
@@ -140,7 +225,7 @@ async def handle_game_message(player_id: str, message: dict):
     action = message.get('action')
     data = message.get('data', {})
     
-    print(f"📨 Game action {action} from {player_id[:8]}")
+    log.info("📨 Game action", sample=True, action=action, player_id=player_id[:8])
     
     handlers = {
         'join': handle_join,
@@ -149,12 +234,16 @@ async def handle_game_message(player_id: str, message: dict):
         'resign': handle_resign,
         'new_game': handle_new_game,
         'get_position': handle_get_position,
-        'set_ai_level': handle_set_ai_level
+        'set_ai_level': handle_set_ai_level,
+        'start_analysis': handle_start_analysis,
+        'stop_analysis': handle_stop_analysis
     }
     
     handler = handlers.get(action)
     if handler:
-        await handler(player_id, data)
+        with websocket_message_seconds.time('game', action), \
+                span(f'ws.game {action}', KIND_SERVER, player_id=player_id):
+            await handler(player_id, data)
     else:
         await send_error(player_id, f"Unknown action: {action}")
 
@@ -189,31 +278,33 @@ async def handle_find_game(player_id: str, data: dict):
     ai_level = data.get('ai_level', 5)
     
     if mode == 'ai':
-        await start_ai_game(player_id, ai_level)
+        await start_ai_game(player_id, ai_level, data.get('protocol', PROTOCOL_FULL))
     else:
         await send_error(player_id, "Only AI games are supported currently")
 
-async def start_ai_game(player_id: str, ai_level: int = 5):
+async def start_ai_game(player_id: str, ai_level: int = 5, protocol: str = PROTOCOL_FULL):
     """התחלת משחק נגד AI"""
     try:
-        # המרת רמה 1-10 לרמה 0-20 של Stockfish
-        stockfish_level = max(0, min(20, (ai_level - 1) * 2))
-        chess_engine.set_skill_level(stockfish_level)
+        engine = create_game_engine(ai_level)
         
         # יצירת משחק חדש
-        game_state = chess_engine.new_game()
+        engine.new_game()
         game_id = str(uuid.uuid4())
+        game_data = {
+            'game_id': game_id,
+            'player_color': 'white',
+            'ai_level': ai_level,
+            'engine': engine,
+            'delta': MoveDeltaEncoder() if protocol == PROTOCOL_DELTA else None
+        }
+        game_state = position_message(game_data)
         
         # שמירת נתוני המשחק
         if player_id in manager.active_connections:
+            stop_pondering(manager.active_connections[player_id])  # המשחק הקודם
             manager.active_connections[player_id]['player_data']['is_in_game'] = True
             manager.active_connections[player_id]['player_data']['game_id'] = game_id
-            manager.active_connections[player_id]['game_data'] = {
-                'game_id': game_id,
-                'player_color': 'white',
-                'ai_level': ai_level,
-                'stockfish_level': stockfish_level
-            }
+            manager.active_connections[player_id]['game_data'] = game_data
         
         await manager.send_message(player_id, {
             'type': 'game_start',
@@ -222,16 +313,16 @@ async def start_ai_game(player_id: str, ai_level: int = 5):
                 'color': 'white',
                 'opponent': {
                     'name': f'ChessMentor AI (Level {ai_level})',
-                    'elo': chess_engine._skill_to_elo(stockfish_level)
+                    'elo': engine._skill_to_elo(engine.skill_level)
                 },
                 'position': game_state
             }
         })
         
-        print(f"🤖 Started AI game {game_id[:8]} - Level {ai_level}")
+        log.info("🤖 Started AI game", game_id=game_id[:8], level=ai_level)
         
     except Exception as e:
-        print(f"❌ Failed to start AI game: {e}")
+        log.error("❌ Failed to start AI game", error=str(e))
         await send_error(player_id, f"Failed to start game: {str(e)}")
 
 async def handle_make_move(player_id: str, data: dict):
@@ -241,9 +332,23 @@ async def handle_make_move(player_id: str, data: dict):
         await send_error(player_id, "Move is required")
         return
     
+    engine = get_game_engine(player_id)
+    if not engine:
+        await send_error(player_id, "No active game")
+        return
+    
+    connection = manager.active_connections[player_id]
+    game_data = connection['game_data']
+    encoder = game_data.get('delta')
+    # ✅ פער ברצף (הודעה שאבדה / חיבור מחדש) - שתי ההודעות של המהלך נשלחות מלאות
+    synced = encoder is not None and encoder.in_sync(data.get('ply'))
+    
+    # ניתוח של המיקום הקודם כבר לא רלוונטי
+    stop_analysis(connection)
+    
     try:
         # ביצוע מהלך
-        result = chess_engine.make_move(move_uci)
+        result = engine.make_move(move_uci)
         
         if not result['success']:
             await send_error(player_id, "Invalid move")
@@ -256,40 +361,33 @@ async def handle_make_move(player_id: str, data: dict):
                 'move': move_uci,
                 'san': result['san'],
                 'player': 'You',
-                'position': {
-                    'fen': result['fen'],
-                    'legal_moves': result['legal_moves'],
-                    'turn': result['turn'],
-                    'move_count': result['move_count']
-                }
+                'position': position_message(game_data, synced)
             }
         })
         
         # אם המשחק לא נגמר, AI משחק
         if not result['is_game_over']:
-            await asyncio.sleep(0.5)  # השהייה קטנה
+            # ✅ החיפוש רץ ב-thread של המנוע - ה-event loop ממשיך לשרת
+            ai_result = await engine.aget_ai_move()
             
-            # מהלך AI
-            ai_move = chess_engine.get_best_move()
-            ai_result = chess_engine.make_move(ai_move)
+            if not ai_result['success']:
+                await send_error(player_id, f"AI error: {ai_result['error']}")
+                return
             
             await manager.send_message(player_id, {
                 'type': 'move_made',
                 'data': {
-                    'move': ai_move,
+                    'move': ai_result['move'],
                     'san': ai_result['san'],
                     'player': 'ChessMentor AI',
-                    'position': {
-                        'fen': ai_result['fen'],
-                        'legal_moves': ai_result['legal_moves'],
-                        'turn': ai_result['turn'],
-                        'move_count': ai_result['move_count']
-                    }
+                    'source': ai_result.get('source', 'engine'),
+                    'time_budget': ai_result.get('time_budget'),
+                    'position': position_message(game_data, True)
                 }
             })
             
     except Exception as e:
-        print(f"❌ Move error: {e}")
+        log.error("❌ Move error", error=str(e))
         await send_error(player_id, str(e))
 
 async def handle_resign(player_id: str, data: dict):
@@ -306,6 +404,7 @@ async def handle_resign(player_id: str, data: dict):
         })
         
         # איפוס נתוני משחק
+        stop_pondering(connection)
         connection['player_data']['is_in_game'] = False
         connection['player_data']['game_id'] = None
         connection['game_data'] = None
@@ -313,12 +412,18 @@ async def handle_resign(player_id: str, data: dict):
 async def handle_new_game(player_id: str, data: dict):
     """משחק חדש"""
     ai_level = data.get('ai_level', 5)
-    await start_ai_game(player_id, ai_level)
+    await start_ai_game(player_id, ai_level, data.get('protocol', PROTOCOL_FULL))
 
 async def handle_get_position(player_id: str, data: dict):
     """קבלת מצב הלוח הנוכחי"""
+    engine = get_game_engine(player_id)
+    if not engine:
+        await send_error(player_id, "No active game")
+        return
+    
     try:
-        position_info = chess_engine.get_position_info()
+        # ✅ מצב מלא - גם לקוח delta מתחיל ממנו מחדש
+        position_info = position_message(manager.active_connections[player_id]['game_data'])
         
         await manager.send_message(player_id, {
             'type': 'position_update',
@@ -333,27 +438,72 @@ async def handle_get_position(player_id: str, data: dict):
 async def handle_set_ai_level(player_id: str, data: dict):
     """עדכון רמת AI"""
     ai_level = data.get('level', 5)
-    stockfish_level = max(0, min(20, (ai_level - 1) * 2))
     
-    chess_engine.set_skill_level(stockfish_level)
+    engine = get_game_engine(player_id)
+    if not engine:
+        await send_error(player_id, "No active game")
+        return
+    
+    engine.set_skill_level(ai_level)
     
     # עדכון נתוני המשחק
     connection = manager.active_connections.get(player_id)
-    if connection and connection.get('game_data'):
-        connection['game_data']['ai_level'] = ai_level
-        connection['game_data']['stockfish_level'] = stockfish_level
+    connection['game_data']['ai_level'] = ai_level
     
     await manager.send_message(player_id, {
         'type': 'ai_level_changed',
         'data': {
             'ai_level': ai_level,
-            'elo': chess_engine._skill_to_elo(stockfish_level)
+            'elo': engine._skill_to_elo(engine.skill_level)
         }
     })
 
+async def handle_start_analysis(player_id: str, data: dict):
+    """ניתוח המיקום הנוכחי - עדכוני search_info מוזרמים עד סוף הזמן או stop_analysis"""
+    engine = get_game_engine(player_id)
+    if not engine:
+        await send_error(player_id, "No active game")
+        return
+    if not hasattr(engine, 'astream_analysis'):
+        await send_error(player_id, "Analysis requires Stockfish")
+        return
+    
+    connection = manager.active_connections[player_id]
+    stop_analysis(connection)
+    
+    time_limit = min(float(data.get('time', ANALYSIS_DEFAULT_TIME)), ANALYSIS_MAX_TIME)
+    rate = data.get('rate')  # הודעות בשנייה - None = ברירת המחדל של השרת
+    fen = engine.board.fen()
+    stop_event = threading.Event()
+    
+    async def send_info(info: dict):
+        await manager.send_message(player_id, {
+            'type': 'search_info',
+            'data': {'fen': fen, **info}
+        })
+    
+    async def run():
+        try:
+            await engine.astream_analysis(send_info, time_limit=time_limit, rate=rate, stop_event=stop_event)
+        except Exception as e:
+            log.error("❌ Analysis stream failed", error=str(e))
+            await send_error(player_id, f"Analysis error: {str(e)}")
+        finally:
+            if connection.get('analysis') and connection['analysis'][1] is stop_event:
+                connection['analysis'] = None
+    
+    # ✅ הניתוח רץ ברקע - לולאת הקבלה ממשיכה לקבל הודעות (stop_analysis, מהלכים)
+    connection['analysis'] = (asyncio.create_task(run()), stop_event)
+
+async def handle_stop_analysis(player_id: str, data: dict):
+    """עצירת הניתוח המוזרם - העדכון האחרון נשלח עם final"""
+    connection = manager.active_connections.get(player_id)
+    if connection:
+        stop_analysis(connection)
+
 def handle_disconnect(player_id: str):
     """טיפול בניתוק"""
-    print(f"🔌 Player disconnected: {player_id[:8]}")
+    log.info("🔌 Player disconnected", player_id=player_id[:8])
     manager.disconnect(player_id)
 
 async def send_error(player_id: str, message: str):
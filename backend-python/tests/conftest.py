@@ -0,0 +1,9 @@
+# backend-python/tests/conftest.py - הגדרות משותפות לבדיקות
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# המנועים הגלובליים (ChessEngine / engine_pool) נוצרים ב-import - מהמנוע המדומה
+os.environ.setdefault('STOCKFISH_PATH', os.path.join(BACKEND_DIR, 'tools', 'fake_uci_engine.py'))
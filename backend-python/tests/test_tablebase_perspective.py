@@ -0,0 +1,31 @@
+# backend-python/tests/test_tablebase_perspective.py - סימן הערכת הטבלאות בניתוח משחק
+import asyncio
+
+import chess
+
+from analysis.stockfish_analyzer import StockfishAnalyzer
+from engine.endgame_bitbase import EndgameBitbase
+
+KQK_BLACK_TO_MOVE = "8/8/8/4k3/8/8/3QK3/8 b - - 0 1"
+
+
+class WhiteWinsBitbase(EndgameBitbase):
+    """KQK - לבן מנצח בכל מיקום, probe מחזיר מנקודת המבט של הצד שתורו"""
+
+    def probe(self, board: chess.Board):
+        return (1, 9) if board.turn == chess.WHITE else (-1, 8)
+
+
+def test_tablebase_evaluate_is_from_whites_side():
+    board = chess.Board(KQK_BLACK_TO_MOVE)
+    assert WhiteWinsBitbase().evaluate(board) == 10.0
+
+
+def test_black_to_move_tablebase_eval_uses_movers_sign():
+    analyzer = StockfishAnalyzer(engine_path='unused', tablebase=WhiteWinsBitbase())
+    board = chess.Board(KQK_BLACK_TO_MOVE)
+    search = asyncio.run(analyzer._search(board, 0.01))
+
+    assert search == (10.0, None)
+    assert analyzer._perspective(search, chess.BLACK) == -10.0
+    assert analyzer._perspective(search, chess.WHITE) == 10.0
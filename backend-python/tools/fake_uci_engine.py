@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# backend-python/tools/fake_uci_engine.py - מנוע UCI מזויף לבדיקות עומס והשהיה
+"""
+Fake UCI Engine
+מדבר מספיק UCI בשביל chess.engine (uci / isready / setoption / position / go / stop / ponderhit / quit)
+ובוחר מהלך חוקי באופן דטרמיניסטי (לפי Zobrist hash של העמדה וה-seed) - בלי Stockfish ובלי רעש תזמון.
+
+חיבור לשרת דרך STOCKFISH_PATH (הקובץ executable) או ChessEngine(stockfish_path=...):
+    STOCKFISH_PATH=backend-python/tools/fake_uci_engine.py FAKE_ENGINE_THINK_TIME=0.2 uvicorn main:app
+
+ההגדרות מגיעות ממשתני סביבה (STOCKFISH_PATH לא מעביר ארגומנטים) או מהשורה:
+    FAKE_ENGINE_THINK_TIME  --think-time  זמן קבוע לכל חיפוש סופי (ברירת מחדל: movetime / שעון מה-go)
+    FAKE_ENGINE_JITTER      --jitter      סטייה יחסית אקראית (seeded) של זמן החשיבה, 0.1 = ±10%
+    FAKE_ENGINE_CRASH_RATE  --crash-rate  הסתברות שהתהליך מת באמצע go (EOF כמו segfault)
+    FAKE_ENGINE_HANG_RATE   --hang-rate   הסתברות שחיפוש לא עונה לעולם (גם לא ל-stop)
+    FAKE_ENGINE_MEMORY_MB   --memory-mb   זיכרון שהתהליך מקצה ונוגע בו (RSS אמיתי)
+    FAKE_ENGINE_SEED        --seed        seed לבחירת המהלכים, לקריסות ולסטייה
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+import chess
+import chess.polyglot
+
+INFO_INTERVAL = 0.01  # שורת info כל 10ms
+DEFAULT_MOVETIME = 0.05  # go depth / nodes בלי זמן
+NPS = 1_000_000
+PIECE_VALUES = {chess.PAWN: 100, chess.KNIGHT: 300, chess.BISHOP: 320, chess.ROOK: 500, chess.QUEEN: 900}
+
+OPTIONS = (
+    'option name Skill Level type spin default 20 min 0 max 20',
+    'option name Hash type spin default 16 min 1 max 33554432',
+    'option name Threads type spin default 1 min 1 max 1024',
+    'option name Move Overhead type spin default 10 min 0 max 5000',
+    'option name nodestime type spin default 0 min 0 max 10000',
+    'option name MultiPV type spin default 1 min 1 max 500',
+    'option name Ponder type check default false',
+    'option name UCI_LimitStrength type check default false',
+    'option name UCI_Elo type spin default 1320 min 1320 max 3190',
+)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    env = os.environ.get
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--think-time', type=float, default=float(env('FAKE_ENGINE_THINK_TIME', -1)))
+    parser.add_argument('--jitter', type=float, default=float(env('FAKE_ENGINE_JITTER', 0)))
+    parser.add_argument('--crash-rate', type=float, default=float(env('FAKE_ENGINE_CRASH_RATE', 0)))
+    parser.add_argument('--hang-rate', type=float, default=float(env('FAKE_ENGINE_HANG_RATE', 0)))
+    parser.add_argument('--memory-mb', type=int, default=int(env('FAKE_ENGINE_MEMORY_MB', 0)))
+    parser.add_argument('--seed', type=int, default=int(env('FAKE_ENGINE_SEED', 0)))
+    return parser.parse_args(argv)
+
+
+def evaluate(board: chess.Board) -> int:
+    """חומר בלבד, מנקודת המבט של הצד שתורו - מספיק בשביל ציון שנראה סביר"""
+    score = 0
+    for piece_type, value in PIECE_VALUES.items():
+        score += value * (len(board.pieces(piece_type, chess.WHITE)) - len(board.pieces(piece_type, chess.BLACK)))
+    return score if board.turn == chess.WHITE else -score
+
+
+class FakeEngine:
+    """לולאת הפקודות - החיפוש רץ ב-thread כדי ש-stop יענה מיד"""
+
+    def __init__(self, config: argparse.Namespace):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.board = chess.Board()
+        self.stop_event = threading.Event()
+        self.ponderhit_event = threading.Event()
+        self.searcher = None
+        self._out_lock = threading.Lock()
+        # ✅ זיכרון אמיתי - נוגעים בכל עמוד כדי שייכנס ל-RSS
+        self.ballast = bytearray(config.memory_mb * 2**20)
+        for offset in range(0, len(self.ballast), 4096):
+            self.ballast[offset] = 1
+
+    def emit(self, line: str):
+        with self._out_lock:
+            sys.stdout.write(line + '\n')
+            sys.stdout.flush()
+
+    def choose_move(self, board: chess.Board):
+        moves = sorted(board.legal_moves, key=lambda move: move.uci())
+        if not moves:
+            return None
+        return moves[(chess.polyglot.zobrist_hash(board) ^ self.config.seed) % len(moves)]
+
+    def think_time(self, board: chess.Board, params: dict):
+        """משך החיפוש בשניות, None = עד stop"""
+        if 'infinite' in params:
+            return None
+        if self.config.think_time >= 0:
+            duration = self.config.think_time
+        elif 'movetime' in params:
+            duration = params['movetime'] / 1000
+        elif 'wtime' in params or 'btime' in params:
+            side = 'w' if board.turn == chess.WHITE else 'b'
+            duration = (params.get(f'{side}time', 0) / 30 + params.get(f'{side}inc', 0)) / 1000
+        elif 'nodes' in params:
+            duration = params['nodes'] / NPS
+        else:
+            duration = DEFAULT_MOVETIME
+        if self.config.jitter:
+            duration *= 1 + self.rng.uniform(-self.config.jitter, self.config.jitter)
+        return max(0.0, duration)
+
+    def position(self, parts: list):
+        if 'moves' in parts:
+            index = parts.index('moves')
+            setup, moves = parts[1:index], parts[index + 1:]
+        else:
+            setup, moves = parts[1:], []
+        self.board = chess.Board() if setup[0] == 'startpos' else chess.Board(' '.join(setup[1:]))
+        for uci in moves:
+            self.board.push_uci(uci)
+
+    def go(self, parts: list):
+        params = {}
+        flags = {'infinite', 'ponder'}
+        i = 1
+        while i < len(parts):
+            if parts[i] in flags:
+                params[parts[i]] = True
+                i += 1
+            else:
+                try:
+                    params[parts[i]] = int(parts[i + 1])
+                except (IndexError, ValueError):
+                    params[parts[i]] = 0
+                i += 2
+
+        roll = self.rng.random()
+        crash = roll < self.config.crash_rate
+        hang = not crash and roll < self.config.crash_rate + self.config.hang_rate
+
+        self.stop_event.clear()
+        self.ponderhit_event.clear()
+        self.searcher = threading.Thread(
+            target=self.search, args=(self.board.copy(), params, crash, hang), daemon=True
+        )
+        self.searcher.start()
+
+    def search(self, board: chess.Board, params: dict, crash: bool, hang: bool):
+        duration = self.think_time(board, params)
+        if params.get('ponder'):
+            # go ponder - מחכים ל-ponderhit (ואז זמן החשיבה הרגיל) או ל-stop
+            while not (self.stop_event.is_set() or self.ponderhit_event.wait(INFO_INTERVAL)):
+                pass
+        if hang:
+            threading.Event().wait()
+        if crash:
+            time.sleep((duration or DEFAULT_MOVETIME) / 2)
+            os._exit(1)
+
+        move = self.choose_move(board)
+        reply = None
+        if move:
+            board.push(move)
+            reply = self.choose_move(board)
+            score = -evaluate(board)
+            board.pop()
+
+        start = time.monotonic()
+        max_depth = params.get('depth')
+        depth = 0
+        while move and not self.stop_event.is_set():
+            elapsed = time.monotonic() - start
+            if duration is not None and elapsed >= duration and depth:
+                break
+            if max_depth and depth >= max_depth:
+                break
+            depth += 1
+            pv = move.uci() + (f' {reply.uci()}' if reply else '')
+            self.emit(f'info depth {depth} seldepth {depth + 2} score cp {score} nodes {int(NPS * elapsed) + depth} '
+                      f'nps {NPS} time {int(elapsed * 1000)} pv {pv}')
+            self.stop_event.wait(INFO_INTERVAL)
+
+        if not move:
+            self.emit('bestmove (none)')
+        else:
+            self.emit(f'bestmove {move.uci()}' + (f' ponder {reply.uci()}' if reply else ''))
+
+    def stop(self):
+        self.stop_event.set()
+        if self.searcher:
+            self.searcher.join()
+            self.searcher = None
+
+    def run(self):
+        for line in sys.stdin:
+            parts = line.split()
+            if not parts:
+                continue
+            command = parts[0]
+            if command == 'uci':
+                self.emit('id name FakeUCI')
+                self.emit('id author chess-mentor')
+                for option in OPTIONS:
+                    self.emit(option)
+                self.emit('uciok')
+            elif command == 'isready':
+                self.emit('readyok')
+            elif command == 'ucinewgame':
+                self.board = chess.Board()
+            elif command == 'position':
+                self.position(parts)
+            elif command == 'go':
+                self.go(parts)
+            elif command == 'ponderhit':
+                self.ponderhit_event.set()
+            elif command == 'stop':
+                self.stop()
+            elif command == 'quit':
+                break
+            # setoption ודומיו - מתקבלים בשקט
+
+
+def main(argv=None):
+    FakeEngine(parse_args(argv)).run()
+
+
+if __name__ == "__main__":
+    main()
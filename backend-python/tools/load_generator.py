@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# backend-python/tools/load_generator.py - מחולל עומס של שחקני WebSocket
+"""
+WebSocket Load Generator
+פותח N שחקנים על /ws/game/{player_id} (join -> find_game -> make_move בקצב נתון, משחק חדש בסוף משחק)
+ו-M לקוחות צ'אט מאומתים על /ws/{connection_id} (register -> chat_message בקצב נתון).
+חיבור probe שולח get_status כל 100ms - זמן הסבב שלו הוא ההשהיה של ה-event loop בשרת.
+בסוף: p50 / p95 / p99 של זמני הסבב לכל סוג הודעה, שיעור שגיאות ו-lag.
+
+מול שרת קיים:
+    python tools/load_generator.py --url http://localhost:5001 --players 200 --duration 60
+שרת מקומי עם המנוע המזויף ו-MongoDB בזיכרון (ללא Stockfish / Mongo):
+    python tools/load_generator.py --serve --players 100 --chat-clients 20 --duration 30
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FAKE_ENGINE = os.path.join(BACKEND_DIR, 'tools', 'fake_uci_engine.py')
+PROBE_INTERVAL = 0.1
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class LoadStats:
+    """זמני סבב (שניות) ושגיאות לפי סוג הודעה"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.games_started = 0
+        self.games_finished = 0
+        self.connections = 0
+        self.connect_failures = 0
+        self.client_errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, kind: str, latency: float):
+        self.latencies[kind].append(latency)
+
+    def error(self, kind: str):
+        self.errors[kind] += 1
+
+    def client_error(self, exc: BaseException):
+        self.client_errors[type(exc).__name__] += 1
+
+    def report(self, duration: float) -> Dict[str, object]:
+        kinds = {}
+        for kind in sorted(set(self.latencies) | set(self.errors)):
+            samples = self.latencies.get(kind, [])
+            errors = self.errors.get(kind, 0)
+            total = len(samples) + errors
+            kinds[kind] = {
+                'count': len(samples),
+                'errors': errors,
+                'error_rate': errors / total if total else 0.0,
+                'rate_per_sec': len(samples) / duration if duration else 0.0,
+                'p50_ms': percentile(samples, 0.50) * 1000,
+                'p95_ms': percentile(samples, 0.95) * 1000,
+                'p99_ms': percentile(samples, 0.99) * 1000,
+                'max_ms': max(samples) * 1000 if samples else 0.0
+            }
+        return {
+            'duration': duration,
+            'connections': self.connections,
+            'connect_failures': self.connect_failures,
+            'games_started': self.games_started,
+            'games_finished': self.games_finished,
+            'client_errors': dict(self.client_errors),
+            'messages': kinds
+        }
+
+
+async def receive_until(websocket, types: set, timeout: float, match=None) -> dict:
+    """ההודעה הבאה מהסוגים המבוקשים - error מהשרת נזרק כ-RuntimeError"""
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise asyncio.TimeoutError()
+        message = json.loads(await asyncio.wait_for(websocket.recv(), remaining))
+        if message.get('type') == 'error':
+            raise RuntimeError(message.get('data', {}).get('message'))
+        if message.get('type') in types and (match is None or match(message)):
+            return message
+
+
+async def request(websocket, stats: LoadStats, kind: str, payload: dict, types: set,
+                  timeout: float, match=None) -> Optional[dict]:
+    start_time = time.monotonic()
+    try:
+        await websocket.send(json.dumps(payload))
+        message = await receive_until(websocket, types, timeout, match)
+    except (asyncio.TimeoutError, RuntimeError):
+        stats.error(kind)
+        return None
+    stats.record(kind, time.monotonic() - start_time)
+    return message
+
+
+async def run_player(args, ws_url: str, index: int, stats: LoadStats, stop: asyncio.Event):
+    """שחקן אחד: join, find_game, ואז make_move בקצב move_rate עד הסוף"""
+    import websockets
+
+    rng = random.Random(args.seed * 100_003 + index)
+    player_id = f"load-{index:05d}-{uuid.uuid4().hex[:8]}"
+    connected = False
+    try:
+        async with websockets.connect(f"{ws_url}/ws/game/{player_id}", max_size=None) as websocket:
+            connected = True
+            stats.connections += 1
+            await play_games(args, websocket, player_id, rng, stats, stop)
+    except Exception:
+        if connected:
+            raise
+        stats.connect_failures += 1
+
+
+async def play_games(args, websocket, player_id: str, rng: random.Random, stats: LoadStats, stop: asyncio.Event):
+    """join, find_game, ואז make_move בקצב move_rate עד הסוף"""
+    if not await request(websocket, stats, 'join', {'action': 'join', 'data': {'name': player_id}},
+                         {'connected'}, args.timeout):
+        return
+
+    legal_moves = []
+    while not stop.is_set():
+        if not legal_moves:
+            message = await request(websocket, stats, 'find_game',
+                                    {'action': 'find_game', 'data': {'mode': 'ai', 'ai_level': args.ai_level}},
+                                    {'game_start'}, args.timeout)
+            if not message:
+                await asyncio.sleep(1.0)
+                continue
+            stats.games_started += 1
+            legal_moves = message['data']['position'].get('legal_moves', [])
+
+        # זמן "חשיבה" של השחקן
+        try:
+            await asyncio.wait_for(stop.wait(), rng.expovariate(args.move_rate))
+            break
+        except asyncio.TimeoutError:
+            pass
+
+        move = rng.choice(legal_moves)
+        ack = await request(websocket, stats, 'move_ack',
+                            {'action': 'make_move', 'data': {'move': move}}, {'move_made'}, args.timeout)
+        if not ack:
+            legal_moves = []
+            continue
+        if ack['data']['position'].get('is_game_over'):
+            stats.games_finished += 1
+            legal_moves = []
+            continue
+
+        start_time = time.monotonic()
+        try:
+            reply = await receive_until(websocket, {'move_made'}, args.timeout)
+        except (asyncio.TimeoutError, RuntimeError):
+            stats.error('ai_move')
+            legal_moves = []
+            continue
+        stats.record('ai_move', time.monotonic() - start_time)
+        position = reply['data']['position']
+        legal_moves = [] if position.get('is_game_over') else position.get('legal_moves', [])
+        if not legal_moves:
+            stats.games_finished += 1
+
+
+def register_user(base_url: str, index: int, seed: int) -> Optional[str]:
+    """משתמש חדש דרך /auth/register - access token או None"""
+    body = json.dumps({'username': f"load{seed}_{index}_{uuid.uuid4().hex[:6]}", 'password': 'load-test-pass'})
+    http_request = urllib.request.Request(f"{base_url}/auth/register", data=body.encode(),
+                                          headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(http_request, timeout=10) as response:
+            return json.loads(response.read()).get('access_token')
+    except Exception:
+        return None
+
+
+async def run_chat_client(args, base_url: str, ws_url: str, index: int, stats: LoadStats, stop: asyncio.Event):
+    """לקוח צ'אט: נרשם, מתחבר עם token ושולח הודעה בקצב chat_rate - הסבב נמדד עד שהשידור חוזר אליו"""
+    import websockets
+
+    rng = random.Random(args.seed * 7_919 + index)
+    token = await asyncio.to_thread(register_user, base_url, index, args.seed)
+    if not token:
+        stats.error('register')
+        return
+
+    connected = False
+    try:
+        async with websockets.connect(f"{ws_url}/ws/chat-{index}-{uuid.uuid4().hex[:8]}?token={token}",
+                                      max_size=None) as websocket:
+            connected = True
+            stats.connections += 1
+            await chat(args, websocket, rng, stats, stop)
+    except Exception:
+        if connected:
+            raise
+        stats.connect_failures += 1
+
+
+async def chat(args, websocket, rng: random.Random, stats: LoadStats, stop: asyncio.Event):
+    """ממתין ל-connected ושולח הודעה בקצב chat_rate"""
+    try:
+        await receive_until(websocket, {'connected'}, args.timeout)
+    except (asyncio.TimeoutError, RuntimeError):
+        stats.error('chat_connect')
+        return
+
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), rng.expovariate(args.chat_rate))
+            break
+        except asyncio.TimeoutError:
+            pass
+        nonce = uuid.uuid4().hex
+        await request(websocket, stats, 'chat_message',
+                      {'type': 'chat_message', 'data': {'content': nonce, 'room': 'general'}},
+                      {'chat_message'}, args.timeout,
+                      match=lambda message: message['data'].get('content') == nonce)
+
+
+async def run_probe(args, ws_url: str, stats: LoadStats, stop: asyncio.Event):
+    """get_status כל 100ms על חיבור שכמעט לא עושה עבודה - הסבב שלו ≈ lag של ה-event loop"""
+    import websockets
+
+    connected = False
+    try:
+        async with websockets.connect(f"{ws_url}/ws/probe-{uuid.uuid4().hex[:8]}") as websocket:
+            connected = True
+            await probe(args, websocket, stats, stop)
+    except Exception:
+        if connected:
+            raise
+        stats.connect_failures += 1
+
+
+async def probe(args, websocket, stats: LoadStats, stop: asyncio.Event):
+    """get_status כל PROBE_INTERVAL עד העצירה"""
+    try:
+        await receive_until(websocket, {'connected'}, args.timeout)
+    except (asyncio.TimeoutError, RuntimeError):
+        return
+    while not stop.is_set():
+        await request(websocket, stats, 'loop_lag_probe', {'type': 'get_status'}, {'status'}, args.timeout)
+        try:
+            await asyncio.wait_for(stop.wait(), PROBE_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def guarded(client, stats: LoadStats):
+    """לקוח שנפל בחריגה נספר ב-client_errors - שלא ייראה כמו לקוח שפשוט לא עשה כלום"""
+    try:
+        await client
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        stats.client_error(e)
+
+
+async def run_load(args, base_url: str) -> Dict[str, object]:
+    ws_url = base_url.replace('http://', 'ws://').replace('https://', 'wss://')
+    stats = LoadStats()
+    stop = asyncio.Event()
+    tasks = [asyncio.create_task(guarded(run_probe(args, ws_url, stats, stop), stats))]
+
+    # ✅ ramp-up הדרגתי - לא פותחים את כל החיבורים באותו רגע
+    clients = [('player', i) for i in range(args.players)] + [('chat', i) for i in range(args.chat_clients)]
+    spacing = args.ramp_up / len(clients) if clients else 0
+    start_time = time.monotonic()
+    for kind, index in clients:
+        if kind == 'player':
+            tasks.append(asyncio.create_task(guarded(run_player(args, ws_url, index, stats, stop), stats)))
+        else:
+            tasks.append(asyncio.create_task(
+                guarded(run_chat_client(args, base_url, ws_url, index, stats, stop), stats)))
+        if spacing:
+            await asyncio.sleep(spacing)
+
+    await asyncio.sleep(max(0.0, args.duration - (time.monotonic() - start_time)))
+    stop.set()
+    await asyncio.wait(tasks, timeout=args.timeout + 5)
+    for task in tasks:
+        task.cancel()
+    return stats.report(time.monotonic() - start_time)
+
+
+def print_report(report: Dict[str, object]):
+    print(f"\n📊 {report['duration']:.1f}s, {report['connections']} connections "
+          f"({report['connect_failures']} failed), games started {report['games_started']}, "
+          f"finished {report['games_finished']}")
+    if report['client_errors']:
+        errors = ', '.join(f"{name} x{count}" for name, count in report['client_errors'].items())
+        print(f"   ⚠️ clients failed with exceptions: {errors}")
+    print(f"   {'message':16} {'count':>7} {'err%':>6} {'rate/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for kind, row in report['messages'].items():
+        print(f"   {kind:16} {row['count']:7d} {row['error_rate'] * 100:6.1f} {row['rate_per_sec']:8.1f} "
+              f"{row['p50_ms']:8.1f} {row['p95_ms']:8.1f} {row['p99_ms']:8.1f} {row['max_ms']:8.1f}")
+
+
+def serve(args):
+    """השרת עצמו (תהליך בן של --serve) - MongoDB בזיכרון ו-main:app"""
+    sys.path.insert(0, BACKEND_DIR)
+    os.chdir(BACKEND_DIR)
+    if args.mongo == 'memory':
+        from tools.memory_mongo import install
+        install()
+    import uvicorn
+    uvicorn.run("main:app", host="127.0.0.1", port=args.port, log_level="warning")
+
+
+def start_server(args) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.setdefault('STOCKFISH_PATH', FAKE_ENGINE)
+    env.setdefault('FAKE_ENGINE_THINK_TIME', str(args.engine_think_time))
+    env.setdefault('FAKE_ENGINE_SEED', str(args.seed))
+    command = [sys.executable, os.path.abspath(__file__), '--run-server', '--port', str(args.port), '--mongo', args.mongo]
+    output = None if args.server_output else subprocess.DEVNULL
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=output, stderr=output)
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited with code {server.returncode}")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{args.port}/health", timeout=1).read()
+            print(f"🚀 Server ready on port {args.port} (engine: {env['STOCKFISH_PATH']}, mongo: {args.mongo})")
+            return server
+        except Exception:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("server did not become ready within 30s")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:5001', help='server base URL')
+    parser.add_argument('--players', type=int, default=50, help='game clients on /ws/game/{player_id}')
+    parser.add_argument('--chat-clients', type=int, default=0, help='authenticated chat clients on /ws/{id}')
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds of load after ramp-up starts')
+    parser.add_argument('--ramp-up', type=float, default=5.0, help='seconds over which clients connect')
+    parser.add_argument('--move-rate', type=float, default=0.5, help='moves per second per player')
+    parser.add_argument('--chat-rate', type=float, default=0.2, help='chat messages per second per client')
+    parser.add_argument('--ai-level', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=30.0, help='per-message timeout')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help='write the report to this file')
+    parser.add_argument('--serve', action='store_true', help='start a local server with the fake engine')
+    parser.add_argument('--port', type=int, default=8765, help='port for --serve')
+    parser.add_argument('--mongo', choices=('memory', 'env'), default='memory',
+                        help="--serve database: in-memory stand-in or MONGO_URI / MONGODB_URL")
+    parser.add_argument('--engine-think-time', type=float, default=0.05, help='fake engine think time for --serve')
+    parser.add_argument('--server-output', action='store_true', help='show the --serve server output')
+    parser.add_argument('--run-server', action='store_true', help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.run_server:
+        serve(args)
+        return
+
+    server = start_server(args) if args.serve else None
+    base_url = f"http://127.0.0.1:{args.port}" if server else args.url.rstrip('/')
+    try:
+        report = asyncio.run(run_load(args, base_url))
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=10)
+
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# backend-python/tools/memory_mongo.py - MongoDB בזיכרון לבדיקות עומס
+"""
+In-memory MongoDB stand-in
+מחליף את AsyncIOMotorClient של motor בגרסה בזיכרון שתומכת רק במה שהשרת משתמש בו
+(find_one / find + sort + limit / insert_one / update_one / replace_one / delete_one /
+count_documents / create_index עם unique). install() חייב לרוץ לפני import של main
+"""
+
+import copy
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+
+def _matches(document: Dict[str, Any], query: Optional[Dict[str, Any]]) -> bool:
+    """שוויון פשוט לכל שדה - אין צורך באופרטורים בשאילתות של השרת"""
+    return all(document.get(key) == value for key, value in (query or {}).items())
+
+
+def _project(document: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    document = copy.deepcopy(document)
+    for key, include in (projection or {}).items():
+        if not include:
+            document.pop(key, None)
+    return document
+
+
+class MemoryCursor:
+    def __init__(self, documents: List[Dict[str, Any]]):
+        self._documents = documents
+
+    def sort(self, key: str, direction: int = 1) -> 'MemoryCursor':
+        self._documents.sort(key=lambda document: document.get(key) or 0, reverse=direction < 0)
+        return self
+
+    def limit(self, count: int) -> 'MemoryCursor':
+        if count:
+            self._documents = self._documents[:count]
+        return self
+
+    def __aiter__(self):
+        self._iterator = iter(self._documents)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def to_list(self, length: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self._documents[:length] if length else list(self._documents)
+
+
+class MemoryCollection:
+    def __init__(self, name: str):
+        self.name = name
+        self._documents: List[Dict[str, Any]] = []
+        self._unique: List[tuple] = []  # (field, sparse)
+
+    def _check_unique(self, document: Dict[str, Any], ignore: Optional[Dict[str, Any]] = None):
+        for field, sparse in self._unique:
+            value = document.get(field)
+            if value is None and sparse:
+                continue
+            for existing in self._documents:
+                if existing is not ignore and existing.get(field) == value:
+                    raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: {field}")
+
+    async def create_index(self, keys, unique: bool = False, sparse: bool = False, **kwargs) -> str:
+        field = keys if isinstance(keys, str) else keys[0][0]
+        if unique:
+            self._unique.append((field, sparse))
+        return f"{field}_1"
+
+    async def find_one(self, query: Optional[Dict[str, Any]] = None,
+                       projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        for document in self._documents:
+            if _matches(document, query):
+                return _project(document, projection)
+        return None
+
+    def find(self, query: Optional[Dict[str, Any]] = None,
+             projection: Optional[Dict[str, Any]] = None) -> MemoryCursor:
+        return MemoryCursor([_project(d, projection) for d in self._documents if _matches(d, query)])
+
+    async def insert_one(self, document: Dict[str, Any]):
+        document.setdefault('_id', ObjectId())
+        self._check_unique(document)
+        self._documents.append(copy.deepcopy(document))
+        return SimpleNamespace(inserted_id=document['_id'], acknowledged=True)
+
+    async def update_one(self, query: Dict[str, Any], update: Dict[str, Any], upsert: bool = False):
+        for document in self._documents:
+            if _matches(document, query):
+                document.update(copy.deepcopy(update.get('$set', {})))
+                for key, amount in update.get('$inc', {}).items():
+                    document[key] = document.get(key, 0) + amount
+                return SimpleNamespace(matched_count=1, modified_count=1, upserted_id=None)
+        if upsert:
+            result = await self.insert_one({**query, **update.get('$set', {})})
+            return SimpleNamespace(matched_count=0, modified_count=0, upserted_id=result.inserted_id)
+        return SimpleNamespace(matched_count=0, modified_count=0, upserted_id=None)
+
+    async def replace_one(self, query: Dict[str, Any], replacement: Dict[str, Any], upsert: bool = False):
+        for index, document in enumerate(self._documents):
+            if _matches(document, query):
+                self._check_unique(replacement, ignore=document)
+                self._documents[index] = {'_id': document['_id'], **copy.deepcopy(replacement)}
+                return SimpleNamespace(matched_count=1, modified_count=1, upserted_id=None)
+        if upsert:
+            result = await self.insert_one(dict(replacement))
+            return SimpleNamespace(matched_count=0, modified_count=0, upserted_id=result.inserted_id)
+        return SimpleNamespace(matched_count=0, modified_count=0, upserted_id=None)
+
+    async def delete_one(self, query: Dict[str, Any]):
+        for index, document in enumerate(self._documents):
+            if _matches(document, query):
+                del self._documents[index]
+                return SimpleNamespace(deleted_count=1)
+        return SimpleNamespace(deleted_count=0)
+
+    async def count_documents(self, query: Optional[Dict[str, Any]] = None) -> int:
+        return sum(1 for document in self._documents if _matches(document, query))
+
+
+class MemoryDatabase:
+    def __init__(self, name: str):
+        self.name = name
+        self._collections: Dict[str, MemoryCollection] = {}
+
+    def __getattr__(self, name: str) -> MemoryCollection:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        if name not in self._collections:
+            self._collections[name] = MemoryCollection(name)
+        return self._collections[name]
+
+    async def command(self, name: str, *args, **kwargs) -> Dict[str, Any]:
+        return {'ok': 1.0, 'ismaster': True}
+
+
+class MemoryMotorClient:
+    """AsyncIOMotorClient בזיכרון - כל ה-clients בתהליך חולקים את אותם נתונים"""
+
+    _databases: Dict[str, MemoryDatabase] = {}
+
+    def __init__(self, *args, **kwargs):
+        self.admin = self['admin']
+
+    def __getattr__(self, name: str) -> MemoryDatabase:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, name: str) -> MemoryDatabase:
+        if name not in self._databases:
+            self._databases[name] = MemoryDatabase(name)
+        return self._databases[name]
+
+    def close(self):
+        pass
+
+
+def install():
+    """החלפת motor בגרסה בזיכרון - לפני import של main / auth_service / database"""
+    import motor.motor_asyncio
+    motor.motor_asyncio.AsyncIOMotorClient = MemoryMotorClient
+    print("🧪 Using in-memory MongoDB stand-in")
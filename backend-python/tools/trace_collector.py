@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# backend-python/tools/trace_collector.py - collector מקומי ל-traces
+"""
+Local trace collector
+מקבל OTLP/HTTP JSON ב-POST /v1/traces (כמו OpenTelemetry Collector), שומר כל batch כשורה בקובץ
+ומדפיס שורה לכל בקשה: span השורש, משך ופירוט השלבים. הרצה:
+    python tools/trace_collector.py --port 4318 --output traces.jsonl
+    TRACE_EXPORT=http://localhost:4318/v1/traces uvicorn main:app
+"""
+
+import argparse
+import json
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def summarize(payload: dict) -> list:
+    """שורה לכל trace - שורש ומשך כל ילד ב-ms"""
+    spans = [
+        span
+        for resource in payload.get('resourceSpans', [])
+        for scope in resource.get('scopeSpans', [])
+        for span in scope.get('spans', [])
+    ]
+    traces = defaultdict(list)
+    for span in spans:
+        traces[span['traceId']].append(span)
+
+    lines = []
+    for trace_spans in traces.values():
+        root = next((span for span in trace_spans if 'parentSpanId' not in span), trace_spans[0])
+        duration = lambda span: (int(span['endTimeUnixNano']) - int(span['startTimeUnixNano'])) / 1e6
+        children = ', '.join(f"{span['name']}={duration(span):.1f}ms" for span in trace_spans if span is not root)
+        lines.append(f"{root['name']:40} {duration(root):8.1f}ms  {children}")
+    return lines
+
+
+def make_handler(output, quiet: bool):
+    class CollectorHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != '/v1/traces':
+                self.send_error(404)
+                return
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            try:
+                payload = json.loads(body)
+            except json.JSONDecodeError:
+                self.send_error(400, 'invalid JSON')
+                return
+
+            if output:
+                output.write(body.decode('utf-8') + '\n')
+                output.flush()
+            if not quiet:
+                for line in summarize(payload):
+                    print(line)
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(b'{}')
+
+        def log_message(self, format, *args):
+            pass
+
+    return CollectorHandler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=4318)
+    parser.add_argument('--output', help='append every batch to this JSON-lines file')
+    parser.add_argument('--quiet', action='store_true', help='do not print trace summaries')
+    args = parser.parse_args(argv)
+
+    output = open(args.output, 'a') if args.output else None
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), make_handler(output, args.quiet))
+    print(f"📡 Trace collector on http://127.0.0.1:{args.port}/v1/traces")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if output:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
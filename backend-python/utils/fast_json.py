@@ -0,0 +1,72 @@
+# backend-python/utils/fast_json.py - סריאליזציית JSON מהירה לתגובות HTTP ול-WebSocket
+"""
+Fast JSON encoding
+encoder אחד לכל השרת: orjson כשמותקן, אחרת json של הספרייה הסטנדרטית (ניתן לבחור ב-JSON_ENCODER).
+FastJSONResponse מחליף את JSONResponse, ו-encode_message מאפשר לקודד הודעת שידור פעם אחת
+ולשלוח את אותו טקסט לכל החיבורים
+"""
+
+import json
+import os
+from typing import Any, Callable, Dict
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _stdlib_dumps(content: Any) -> bytes:
+    # אותן הגדרות כמו JSONResponse / WebSocket.send_json של Starlette
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def _orjson_dumps(content: Any) -> bytes:
+    try:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        # ✅ טיפוס ש-orjson לא מכיר (למשל int מעל 64 ביט) - הנתיב הרגיל
+        return _stdlib_dumps(content)
+
+
+ENCODERS: Dict[str, Callable[[Any], bytes]] = {'json': _stdlib_dumps}
+if orjson is not None:
+    ENCODERS['orjson'] = _orjson_dumps
+
+_encoder_name = os.getenv('JSON_ENCODER', 'orjson' if orjson is not None else 'json')
+if _encoder_name not in ENCODERS:
+    print(f"⚠️ JSON encoder '{_encoder_name}' unavailable, using json")
+    _encoder_name = 'json'
+_dumps = ENCODERS[_encoder_name]
+
+
+def set_encoder(name: str, dumps: Callable[[Any], bytes] = None):
+    """החלפת ה-encoder (או רישום חדש) - לבדיקות ול-benchmark"""
+    global _encoder_name, _dumps
+    if dumps is not None:
+        ENCODERS[name] = dumps
+    _encoder_name = name
+    _dumps = ENCODERS[name]
+
+
+def get_encoder_name() -> str:
+    return _encoder_name
+
+
+def dumps(content: Any) -> bytes:
+    """JSON כ-UTF-8"""
+    return _dumps(content)
+
+
+def encode_message(message: Any) -> str:
+    """הודעת WebSocket מקודדת פעם אחת - נשלחת כ-text frame לכל הנמענים"""
+    return _dumps(message).decode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse עם ה-encoder המהיר"""
+
+    def render(self, content: Any) -> bytes:
+        return _dumps(content)
@@ -0,0 +1,161 @@
+# backend-python/utils/log.py - לוגים מובנים בלי I/O על לולאת האירועים
+"""
+Structured Async Logger
+log.info(msg, **fields) רק מוסיף רשומה לתור (deque - בלי lock ובלי פורמט); thread רקע מפרמט
+וכותב ל-stdout ב-batches. מתאים לנתיבים חמים במקום print:
+    LOG_LEVEL=info              debug / info / warning / error
+    LOG_FORMAT=text             text (הודעה + key=value) או json (שורת JSON לרשומה, עם trace_id)
+    LOG_SAMPLE_RATE=0.01        חלק הלוגים שנכתבים מקריאות עם sample=True (לוג לכל הודעה / מהלך)
+כשהתור מלא (LOG_QUEUE_SIZE) רשומות נזרקות ונספרות במקום לחסום
+"""
+
+import atexit
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+from utils.fast_json import dumps
+from utils.tracing import current_span
+
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+LEVELS = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'error': ERROR}
+LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+
+LOG_LEVEL = LEVELS.get(os.getenv('LOG_LEVEL', 'info').lower(), INFO)
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')
+LOG_SAMPLE_RATE = float(os.getenv('LOG_SAMPLE_RATE', 0.01))
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+LOG_FLUSH_INTERVAL = float(os.getenv('LOG_FLUSH_INTERVAL', 0.05))
+
+
+_random = random.random
+
+
+def _level_method(level: int):
+    """log.info / log.debug ... - הסינון לפי רמה ו-sampling לפני כל עבודה אחרת, בלי לארוז את השדות מחדש"""
+    def method(self, msg: str, sample: bool = False, **fields):
+        if level < self.level:
+            return
+        if sample and _random() >= self.sample_rate:
+            self.sampled_out += 1
+            return
+        self._enqueue(level, msg, fields)
+    method.__name__ = LEVEL_NAMES[level]
+    return method
+
+
+class StructuredLogger:
+    """רשומה = (זמן, רמה, הודעה, שדות) - הפורמט והכתיבה קורים ב-thread הכותב"""
+
+    def __init__(self, level: int = LOG_LEVEL, fmt: str = LOG_FORMAT, sample_rate: float = LOG_SAMPLE_RATE,
+                 stream=None, queue_size: int = LOG_QUEUE_SIZE, flush_interval: float = LOG_FLUSH_INTERVAL):
+        self.level = level
+        self.format = fmt
+        self.sample_rate = sample_rate
+        self.stream = stream  # None - sys.stdout בזמן הכתיבה
+        self.queue_size = queue_size
+        self.flush_interval = flush_interval
+        self._records: deque = deque()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self.written = 0
+        self.dropped = 0
+        self._unreported_drops = 0
+        self.sampled_out = 0
+
+    def log(self, level: int, msg: str, sample: bool = False, **fields):
+        if level < self.level:
+            return
+        if sample and _random() >= self.sample_rate:
+            self.sampled_out += 1
+            return
+        self._enqueue(level, msg, fields)
+
+    def _enqueue(self, level: int, msg: str, fields: dict):
+        if len(self._records) >= self.queue_size:
+            self.dropped += 1
+            self._unreported_drops += 1
+            return
+        active = current_span()
+        if active is not None:
+            fields['trace_id'] = f'{active.trace.trace_id:032x}'
+        self._records.append((time.time(), level, msg, fields))
+        if self._thread is None:
+            self._start()
+
+    debug = _level_method(DEBUG)
+    info = _level_method(INFO)
+    warning = _level_method(WARNING)
+    error = _level_method(ERROR)
+
+    def _start(self):
+        with self._write_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def _render(self, record) -> str:
+        timestamp, level, msg, fields = record
+        if self.format == 'json':
+            entry = {
+                'ts': datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec='milliseconds'),
+                'level': LEVEL_NAMES[level],
+                'msg': msg,
+                **fields
+            }
+            return dumps(entry).decode('utf-8')
+        if not fields:
+            return msg
+        return msg + ' ' + ' '.join(f'{key}={value}' for key, value in fields.items())
+
+    def flush(self):
+        """כתיבת כל מה שבתור - נקרא מה-thread הכותב, ב-shutdown וב-atexit"""
+        with self._write_lock:
+            lines = []
+            while self._records:
+                try:
+                    record = self._records.popleft()
+                except IndexError:
+                    break
+                try:
+                    lines.append(self._render(record))
+                except Exception as e:
+                    lines.append(f"⚠️ Log record failed to render: {e} ({record[2]})")
+            dropped, self._unreported_drops = self._unreported_drops, 0
+            if dropped:
+                lines.append(f"⚠️ Log queue full - dropped {dropped} records")
+            if not lines:
+                return
+            stream = self.stream or sys.stdout
+            try:
+                stream.write('\n'.join(lines) + '\n')
+                stream.flush()
+            except Exception:
+                pass
+            self.written += len(lines)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'level': LEVEL_NAMES.get(self.level, self.level),
+            'format': self.format,
+            'sample_rate': self.sample_rate,
+            'written': self.written,
+            'dropped': self.dropped,
+            'sampled_out': self.sampled_out,
+            'queued': len(self._records)
+        }
+
+
+# Instance גלובלי - לוגר אחד לתהליך
+log = StructuredLogger()
+atexit.register(log.flush)
@@ -0,0 +1,127 @@
+# backend-python/utils/loop_monitor.py - מדידת lag של לולאת האירועים
+"""
+Event Loop Lag Monitor
+task שישן interval ומודד באיחור כמה הלולאה התעוררה מאוחר - ל-histogram event_loop_lag_seconds.
+במקביל thread watchdog בודק את ה-heartbeat של ה-task: כשהלולאה תקועה מעבר ל-threshold הוא לוקח את
+ה-stack של thread הלולאה *בזמן התקיעה* (SimpleEngine.play, bcrypt.checkpw, ...). כשהלולאה משתחררת
+נרשם ה-stall עם משך התקיעה ב-ring buffer חסום, שנקרא מ-/admin/loop-stalls
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from utils.log import log
+from utils.metrics import metrics
+from utils.profiler import frame_stack
+
+LOOP_MONITOR_INTERVAL = float(os.getenv('LOOP_MONITOR_INTERVAL', 0.1))
+LOOP_STALL_THRESHOLD = float(os.getenv('LOOP_STALL_THRESHOLD', 0.1))
+LOOP_STALL_BUFFER = int(os.getenv('LOOP_STALL_BUFFER', 50))
+
+event_loop_lag_seconds = metrics.histogram(
+    'event_loop_lag_seconds', 'Event loop scheduling lag',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+event_loop_stalls = metrics.counter('event_loop_stalls_total', 'Event loop stalls over the threshold')
+
+
+class LoopMonitor:
+    """מדידת lag רציפה + stack של כל תקיעה מעל ה-threshold"""
+
+    def __init__(self, interval: float = LOOP_MONITOR_INTERVAL, threshold: float = LOOP_STALL_THRESHOLD,
+                 buffer_size: int = LOOP_STALL_BUFFER):
+        self.interval = interval
+        self.threshold = threshold
+        self.stalls: deque = deque(maxlen=buffer_size)
+        self.max_lag = 0.0
+        self.total_stalls = 0
+        self._lock = threading.Lock()
+        self._beat = time.perf_counter()
+        self._pending: Optional[Dict[str, Any]] = None  # stall שנתפס וממתין למשך שלו
+        self._loop_thread_id = None
+        self._task = None
+        self._watchdog = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """נקרא מתוך הלולאה (startup)"""
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.perf_counter()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._measure())
+        self._watchdog = threading.Thread(target=self._watch, name='loop-watchdog', daemon=True)
+        self._watchdog.start()
+        log.info("⏱️ Loop monitor started", threshold_ms=round(self.threshold * 1000))
+
+    def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _measure(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag = max(0.0, now - expected)
+            event_loop_lag_seconds.observe(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+            with self._lock:
+                self._beat = now
+                stall, self._pending = self._pending, None
+            if stall is not None:
+                stall['lag'] = round(lag, 4)
+                self.stalls.append(stall)
+                self.total_stalls += 1
+                event_loop_stalls.inc()
+                log.warning("🐌 Event loop blocked", lag_ms=round(lag * 1000),
+                            at=stall['stack'][-1] if stall['stack'] else '?')
+
+    def _watch(self):
+        # בדיקה פעמיים בכל threshold - התקיעה נתפסת לכל המאוחר חצי threshold אחרי שחצתה אותו
+        check_every = max(self.threshold / 2, 0.01)
+        while not self._stop.wait(check_every):
+            with self._lock:
+                blocked_for = time.perf_counter() - self._beat - self.interval
+                if blocked_for < self.threshold or self._pending is not None:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread_id)
+                self._pending = {
+                    'detected_at': datetime.utcnow().isoformat(),
+                    'blocked_at_capture': round(blocked_for, 4),
+                    'stack': frame_stack(frame) if frame is not None else []
+                }
+                del frame
+
+    def recent_stalls(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """החדשים קודם"""
+        stalls = list(self.stalls)[::-1]
+        return stalls[:limit] if limit else stalls
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'running': self.running,
+            'interval': self.interval,
+            'threshold': self.threshold,
+            'max_lag': round(self.max_lag, 4),
+            'total_stalls': self.total_stalls,
+            'buffered_stalls': len(self.stalls)
+        }
+
+
+# Instance גלובלי - מוניטור אחד ללולאה הראשית
+loop_monitor = LoopMonitor()
@@ -0,0 +1,142 @@
+# backend-python/utils/profiler.py - sampling profiler לתהליך חי
+"""
+Sampling Profiler
+thread רקע שדוגם את ה-stacks של כל ה-threads (sys._current_frames) כל interval, בלי hooks על
+קריאות ובלי לעצור את התהליך - העלות היא דגימה אחת כל 10ms, אז אפשר להריץ על שרת בפרודקשן.
+התוצאה היא collapsed stacks ("thread;frame;frame N") - הקלט של flamegraph.pl ו-speedscope.
+קריאות חוסמות בלולאת האירועים (SimpleEngine.play, bcrypt, print) נראות כ-stacks של MainThread
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from utils.log import log
+
+PROFILER_INTERVAL = float(os.getenv('PROFILER_INTERVAL', 0.01))
+PROFILER_MAX_SECONDS = float(os.getenv('PROFILER_MAX_SECONDS', 60))
+MIN_INTERVAL = 0.001
+
+
+class ProfilerBusyError(Exception):
+    """פרופיל אחר כבר רץ"""
+
+
+def _frame_label(frame) -> str:
+    """שם הפונקציה והשורה שרצה כרגע - כך קריאת C חוסמת (bcrypt.checkpw) מצביעה על השורה שקראה לה"""
+    code = frame.f_code
+    name = getattr(code, 'co_qualname', code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})".replace(';', ':')
+
+
+def frame_stack(frame) -> List[str]:
+    """ה-stack מהחיצוני לפנימי (כמו ב-traceback)"""
+    frames = []
+    while frame is not None:
+        frames.append(_frame_label(frame))
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+
+class StackSampler:
+    """דגימת stacks לחלון זמן אחד"""
+
+    def __init__(self, interval: float = PROFILER_INTERVAL, thread_ids: Optional[set] = None):
+        self.interval = max(interval, MIN_INTERVAL)
+        self.thread_ids = thread_ids  # None - כל ה-threads
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.sampling_time = 0.0
+        self.started_at = None
+        self.stopped_at = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.stopped_at = time.perf_counter()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            sample_start = time.perf_counter()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                    continue
+                thread_name = names.get(thread_id, f'thread-{thread_id}')
+                self.stacks[';'.join([thread_name] + frame_stack(frame))] += 1
+            self.samples += 1
+            self.sampling_time += time.perf_counter() - sample_start
+
+    def collapsed(self) -> str:
+        """שורה לכל stack - הכי נפוצים קודם"""
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+    def get_stats(self) -> Dict[str, Any]:
+        duration = (self.stopped_at or time.perf_counter()) - (self.started_at or time.perf_counter())
+        return {
+            'duration': round(duration, 3),
+            'interval': self.interval,
+            'samples': self.samples,
+            'unique_stacks': len(self.stacks),
+            # זמן הדגימה מתוך זמן הקיר - חלק ה-CPU שהפרופיילר לקח (תחת ה-GIL)
+            'overhead': round(self.sampling_time / duration, 4) if duration else 0.0
+        }
+
+
+class Profiler:
+    """פרופיל אחד בכל רגע - בקשה שנייה בזמן ריצה מקבלת ProfilerBusyError"""
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self.runs = 0
+        self.last_run = None
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    async def profile(self, seconds: float, interval: float = PROFILER_INTERVAL,
+                      loop_only: bool = False) -> StackSampler:
+        """דגימה למשך seconds בלי לחסום את הלולאה; loop_only - רק ה-thread של לולאת האירועים"""
+        if self.busy:
+            raise ProfilerBusyError("A profile is already running")
+        seconds = min(max(seconds, 0.1), PROFILER_MAX_SECONDS)
+
+        async with self._lock:
+            sampler = StackSampler(interval, {threading.get_ident()} if loop_only else None)
+            sampler.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                sampler.stop()
+            self.runs += 1
+            self.last_run = sampler.get_stats()
+            log.info("🔬 Profile done", samples=sampler.samples, seconds=seconds,
+                     stacks=len(sampler.stacks), overhead=round(self.last_run['overhead'], 4))
+            return sampler
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'busy': self.busy,
+            'runs': self.runs,
+            'last_run': self.last_run,
+            'max_seconds': PROFILER_MAX_SECONDS
+        }
+
+
+# Instance גלובלי - פרופיילר אחד לתהליך
+profiler = Profiler()
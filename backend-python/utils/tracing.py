@@ -0,0 +1,259 @@
+# backend-python/utils/tracing.py - spans לכל בקשה ו-Server-Timing
+"""
+Lightweight Tracing
+span(name) יוצר span בן של ה-span הנוכחי (contextvars - עובד גם ב-async וגם ב-thread שקיבל את ה-context).
+span בלי הורה פותח trace חדש. כל trace שנגמר נשלח ל-exporter בפורמט OTLP/JSON של OpenTelemetry:
+    TRACE_EXPORT=file:/var/log/chess-traces.jsonl        שורת JSON לכל batch
+    TRACE_EXPORT=http://localhost:4318/v1/traces          collector (או tools/trace_collector.py)
+    TRACE_SAMPLE_RATE=0.1                                 חלק מה-traces שנשלחים (ברירת מחדל: כולם)
+TracingMiddleware מוסיף לכל תגובת HTTP כותרת Server-Timing עם הזמן לפי שלב
+"""
+
+import contextvars
+import json
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+SERVICE_NAME = os.getenv('TRACE_SERVICE_NAME', 'chess-mentor')
+SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', 1.0))
+SERVER_TIMING = os.getenv('SERVER_TIMING', '1') == '1'
+EXPORT_BATCH = 64
+EXPORT_QUEUE_SIZE = 2048
+
+# OTLP SpanKind / StatusCode
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar('current_span', default=None)
+
+
+class Trace:
+    """כל ה-spans של בקשה אחת"""
+
+    __slots__ = ('trace_id', 'spans', 'sampled')
+
+    def __init__(self):
+        self.trace_id = random.getrandbits(128)
+        self.spans: List['Span'] = []  # append מ-threads שונים הוא אטומי
+        self.sampled = random.random() < SAMPLE_RATE
+
+
+class Span:
+    __slots__ = ('name', 'trace', 'span_id', 'parent_id', 'kind', 'start_ns', 'end_ns',
+                 'attributes', 'status', '_perf_start')
+
+    def __init__(self, name: str, trace: Trace, parent_id: Optional[int], kind: int = KIND_INTERNAL,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace = trace
+        self.span_id = random.getrandbits(64)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.status = STATUS_OK
+        self.start_ns = time.time_ns()
+        self._perf_start = time.perf_counter_ns()
+        self.end_ns = None
+
+    def end(self):
+        self.end_ns = self.start_ns + (time.perf_counter_ns() - self._perf_start)
+        self.trace.spans.append(self)
+
+    @property
+    def duration(self) -> float:
+        """שניות - גם ל-span שעוד רץ"""
+        if self.end_ns is not None:
+            return (self.end_ns - self.start_ns) / 1e9
+        return (time.perf_counter_ns() - self._perf_start) / 1e9
+
+    def to_otlp(self) -> Dict[str, Any]:
+        data = {
+            'traceId': f'{self.trace.trace_id:032x}',
+            'spanId': f'{self.span_id:016x}',
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns),
+            'attributes': [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            'status': {'code': self.status}
+        }
+        if self.parent_id is not None:
+            data['parentSpanId'] = f'{self.parent_id:016x}'
+        return data
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+@contextmanager
+def span(name: str, kind: int = KIND_INTERNAL, **attributes):
+    """span בן של ה-span הנוכחי - או trace חדש כשאין"""
+    parent = _current_span.get()
+    trace = parent.trace if parent else Trace()
+    current = Span(name, trace, parent.span_id if parent else None, kind, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.status = STATUS_ERROR
+        current.attributes['error'] = type(e).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end()
+        if parent is None:
+            exporter.export(trace)
+
+
+def record(name: str, duration: float, **attributes):
+    """span שכבר נמדד (למשל זמן המתנה שחושב בתוך המאגר) - מסתיים עכשיו"""
+    parent = _current_span.get()
+    if parent is None:
+        return
+    done = Span(name, parent.trace, parent.span_id, KIND_INTERNAL, attributes)
+    done.start_ns -= int(duration * 1e9)
+    done._perf_start -= int(duration * 1e9)
+    done.end()
+
+
+def server_timing(root: Span) -> str:
+    """Server-Timing: זמן לכל שם span (סכום אם חוזר), ואז total"""
+    totals: Dict[str, float] = {}
+    for done in list(root.trace.spans):
+        if done is not root:
+            totals[done.name] = totals.get(done.name, 0.0) + (done.end_ns - done.start_ns) / 1e6
+    entries = [f'{name};dur={duration:.1f}' for name, duration in totals.items()]
+    entries.append(f'total;dur={root.duration * 1000:.1f}')
+    return ', '.join(entries)
+
+
+class SpanExporter:
+    """תור + thread רקע - הבקשה רק מכניסה לתור; כשהתור מלא traces נזרקים"""
+
+    def __init__(self, target: Optional[str] = None):
+        self.target = target if target is not None else os.getenv('TRACE_EXPORT', '')
+        self._queue: 'queue.Queue[Trace]' = queue.Queue(maxsize=EXPORT_QUEUE_SIZE)
+        self._thread = None
+        self._lock = threading.Lock()
+        self.exported = 0
+        self.dropped = 0
+        self.failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.target)
+
+    def export(self, trace: Trace):
+        if not self.target or not trace.sampled:
+            return
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='trace-exporter', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < EXPORT_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write(self._payload(batch))
+                self.exported += len(batch)
+            except Exception as e:
+                self.failures += 1
+                print(f"⚠️ Trace export failed: {e}")
+
+    @staticmethod
+    def _payload(batch: List[Trace]) -> bytes:
+        spans = [done.to_otlp() for trace in batch for done in trace.spans]
+        return json.dumps({
+            'resourceSpans': [{
+                'resource': {'attributes': [_otlp_attribute('service.name', SERVICE_NAME)]},
+                'scopeSpans': [{'scope': {'name': SERVICE_NAME}, 'spans': spans}]
+            }]
+        }).encode('utf-8')
+
+    def _write(self, payload: bytes):
+        if self.target.startswith('file:'):
+            with open(self.target[len('file:'):], 'ab') as f:
+                f.write(payload + b'\n')
+        else:
+            request = urllib.request.Request(self.target, data=payload,
+                                             headers={'Content-Type': 'application/json'})
+            urllib.request.urlopen(request, timeout=5).read()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'target': self.target or None,
+            'sample_rate': SAMPLE_RATE,
+            'exported': self.exported,
+            'dropped': self.dropped,
+            'failures': self.failures,
+            'queued': self._queue.qsize()
+        }
+
+
+class TracingMiddleware:
+    """ASGI middleware - span שורש לכל בקשת HTTP וכותרת Server-Timing בתגובה"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        with span(f"{scope['method']} {scope['path']}", KIND_SERVER,
+                  **{'http.method': scope['method'], 'http.target': scope['path']}) as root:
+
+            async def send_with_timing(message):
+                if message['type'] == 'http.response.start':
+                    root.attributes['http.status_code'] = message['status']
+                    if SERVER_TIMING:
+                        headers = list(message.get('headers', []))
+                        headers.append((b'server-timing', server_timing(root).encode('latin-1')))
+                        message = {**message, 'headers': headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                route = scope.get('route')
+                if route is not None:
+                    root.name = f"{scope['method']} {route.path}"
+                    root.attributes['http.route'] = route.path
+
+
+# Instance גלובלי - exporter אחד לכל התהליך
+exporter = SpanExporter()
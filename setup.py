@@ -148,6 +148,16 @@ DEBUG=True
 
 # Stockfish will be auto-detected
 # STOCKFISH_PATH=/path/to/stockfish
+# Deterministic fake engine for load tests (see backend-python/tools/fake_uci_engine.py)
+# STOCKFISH_PATH=backend-python/tools/fake_uci_engine.py
+# FAKE_ENGINE_THINK_TIME=0.2
+
+# Optional Polyglot opening book (answers book positions without Stockfish)
+# OPENING_BOOK_PATH=/path/to/book.bin
+
+# Optional pondering - search the player's expected reply while they think
+# ENGINE_PONDER=1
+# ENGINE_PONDER_SHARE=0.5
 
 # Default settings
 DEFAULT_AI_ELO=1500